@@ -0,0 +1,331 @@
+"""
+Offline load test of /verify-news and /summarize against local stand-ins.
+
+Usage:
+    python benchmarks/load_test.py [--target verify,summarize] [--concurrency 1,4,16] [--requests 50]
+                                   [--cold] [--json] [--output results.json]
+                                   [--baseline benchmarks/baseline.json --tolerance 0.2]
+
+Starts the stand-ins from standins.py, launches each service under uvicorn with its
+NewsAPI, LLM and publisher URLs pointed at them, and sends --requests requests per
+concurrency level. The report gives throughput, p50 / p95 / p99 latency and the
+per-stage time (fetch, parse, llm, newsapi_fetch, summarize, ...) taken from the
+services' /metrics over that level. --cold turns off the scrape, verdict, NewsAPI,
+summary and duplicate caches; otherwise --distinct controls how often inputs repeat.
+
+With --baseline, a level whose p95 grows or whose throughput drops by more than
+--tolerance against the baseline file is reported as a regression and the exit code is 1.
+baseline.json holds a run with the default settings to compare against; latencies depend
+on the machine, so refresh it with --output benchmarks/baseline.json when moving hosts.
+
+Needs aiohttp plus the requirements of both services. The services run under the current
+interpreter unless --verify-python / --summarize-python name the environments they are
+installed in.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from standins import StandIns, add_config_arguments, config_from_args, start_standins
+
+AGENT_DIR = Path(__file__).resolve().parent.parent
+SERVICES = {
+    "verify": (AGENT_DIR / "verifier-agent", "news_verification_api:app"),
+    "summarize": (AGENT_DIR / "news-summariser-agent", "news_summariser_api:app"),
+}
+METRIC_LINE = re.compile(r'^(stage_duration_seconds|retry_sleep_seconds)_(sum|count)\{(\w+)="([^"]*)"\} (\S+)$')
+COLD_ENV = {
+    "SCRAPE_CACHE_BACKEND": "none",
+    "VERDICT_CACHE_ENABLED": "false",
+    "NEWSAPI_CACHE_TTL": "0",
+    "SUMMARY_STORE_BACKEND": "none",
+    "DEDUP_ENABLED": "false",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def service_env(standin_url: str, cold: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "TOGETHER_API_KEY": "bench",
+        "TOGETHER_BASE_URL": f"{standin_url}/v1/",
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{standin_url}/v1",
+        "OPENAI_API_BASE": f"{standin_url}/v1",
+        "NEWS_API_KEY": "bench",
+        "NEWS_API_BASE_URL": f"{standin_url}/v2",
+        # Every article lives on the one stand-in host, so the per-host scrape rate limit is lifted
+        "SCRAPE_RATE_LIMIT": "0",
+        "PREFETCH_QUERIES": "",
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+    if cold:
+        env.update(COLD_ENV)
+    return env
+
+
+async def launch(target: str, env: Dict[str, str], python: str = sys.executable,
+                 timeout: float = 60.0) -> Tuple[subprocess.Popen, str]:
+    """Starts a service under uvicorn with the given interpreter and waits until its root endpoint answers."""
+    cwd, app = SERVICES[target]
+    port = free_port()
+    process = subprocess.Popen(
+        [python, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{target} service exited with code {process.returncode}")
+            try:
+                async with session.get(url + "/") as response:
+                    if response.status == 200:
+                        return process, url
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{target} service did not start within {timeout}s")
+
+
+def parse_stage_metrics(text: str) -> Dict[str, Dict[str, float]]:
+    """Sums and counts of the stage and retry-sleep histograms, keyed by stage or "retry_sleep:<policy>"."""
+    stages: Dict[str, Dict[str, float]] = {}
+    for line in text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match is None:
+            continue
+        metric, field, _, label, value = match.groups()
+        key = label if metric == "stage_duration_seconds" else f"retry_sleep:{label}"
+        stages.setdefault(key, {"sum": 0.0, "count": 0.0})[field] = float(value)
+    return stages
+
+
+async def scrape_metrics(session: aiohttp.ClientSession, url: str) -> Dict[str, Dict[str, float]]:
+    try:
+        async with session.get(url + "/metrics") as response:
+            return parse_stage_metrics(await response.text()) if response.status == 200 else {}
+    except aiohttp.ClientError:
+        return {}
+
+
+def stage_breakdown(before: Dict, after: Dict) -> Dict[str, Dict[str, float]]:
+    breakdown = {}
+    for stage, values in sorted(after.items()):
+        start = before.get(stage, {"sum": 0.0, "count": 0.0})
+        count = values["count"] - start["count"]
+        total = values["sum"] - start["sum"]
+        if count > 0:
+            breakdown[stage] = {"count": int(count), "total_s": round(total, 4), "mean_ms": round(total / count * 1000, 2)}
+    return breakdown
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile
+    return ordered[min(len(ordered), max(1, math.ceil(q / 100 * len(ordered)))) - 1]
+
+
+def make_request(target: str, i: int, stand_ins: StandIns, standin_url: str, args: argparse.Namespace) -> Tuple[str, Dict]:
+    n = i % args.distinct
+    if target == "verify":
+        page = stand_ins.pages[n % len(stand_ins.pages)]
+        return "/verify-news", {
+            "headline": page.title,
+            "description": " ".join(page.text.split()[:25]),
+            "source_url": f"{standin_url}/articles/{page.name}?n={n}",
+        }
+    return "/summarize", {
+        "params": {"endpoint": "everything", "q": f"bench{n}"},
+        "max_articles": args.max_articles,
+        "mode": args.mode,
+    }
+
+
+def degraded(target: str, body: Dict) -> bool:
+    """Whether a 200 answer carries a fallback instead of a real result."""
+    if target == "verify":
+        return body.get("verdict_source") in (None, "fallback")
+    return not body.get("summaries")
+
+
+async def run_level(target: str, url: str, concurrency: int, stand_ins: StandIns, standin_url: str,
+                    args: argparse.Namespace) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    degraded_count = 0
+    counter = iter(range(args.requests))
+    standin_before = dict(stand_ins.counts)
+
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        metrics_before = await scrape_metrics(session, url)
+
+        async def worker() -> None:
+            nonlocal errors, degraded_count
+            for i in counter:
+                path, payload = make_request(target, i, stand_ins, standin_url, args)
+                start = time.perf_counter()
+                try:
+                    async with session.post(url + path, json=payload) as response:
+                        body = await response.json(content_type=None)
+                        ok = response.status == 200
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    body, ok = {}, False
+                latencies.append(time.perf_counter() - start)
+                if not ok:
+                    errors += 1
+                elif degraded(target, body):
+                    degraded_count += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+        metrics_after = await scrape_metrics(session, url)
+
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "degraded": degraded_count,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 3) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ms, 50), 2),
+            "p95": round(percentile(ms, 95), 2),
+            "p99": round(percentile(ms, 99), 2),
+            "mean": round(statistics.mean(ms), 2) if ms else 0.0,
+            "max": round(max(ms), 2) if ms else 0.0,
+        },
+        "stages": stage_breakdown(metrics_before, metrics_after),
+        "upstream_calls": {k: stand_ins.counts[k] - standin_before.get(k, 0) for k in stand_ins.counts},
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Regressions of p95 latency or throughput against a baseline run, one message each."""
+    previous = {(r["target"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["target"], result["concurrency"]))
+        if base is None:
+            continue
+        name = f"{result['target']} @ {result['concurrency']}"
+        p95, base_p95 = result["latency_ms"]["p95"], base["latency_ms"]["p95"]
+        if base_p95 and p95 > base_p95 * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base_p95}ms -> {p95}ms")
+        rps, base_rps = result["throughput_rps"], base["throughput_rps"]
+        if base_rps and rps < base_rps * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base_rps} -> {rps} req/s")
+    return regressions
+
+
+def print_table(results: List[Dict]) -> None:
+    print(f"{'target':<11}{'conc':>5}{'reqs':>6}{'err':>5}{'degr':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['target']:<11}{r['concurrency']:>5}{r['requests']:>6}{r['errors']:>5}{r['degraded']:>6}"
+              f"{r['throughput_rps']:>9}{lat['p50']:>10}{lat['p95']:>10}{lat['p99']:>10}")
+        for stage, s in r["stages"].items():
+            print(f"{'':<16}{stage:<24}{s['count']:>7} x {s['mean_ms']:>9} ms  = {s['total_s']:>8} s")
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    runner, stand_ins, standin_url = await start_standins(config_from_args(args))
+    env = service_env(standin_url, args.cold)
+    results = []
+    try:
+        for target in [t for t in args.target.split(",") if t]:
+            url = getattr(args, f"{target}_url")
+            process: Optional[subprocess.Popen] = None
+            if url is None:
+                process, url = await launch(target, env, getattr(args, f"{target}_python"))
+            try:
+                for concurrency in [int(c) for c in args.concurrency.split(",") if c]:
+                    results.append(await run_level(target, url.rstrip("/"), concurrency, stand_ins, standin_url, args))
+            finally:
+                if process is not None:
+                    process.terminate()
+                    process.wait(timeout=10)
+    finally:
+        await runner.cleanup()
+
+    return {
+        "config": {
+            "requests": args.requests,
+            "distinct": args.distinct,
+            "cold": args.cold,
+            "mode": args.mode,
+            "max_articles": args.max_articles,
+            "standins": asdict(config_from_args(args)),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="verify,summarize", help="Comma-separated: verify, summarize")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per concurrency level")
+    parser.add_argument("--distinct", type=int, default=10, help="Number of distinct inputs cycled through")
+    parser.add_argument("--cold", action="store_true", help="Disable the services' caches")
+    parser.add_argument("--mode", default=None, help="Summarization mode for /summarize (per_article or packed)")
+    parser.add_argument("--max-articles", type=int, default=5, help="max_articles for /summarize")
+    parser.add_argument("--request-timeout", type=float, default=120.0, help="Client timeout per request")
+    parser.add_argument("--verify-url", default=None, help="Use an already running verifier instead of launching one")
+    parser.add_argument("--summarize-url", default=None, help="Use an already running summariser instead of launching one")
+    parser.add_argument("--verify-python", default=sys.executable,
+                        help="Interpreter to launch the verifier with (it needs Python 3.11)")
+    parser.add_argument("--summarize-python", default=sys.executable,
+                        help="Interpreter to launch the summariser with (its image runs Python 3.9)")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--output", default=None, help="Also write the JSON results to this file")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 / throughput change vs baseline")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report["results"])
+
+    if args.baseline:
+        regressions = compare(report["results"], json.loads(Path(args.baseline).read_text())["results"], args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
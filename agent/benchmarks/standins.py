@@ -0,0 +1,294 @@
+"""
+Local stand-ins for the services both agents call, so they can be benchmarked offline.
+
+Usage:
+    python benchmarks/standins.py [--port 8900] [--llm-latency 0.4] [--llm-malformed-rate 0.1] ...
+
+Starts one aiohttp server that plays three roles:
+
+    /v2/everything, /v2/top-headlines   NewsAPI: articles generated from the publisher pages,
+                                         with a share of syndicated near-duplicates
+    /v1/chat/completions                 OpenAI- and Together-compatible chat completions with
+                                         configurable latency, error and malformed-JSON rates
+    /articles/<page>.html                A publisher site serving the recorded HTML fixtures
+
+Point the services at it with NEWS_API_BASE_URL=http://host:port/v2,
+OPENAI_BASE_URL=http://host:port/v1 and TOGETHER_BASE_URL=http://host:port/v1.
+load_test.py starts it in-process.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "verifier-agent" / "benchmarks" / "fixtures"
+
+TITLE = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+PARAGRAPH = re.compile(r"<p[^>]*>(.*?)</p>", re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r"<[^>]+>")
+PACKED_ID = re.compile(r"^\s*\[(\d+)\]\s*$", re.MULTILINE)
+SOURCES = ["Wire Service", "Daily Ledger", "Metro Times", "Global Post", "Tech Daily", "Market Watcher"]
+
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of the stand-ins.
+
+    Attributes:
+        llm_latency (float): Mean seconds per chat completion.
+        llm_jitter (float): Latency varies uniformly by +/- this share of the mean.
+        llm_error_rate (float): Share of completions answered with HTTP 503.
+        llm_malformed_rate (float): Share of JSON answers that are not strict JSON: half are
+            fenced with a trailing comma (locally repairable), half have no JSON at all.
+        newsapi_latency (float): Seconds per NewsAPI response.
+        duplicate_rate (float): Share of NewsAPI articles that are syndicated copies of an earlier one.
+        publisher_latency (float): Seconds before a publisher page is sent.
+        seed (int): Seed for the random choices, so runs are repeatable.
+    """
+    llm_latency: float = 0.4
+    llm_jitter: float = 0.5
+    llm_error_rate: float = 0.0
+    llm_malformed_rate: float = 0.1
+    newsapi_latency: float = 0.05
+    duplicate_rate: float = 0.3
+    publisher_latency: float = 0.05
+    seed: int = 1
+
+
+@dataclass
+class Page:
+    name: str
+    title: str
+    text: str
+    html: bytes
+    etag: str
+
+
+def load_pages(fixtures: Path = FIXTURES_DIR) -> List[Page]:
+    pages = []
+    for path in sorted(fixtures.glob("*.html")):
+        html = path.read_bytes()
+        decoded = html.decode("utf-8", errors="replace")
+        title = TITLE.search(decoded)
+        paragraphs = [TAG.sub("", p).strip() for p in PARAGRAPH.findall(decoded)]
+        pages.append(Page(
+            name=path.name,
+            title=title.group(1).strip() if title else path.stem,
+            text=" ".join(p for p in paragraphs if p)[:1500],
+            html=html,
+            etag='"' + hashlib.sha1(html).hexdigest() + '"',
+        ))
+    if not pages:
+        raise SystemExit(f"No *.html fixtures found in {fixtures}")
+    return pages
+
+
+class StandIns:
+    """The three stand-in services on one aiohttp application, with request counters."""
+
+    def __init__(self, config: StandInConfig, pages: List[Page]):
+        self.config = config
+        self.pages = pages
+        self.random = random.Random(config.seed)
+        self.counts: Dict[str, int] = {"newsapi": 0, "llm": 0, "llm_errors": 0, "llm_malformed": 0, "publisher": 0}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v2/{endpoint}", self.newsapi)
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/chat/completions", self.chat_completions)
+        app.router.add_get("/articles/{name}", self.publisher)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.counts)
+
+    # NewsAPI
+
+    async def newsapi(self, request: web.Request) -> web.Response:
+        self.counts["newsapi"] += 1
+        await asyncio.sleep(self.config.newsapi_latency)
+        if request.match_info["endpoint"] not in ("everything", "top-headlines"):
+            return web.json_response({"status": "error", "message": "Unknown endpoint"}, status=404)
+
+        page_size = int(request.query.get("pageSize", 20))
+        query = request.query.get("q") or request.query.get("category") or request.query.get("country") or ""
+        # Articles depend only on the query, so identical requests get identical answers
+        rng = random.Random(f"{self.config.seed}:{query}")
+        base = f"http://{request.host}"
+        articles = []
+        for i in range(page_size):
+            if articles and rng.random() < self.config.duplicate_rate:
+                original = rng.choice(articles)
+                articles.append(dict(
+                    original,
+                    source={"id": None, "name": rng.choice(SOURCES)},
+                    title=original["title"] + " - " + rng.choice(SOURCES),
+                    url=f"{original['url'].split('?')[0]}?copy={i}",
+                ))
+                continue
+            page = self.pages[(i + rng.randrange(len(self.pages))) % len(self.pages)]
+            words = page.text.split()
+            start = rng.randrange(max(1, len(words) - 60))
+            content = " ".join(words[start:start + 60])
+            articles.append({
+                "source": {"id": None, "name": rng.choice(SOURCES)},
+                "author": None,
+                "title": f"{page.title} ({query or 'news'} #{i})",
+                "description": " ".join(words[start:start + 25]),
+                "url": f"{base}/articles/{page.name}?q={query}&n={i}",
+                "urlToImage": None,
+                "publishedAt": "2025-02-07T10:00:00Z",
+                "content": f"{content}… [+{len(page.text)} chars]",
+            })
+        return web.json_response({"status": "ok", "totalResults": len(articles), "articles": articles})
+
+    # Chat completions
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        self.counts["llm"] += 1
+        body = await request.json()
+        jitter = self.config.llm_jitter
+        await asyncio.sleep(self.config.llm_latency * self.random.uniform(1 - jitter, 1 + jitter))
+
+        if self.random.random() < self.config.llm_error_rate:
+            self.counts["llm_errors"] += 1
+            return web.json_response({"error": {"message": "Service unavailable", "type": "server_error"}},
+                                     status=503)
+
+        messages = body.get("messages", [])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        if "fact-checking" in prompt and "numbered item" in prompt:
+            ids = [int(i) for i in PACKED_ID.findall(prompt)]
+            content = self._json_answer({"results": [{
+                "id": i,
+                "confidence_score": round(self.random.uniform(0.4, 0.95), 2),
+                "matching_details": ["Headline figures appear in the source"],
+                "discrepancies": [],
+            } for i in ids]})
+        elif "fact-checking" in prompt:
+            content = self._json_answer({
+                "confidence_score": round(self.random.uniform(0.4, 0.95), 2),
+                "matching_details": ["Headline figures appear in the source"],
+                "discrepancies": [],
+            })
+        elif "numeric id in square brackets" in prompt:
+            ids = [int(i) for i in PACKED_ID.findall(prompt)]
+            content = self._json_answer({
+                "summaries": [{"id": i, "summary": f"Stand-in summary of article {i}."} for i in ids]
+            })
+        else:
+            content = "Stand-in summary: the article reports a development and its expected impact."
+
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return web.json_response({
+            "id": f"chatcmpl-{self.counts['llm']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _json_answer(self, value: Dict) -> str:
+        text = json.dumps(value)
+        if self.random.random() >= self.config.llm_malformed_rate:
+            return text
+        self.counts["llm_malformed"] += 1
+        if self.random.random() < 0.5:
+            return "Here is the result:\n```json\n" + text[:-1] + ",}\n```"
+        return "I could not produce a structured answer for this input."
+
+    # Publisher
+
+    async def publisher(self, request: web.Request) -> web.Response:
+        self.counts["publisher"] += 1
+        page = next((p for p in self.pages if p.name == request.match_info["name"]), None)
+        if page is None:
+            raise web.HTTPNotFound()
+        await asyncio.sleep(self.config.publisher_latency)
+        if request.headers.get("If-None-Match") == page.etag:
+            return web.Response(status=304, headers={"ETag": page.etag})
+        return web.Response(body=page.html, content_type="text/html", charset="utf-8",
+                            headers={"ETag": page.etag})
+
+
+async def start_standins(config: StandInConfig, host: str = "127.0.0.1", port: int = 0):
+    """
+    Starts the stand-ins in the running loop.
+
+    Returns:
+        (runner, stand_ins, base_url): call runner.cleanup() to stop the server.
+    """
+    stand_ins = StandIns(config, load_pages())
+    runner = web.AppRunner(stand_ins.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, stand_ins, f"http://{host}:{bound_port}"
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = StandInConfig()
+    parser.add_argument("--llm-latency", type=float, default=defaults.llm_latency, help="Mean seconds per LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=defaults.llm_jitter, help="LLM latency spread, 0-1")
+    parser.add_argument("--llm-error-rate", type=float, default=defaults.llm_error_rate,
+                        help="Share of LLM calls answered with 503")
+    parser.add_argument("--llm-malformed-rate", type=float, default=defaults.llm_malformed_rate,
+                        help="Share of JSON answers that are not strict JSON")
+    parser.add_argument("--newsapi-latency", type=float, default=defaults.newsapi_latency,
+                        help="Seconds per NewsAPI response")
+    parser.add_argument("--duplicate-rate", type=float, default=defaults.duplicate_rate,
+                        help="Share of NewsAPI articles that are syndicated copies")
+    parser.add_argument("--publisher-latency", type=float, default=defaults.publisher_latency,
+                        help="Seconds before a publisher page is sent")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+
+
+def config_from_args(args: argparse.Namespace) -> StandInConfig:
+    return StandInConfig(
+        llm_latency=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        llm_error_rate=args.llm_error_rate,
+        llm_malformed_rate=args.llm_malformed_rate,
+        newsapi_latency=args.newsapi_latency,
+        duplicate_rate=args.duplicate_rate,
+        publisher_latency=args.publisher_latency,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    stand_ins = StandIns(config_from_args(args), load_pages())
+    print(f"Stand-ins on http://{args.host}:{args.port} (NewsAPI /v2, LLM /v1, publisher /articles)")
+    web.run_app(stand_ins.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
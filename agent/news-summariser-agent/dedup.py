@@ -0,0 +1,182 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from prompt_budget import terms
+
+FINGERPRINT_BITS = 64
+# NewsAPI cuts content and appends e.g. "… [+2345 chars]", which differs between copies of a story
+TRUNCATION_MARKER = re.compile(r"\s*(…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+
+
+def fingerprint_text(article: Dict) -> str:
+    content = article.get("content") or article.get("description") or ""
+    return f"{article.get('title') or ''} {TRUNCATION_MARKER.sub('', content)}"
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash of text over its words and word pairs (stopwords removed).
+
+    Texts that share most of their features get fingerprints that differ in few bits.
+    """
+    words = terms(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def similarity(a: int, b: int) -> float:
+    """Share of equal bits between two fingerprints, from 0.0 to 1.0."""
+    return 1.0 - bin(a ^ b).count("1") / FINGERPRINT_BITS
+
+
+def max_distance(threshold: float) -> int:
+    """Largest Hamming distance that still counts as similar at threshold."""
+    return int((1.0 - threshold) * FINGERPRINT_BITS + 1e-9)
+
+
+def group_duplicates(fingerprints: List[int], threshold: float) -> List[List[int]]:
+    """
+    Groups indices whose fingerprints are at least threshold similar to the first member
+    of a group. Groups and members keep input order, so the first index is the representative.
+    """
+    groups: List[List[int]] = []
+    for i, fp in enumerate(fingerprints):
+        for group in groups:
+            if similarity(fingerprints[group[0]], fp) >= threshold:
+                group.append(i)
+                break
+        else:
+            groups.append([i])
+    return groups
+
+
+@dataclass
+class IndexedStory:
+    """A summarised story remembered by the duplicate index."""
+    fingerprint: int
+    summary: str
+    url: str
+    source: str
+    title: str
+    expires_at: float
+
+
+class DuplicateIndex:
+    """
+    Fingerprints of summarised stories, kept across requests so that a later copy of the same
+    story from another source reuses the summary instead of going to the LLM.
+
+    Lookups split the 64-bit fingerprint into max_distance + 1 bands. Two fingerprints within
+    max_distance bits of each other agree on at least one whole band, so only stories sharing
+    a band are compared. Entries expire after ttl seconds and the index keeps at most
+    max_entries stories in LRU order.
+    """
+
+    def __init__(self, threshold: float = 0.85, ttl: float = 6 * 3600.0, max_entries: int = 5000):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        bands = max_distance(threshold) + 1
+        width = -(-FINGERPRINT_BITS // bands)
+        self._bands = [(start, min(width, FINGERPRINT_BITS - start)) for start in range(0, FINGERPRINT_BITS, width)]
+        self._stories: "OrderedDict[int, IndexedStory]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        return [(i, fingerprint >> start & ((1 << width) - 1)) for i, (start, width) in enumerate(self._bands)]
+
+    def _remove(self, fingerprint: int) -> None:
+        self._stories.pop(fingerprint, None)
+        for key in self._keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self._buckets[key]
+
+    def find(self, fingerprint: int) -> Optional[IndexedStory]:
+        """Returns the most similar live story at or above the threshold, or None."""
+        now = time.time()
+        with self._lock:
+            candidates = set().union(*(self._buckets.get(key, ()) for key in self._keys(fingerprint)))
+            best, best_similarity = None, self.threshold
+            for candidate in candidates:
+                story = self._stories[candidate]
+                if story.expires_at <= now:
+                    self._remove(candidate)
+                    continue
+                score = similarity(candidate, fingerprint)
+                if score >= best_similarity:
+                    best, best_similarity = story, score
+
+            if best is None:
+                self.misses += 1
+                return None
+            self._stories.move_to_end(best.fingerprint)
+            self.hits += 1
+            return best
+
+    def add(self, fingerprint: int, article: Dict, summary: str) -> None:
+        """Remembers the summary of a story under its fingerprint."""
+        story = IndexedStory(
+            fingerprint=fingerprint,
+            summary=summary,
+            url=article.get("url") or "",
+            source=(article.get("source") or {}).get("name") or "",
+            title=article.get("title") or "",
+            expires_at=time.time() + self.ttl,
+        )
+        with self._lock:
+            self._remove(fingerprint)
+            self._stories[fingerprint] = story
+            for key in self._keys(fingerprint):
+                self._buckets[key].add(fingerprint)
+            while len(self._stories) > self.max_entries:
+                self._remove(next(iter(self._stories)))
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._stories),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "bands": len(self._bands),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def duplicate_index_from_env() -> Optional[DuplicateIndex]:
+    """
+    Build the near-duplicate index from DEDUP_THRESHOLD (fingerprint similarity, 0-1),
+    DEDUP_INDEX_TTL and DEDUP_INDEX_MAX_ENTRIES, or return None when DEDUP_ENABLED is false.
+    """
+    if os.getenv("DEDUP_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return DuplicateIndex(
+        threshold=float(os.getenv("DEDUP_THRESHOLD", 0.85)),
+        ttl=float(os.getenv("DEDUP_INDEX_TTL", 6 * 3600)),
+        max_entries=int(os.getenv("DEDUP_INDEX_MAX_ENTRIES", 5000)),
+    )
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from startup_profile import PROFILE
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TEMPLATE = """
+            Please provide a concise summary of the following news article:
+
+            Title: {title}
+            Content: {content}
+
+            Summary (in 2-3 sentences, focusing on key points and maintaining journalistic neutrality):
+            """
+
+PACKED_TEMPLATE = """
+            Please provide a concise summary of each of the following news articles.
+            Each article starts with its numeric id in square brackets.
+
+            {articles}
+
+            Write each summary in 2-3 sentences, focusing on key points and maintaining journalistic neutrality.
+            Respond with only a JSON object of the form {{"summaries": [{{"id": <article id>, "summary": "<summary>"}}]}}
+            containing one entry per article.
+            """
+
+LLM_CLIENTS = ("langchain", "direct")
+
+
+class ChatCompletionError(Exception):
+    """An error response from the chat completions endpoint; status_code lets the retry policy classify it."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Chat completion failed with HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+class SummaryLLM:
+    """
+    Chat model used for summaries, loaded on first use.
+
+    Loading (imports and client construction) happens once, in warm_up(), which the API
+    runs in the background at startup so the service answers / and /health before the
+    LLM stack is ready. Calls made earlier wait for the load. Subclasses implement
+    _load, _complete and _acomplete for one prompt sent as a single user message.
+    """
+    client = "base"
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", temperature: float = 0.1):
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.load_seconds: Optional[float] = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def warm_up(self) -> None:
+        """Loads the client unless already loaded; safe to call from several threads."""
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            with PROFILE.phase(f"llm_load_{self.client}"):
+                start = time.perf_counter()
+                self._load()
+                self.load_seconds = time.perf_counter() - start
+            self._ready = True
+            logger.info("LLM client ready", extra={"client": self.client, "seconds": round(self.load_seconds, 3)})
+
+    async def awarm_up(self) -> None:
+        if not self._ready:
+            await asyncio.to_thread(self.warm_up)
+
+    @staticmethod
+    def format_summary(inputs: Dict[str, str]) -> str:
+        return SUMMARY_TEMPLATE.format(**inputs)
+
+    @staticmethod
+    def format_packed(articles: str) -> str:
+        return PACKED_TEMPLATE.format(articles=articles)
+
+    def summarize(self, inputs: Dict[str, str]) -> str:
+        """Summary of one article from its title and content."""
+        self.warm_up()
+        return self._complete(self.format_summary(inputs))
+
+    async def asummarize(self, inputs: Dict[str, str]) -> str:
+        await self.awarm_up()
+        return await self._acomplete(self.format_summary(inputs))
+
+    async def asummarize_packed(self, articles: str) -> str:
+        """Raw JSON answer summarizing several articles formatted by the agent."""
+        await self.awarm_up()
+        return await self._acomplete(self.format_packed(articles))
+
+    def stats(self) -> Dict:
+        return {
+            "client": self.client,
+            "model": self.model,
+            "ready": self._ready,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+        }
+
+    def close(self) -> None:
+        pass
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    def _complete(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def _acomplete(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class LangChainLLM(SummaryLLM):
+    """ChatOpenAI from langchain_openai, imported only when the client is loaded."""
+    client = "langchain"
+
+    def _load(self) -> None:
+        with PROFILE.phase("import_langchain_openai"):
+            from langchain_openai import ChatOpenAI
+        # Retries and backoff are owned by the agent's retry policy, not the OpenAI client
+        self._llm = ChatOpenAI(
+            temperature=self.temperature,
+            model=self.model,
+            api_key=self.api_key,
+            max_retries=0
+        )
+
+    def _complete(self, prompt: str) -> str:
+        return self._llm.invoke(prompt).content
+
+    async def _acomplete(self, prompt: str) -> str:
+        return (await self._llm.ainvoke(prompt)).content
+
+
+class DirectLLM(SummaryLLM):
+    """
+    OpenAI-compatible chat completions over plain HTTP with a pooled requests session, without
+    LangChain or the OpenAI SDK. Async calls run the blocking request in a worker thread.
+    """
+    client = "direct"
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", temperature: float = 0.1,
+                 base_url: str = "https://api.openai.com/v1", timeout: float = 60.0, pool_size: int = 10):
+        super().__init__(api_key, model, temperature)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session: Optional[requests.Session] = None
+
+    def _load(self) -> None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Authorization"] = f"Bearer {self.api_key}"
+        self._session = session
+
+    def _complete(self, prompt: str) -> str:
+        response = self._session.post(
+            f"{self.base_url}/chat/completions",
+            json={
+                "model": self.model,
+                "temperature": self.temperature,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+            timeout=self.timeout,
+        )
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", {}).get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise ChatCompletionError(response.status_code, message)
+        choices: List[Dict] = response.json().get("choices") or []
+        if not choices:
+            raise ChatCompletionError(502, "Response has no choices")
+        return choices[0]["message"].get("content") or ""
+
+    async def _acomplete(self, prompt: str) -> str:
+        return await asyncio.to_thread(self._complete, prompt)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def summary_llm_from_env(api_key: str, pool_size: int = 10) -> SummaryLLM:
+    """
+    Build the summary LLM client named by SUMMARY_LLM_CLIENT: "langchain" (default, ChatOpenAI)
+    or "direct" (plain HTTP to OPENAI_BASE_URL, no LangChain, with SUMMARY_LLM_TIMEOUT seconds per call).
+    """
+    client = os.getenv("SUMMARY_LLM_CLIENT", "langchain").lower()
+    if client not in LLM_CLIENTS:
+        raise ValueError(f"Unknown SUMMARY_LLM_CLIENT {client!r}, expected one of {LLM_CLIENTS}")
+    if client == "direct":
+        return DirectLLM(
+            api_key,
+            base_url=os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1",
+            timeout=float(os.getenv("SUMMARY_LLM_TIMEOUT", 60)),
+            pool_size=pool_size,
+        )
+    return LangChainLLM(api_key)
@@ -0,0 +1,50 @@
+import json
+import logging
+import os
+import sys
+import time
+
+# This module is shared by the verifier and summariser services; keep both copies identical.
+
+# Attributes every LogRecord has; anything else was passed through extra= and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, with extra= fields as top-level keys."""
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "service": self.service,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(service: str) -> None:
+    """
+    Sends log records to stderr at LOG_LEVEL (default INFO), as JSON lines or, with
+    LOG_FORMAT=text, as plain text. Safe to call more than once.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JsonFormatter(service))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if getattr(h, "_configured_by", None) == "log_config"]:
+        root.removeHandler(existing)
+    handler._configured_by = "log_config"
+    root.addHandler(handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
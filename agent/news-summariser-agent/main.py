@@ -1,13 +1,25 @@
 import os
-from typing import List, Dict, Optional, Union
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, List, Dict, Optional, Tuple, Union
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import requests
-from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain.chains import LLMChain
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel, Field
+from summary_store import SummaryStore, summary_store_from_env
+from dedup import DuplicateIndex, duplicate_index_from_env, fingerprint_text, group_duplicates, simhash
+from news_fetcher import news_fetcher_from_env
+from llm_client import SummaryLLM, summary_llm_from_env
+from prompt_budget import PromptBudget, TokenMeter
+from retry import RetryPolicy, extract_json
+from metrics import CACHE_LOOKUPS, LLM_IN_FLIGHT, STAGE_SECONDS, Counter
+
+logger = logging.getLogger(__name__)
+
+SUMMARIES = Counter("summariser_summaries_total",
+                    "Article summaries by outcome: llm, cached, no_content or error", ["outcome"])
+DUPLICATES = Counter("summariser_duplicates_total", "Articles folded into a near-duplicate group instead of summarised")
 
 class NewsArticle(BaseModel):
     title: str = Field(description="Title of the article")
@@ -15,37 +27,51 @@ class NewsArticle(BaseModel):
     published_date: str = Field(description="Publication date")
     summary: str = Field(description="Summary of the article content")
     url: str = Field(description="URL of the article")
+    cached: bool = Field(False, description="Whether the summary came from the summary store")
+    alternate_sources: List[Dict[str, str]] = Field(
+        default_factory=list, description="Near-duplicate copies of the story from other sources: source, title and url"
+    )
 
 class NewsAPIRequest(BaseModel):
     endpoint: str = Field(description="API endpoint (everything or top-headlines)")
     params: Dict = Field(description="Query parameters")
 
+# Maximum number of LLM calls made at the same time by aprocess_news
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 5))
+# "per_article" sends one prompt per article, "packed" summarises several articles per prompt
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "per_article")
+# Packed mode limits: input tokens of article text per prompt and articles per prompt
+PACK_TOKEN_BUDGET = int(os.getenv("PACK_TOKEN_BUDGET", 2500))
+PACK_MAX_ARTICLES = int(os.getenv("PACK_MAX_ARTICLES", 10))
+# Tokens of article content put into a prompt; longer content keeps the sentences most relevant to the title
+ARTICLE_TOKEN_BUDGET = int(os.getenv("ARTICLE_TOKEN_BUDGET", 1000))
+# NewsAPI base URL, overridable to point at a local stand-in (see agent/benchmarks)
+NEWS_API_BASE_URL = os.getenv("NEWS_API_BASE_URL", "https://newsapi.org/v2")
+
+NO_CONTENT_SUMMARY = "No content available for summarization."
+
 class NewsSummarizerAgent:
-    def __init__(self, news_api_key: str, openai_api_key: str):
+    def __init__(self, news_api_key: str, openai_api_key: str, max_concurrency: int = SUMMARY_CONCURRENCY,
+                 summary_mode: str = SUMMARY_MODE, summary_store: Optional[SummaryStore] = None,
+                 prompt_budget: Optional[PromptBudget] = None, retry_policy: Optional[RetryPolicy] = None,
+                 duplicate_index: Optional[DuplicateIndex] = None, llm: Optional[SummaryLLM] = None):
         self.news_api_key = news_api_key
-        self.base_url = "https://newsapi.org/v2"
-        self.llm = ChatOpenAI(
-            temperature=0.1,
-            model="gpt-3.5-turbo",
-            api_key=openai_api_key
-        )
-        
-        self.summary_prompt = PromptTemplate(
-            input_variables=["content", "title"],
-            template="""
-            Please provide a concise summary of the following news article:
-            
-            Title: {title}
-            Content: {content}
-            
-            Summary (in 2-3 sentences, focusing on key points and maintaining journalistic neutrality):
-            """
-        )
-        
-        self.summary_chain = LLMChain(
-            llm=self.llm,
-            prompt=self.summary_prompt
-        )
+        self.max_concurrency = max_concurrency
+        self.summary_mode = summary_mode
+        # Summaries of articles already seen, so only new or changed articles reach the LLM
+        self.summary_store = summary_store if summary_store is not None else summary_store_from_env()
+        # Fingerprints of summarised stories, so syndicated copies of one story are summarised once
+        self.duplicate_index = duplicate_index if duplicate_index is not None else duplicate_index_from_env()
+        # Token-budgeted article content and per-call token accounting
+        self.prompt_budget = prompt_budget or PromptBudget(ARTICLE_TOKEN_BUDGET)
+        self.token_meter = TokenMeter()
+        self.base_url = NEWS_API_BASE_URL.rstrip("/")
+        # Cached, single-flight access to NewsAPI for the async path
+        self.news_fetcher = news_fetcher_from_env(self._request_news)
+        # Retries and backoff are owned by retry_policy, not the OpenAI client
+        self.retry_policy = retry_policy or RetryPolicy.from_env("SUMMARY", attempts=3, base_delay=0.5, max_delay=4.0)
+        # Chat model client, loaded on first use or by warm_up() (see SUMMARY_LLM_CLIENT)
+        self.llm = llm or summary_llm_from_env(openai_api_key, pool_size=max_concurrency)
 
     def parse_news_api_url(self, url: str) -> NewsAPIRequest:
         """Parse a NewsAPI URL into endpoint and parameters."""
@@ -65,25 +91,54 @@ class NewsSummarizerAgent:
         
         return NewsAPIRequest(endpoint=endpoint, params=params)
 
-    def fetch_news(self, url_or_params: Union[str, Dict], max_articles: int = 5) -> List[Dict]:
-        """Fetch news articles from NewsAPI using either URL or parameters."""
+    def resolve_query(self, url_or_params: Union[str, Dict], max_articles: int = 5) -> Tuple[str, Dict]:
+        """Turn a NewsAPI URL or parameter dict into an endpoint and params (without the API key)."""
         if isinstance(url_or_params, str):
             # Parse URL
             request_info = self.parse_news_api_url(url_or_params)
             endpoint = request_info.endpoint
             params = request_info.params
         else:
-            # Direct parameters
-            endpoint = url_or_params.pop('endpoint', 'everything')
-            params = url_or_params
+            # Direct parameters, copied so the caller's dict is left untouched
+            params = dict(url_or_params)
+            endpoint = params.pop('endpoint', 'everything')
+            params.pop('apiKey', None)
 
-        # Add API key and page size
-        params['apiKey'] = self.news_api_key
         params['pageSize'] = max_articles
+        return endpoint, params
+
+    def fetch_news(self, url_or_params: Union[str, Dict], max_articles: int = 5) -> List[Dict]:
+        """Fetch news articles from NewsAPI using either URL or parameters."""
+        endpoint, params = self.resolve_query(url_or_params, max_articles)
+        return self._request_news(endpoint, params)
+
+    async def afetch_news(self, url_or_params: Union[str, Dict], max_articles: int = 5) -> List[Dict]:
+        """
+        Fetch news articles through the NewsFetcher: repeated requests are served from a
+        short-TTL cache and concurrent identical requests share one upstream call.
+        """
+        endpoint, params = self.resolve_query(url_or_params, max_articles)
+        return await self.news_fetcher.get(endpoint, params)
+
+    def is_warm(self, url_or_params: Union[str, Dict], max_articles: int = 5) -> bool:
+        """
+        Whether the NewsAPI response for a query is cached, so the request skips the upstream fetch.
+        Used to admit cheap requests first.
+        """
+        try:
+            endpoint, params = self.resolve_query(url_or_params, max_articles)
+        except Exception:
+            return False
+        return self.news_fetcher.is_cached(endpoint, params)
+
+    def _request_news(self, endpoint: str, params: Dict) -> List[Dict]:
+        """Make one NewsAPI request."""
+        params = {**params, 'apiKey': self.news_api_key}
 
         # Make request
         url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url, params=params)
+        with STAGE_SECONDS.labels(stage="newsapi_fetch").time():
+            response = requests.get(url, params=params)
         
         if response.status_code != 200:
             error_msg = f"NewsAPI request failed: {response.json().get('message', 'Unknown error')}"
@@ -92,48 +147,382 @@ class NewsSummarizerAgent:
         return response.json()["articles"]
 
     def summarize_article(self, article: Dict) -> NewsArticle:
-        """Summarize a single article using LangChain."""
-        content = article.get("content", "") or article.get("description", "")
+        """Summarize a single article using the LLM client."""
+        content = self._article_content(article)
         title = article["title"]
         
         if not content:
-            return NewsArticle(
-                title=title,
-                source=article["source"]["name"],
-                published_date=article["publishedAt"],
-                summary="No content available for summarization.",
-                url=article["url"]
-            )
+            SUMMARIES.labels(outcome="no_content").inc()
+            return self._build_article(article, NO_CONTENT_SUMMARY)
         
-        # Generate summary using LLMChain
-        summary_result = self.summary_chain.invoke({
+        # Generate summary using the LLM
+        inputs = {
             "content": content,
             "title": title
-        })
+        }
+        # Load the LLM client first, so a cold start does not count against the retry deadline
+        self.llm.warm_up()
+        with STAGE_SECONDS.labels(stage="summarize").time():
+            summary_result = self.retry_policy.run(lambda: self._invoke_summary(inputs))
+        SUMMARIES.labels(outcome="llm").inc()
         
+        return self._build_article(article, summary_result.strip())
+
+    async def asummarize_article(self, article: Dict, limit: Optional[asyncio.Semaphore] = None) -> NewsArticle:
+        """
+        Summarize a single article using the LLM client's async API.
+
+        limit, if given, is held only while the LLM call is in flight, not during retry backoff.
+        """
+        content = self._article_content(article)
+        title = article["title"]
+
+        if not content:
+            SUMMARIES.labels(outcome="no_content").inc()
+            return self._build_article(article, NO_CONTENT_SUMMARY)
+
+        inputs = {
+            "content": content,
+            "title": title
+        }
+        async def attempt() -> str:
+            if limit is None:
+                return await self._ainvoke_summary(inputs)
+            async with limit:
+                return await self._ainvoke_summary(inputs)
+
+        # Load the LLM client first, so a cold start does not count against the retry deadline
+        await self.llm.awarm_up()
+        with STAGE_SECONDS.labels(stage="summarize").time():
+            summary_result = await self.retry_policy.arun(attempt)
+        SUMMARIES.labels(outcome="llm").inc()
+
+        return self._build_article(article, summary_result.strip())
+
+    def _invoke_summary(self, inputs: Dict) -> str:
+        """One summary LLM call, with its token usage recorded."""
+        start = time.perf_counter()
+        with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
+            summary_result = self.llm.summarize(inputs)
+        self._record_usage("summarize", self.llm.format_summary(inputs), summary_result,
+                           time.perf_counter() - start)
+        return summary_result
+
+    async def _ainvoke_summary(self, inputs: Dict) -> str:
+        """Async variant of _invoke_summary."""
+        start = time.perf_counter()
+        with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
+            summary_result = await self.llm.asummarize(inputs)
+        self._record_usage("summarize", self.llm.format_summary(inputs), summary_result,
+                           time.perf_counter() - start)
+        return summary_result
+
+    def _article_content(self, article: Dict) -> str:
+        """Article content for the prompt, cut to the article token budget."""
+        content = article.get("content", "") or article.get("description", "")
+        return self.prompt_budget.select(content, article.get("title") or "")
+
+    def _record_usage(self, name: str, prompt: str, completion: str, seconds: float) -> None:
+        """Record prompt and completion tokens of one LLM call, counted locally."""
+        count = self.prompt_budget.counter.count
+        self.token_meter.record(name, count(prompt), count(completion), seconds, estimated=True)
+
+    def token_stats(self) -> Dict:
+        """Prompt / completion token totals and recent LLM calls."""
+        stats = self.token_meter.stats()
+        stats["article_token_budget"] = self.prompt_budget.budget
+        stats["exact_token_counts"] = self.prompt_budget.counter.exact
+        return stats
+
+    def _build_article(self, article: Dict, summary: str, cached: bool = False) -> NewsArticle:
         return NewsArticle(
-            title=title,
+            title=article["title"],
             source=article["source"]["name"],
             published_date=article["publishedAt"],
-            summary=summary_result["text"].strip(),
-            url=article["url"]
+            summary=summary,
+            url=article["url"],
+            cached=cached
         )
 
+    def _from_store(self, article: Dict) -> Optional[NewsArticle]:
+        """Return the stored summary of an unchanged article, or None."""
+        if self.summary_store is None:
+            return None
+        try:
+            summary = self.summary_store.get(article)
+        except Exception as e:
+            logger.warning("Summary store read error: %s", e, extra={"url": article.get("url")})
+            return None
+        CACHE_LOOKUPS.labels(cache="summary", result="miss" if summary is None else "hit").inc()
+        if summary is not None:
+            SUMMARIES.labels(outcome="cached").inc()
+        return self._build_article(article, summary, cached=True) if summary is not None else None
+
+    def _to_store(self, article: Dict, result: NewsArticle) -> None:
+        if self.summary_store is None or result.cached or result.summary == NO_CONTENT_SUMMARY:
+            return
+        try:
+            self.summary_store.put(article, result.summary)
+        except Exception as e:
+            logger.warning("Summary store write error: %s", e, extra={"url": article.get("url")})
+
+    async def _summary_store_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a summary store operation from async code: in a worker thread for the SQLite
+        store, so its reads and commits stay off the event loop, inline for the in-memory one.
+        """
+        if self.summary_store is not None and self.summary_store.backend == "sqlite":
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _group_duplicates(self, articles: List[Dict]) -> Tuple[List[List[int]], List[Optional[int]]]:
+        """
+        Group near-duplicate articles by SimHash fingerprint of title plus content.
+
+        Returns the groups as lists of positions with the representative first, and the
+        fingerprint of each article (None when deduplication is off).
+        """
+        if self.duplicate_index is None:
+            return [[i] for i in range(len(articles))], [None] * len(articles)
+        with STAGE_SECONDS.labels(stage="dedup").time():
+            fingerprints = [simhash(fingerprint_text(article)) for article in articles]
+            groups = group_duplicates(fingerprints, self.duplicate_index.threshold)
+        DUPLICATES.inc(len(articles) - len(groups))
+        return groups, fingerprints
+
+    def _from_index(self, article: Dict, fingerprint: Optional[int]) -> Optional[NewsArticle]:
+        """Return the summary of a near-duplicate story summarised earlier, or None."""
+        if self.duplicate_index is None or fingerprint is None:
+            return None
+        story = self.duplicate_index.find(fingerprint)
+        CACHE_LOOKUPS.labels(cache="dedup_index", result="miss" if story is None else "hit").inc()
+        if story is None:
+            return None
+        SUMMARIES.labels(outcome="cached").inc()
+        return self._build_article(article, story.summary, cached=True)
+
+    def _to_index(self, article: Dict, fingerprint: Optional[int], result: NewsArticle) -> None:
+        if self.duplicate_index is None or fingerprint is None or result.cached or result.summary == NO_CONTENT_SUMMARY:
+            return
+        self.duplicate_index.add(fingerprint, article, result.summary)
+
+    def _lookup(self, article: Dict, fingerprint: Optional[int]) -> Optional[NewsArticle]:
+        """Return a summary from the summary store or the duplicate index, or None if the LLM is needed."""
+        stored = self._from_store(article)
+        if stored is None:
+            stored = self._from_index(article, fingerprint)
+        return stored
+
+    @staticmethod
+    def _with_alternates(result: NewsArticle, articles: List[Dict], group: List[int]) -> NewsArticle:
+        """List the other members of a duplicate group as alternate sources of the summary."""
+        result.alternate_sources = [
+            {
+                "source": (articles[i].get("source") or {}).get("name") or "",
+                "title": articles[i].get("title") or "",
+                "url": articles[i].get("url") or ""
+            } for i in group[1:]
+        ]
+        return result
+
     def process_news(self, query: Union[str, Dict], max_articles: int = 5) -> List[NewsArticle]:
         """Process news articles from either URL or parameter dict."""
         articles = self.fetch_news(query, max_articles)
+        groups, fingerprints = self._group_duplicates(articles)
         
         summaries = []
-        for article in articles:
+        for group in groups:
+            article = articles[group[0]]
             try:
-                summary = self.summarize_article(article)
-                summaries.append(summary)
+                summary = self._lookup(article, fingerprints[group[0]])
+                if summary is None:
+                    summary = self.summarize_article(article)
+                    self._to_store(article, summary)
+                    self._to_index(article, fingerprints[group[0]], summary)
+                summaries.append(self._with_alternates(summary, articles, group))
             except Exception as e:
-                print(f"Error processing article {article['title']}: {str(e)}")
+                SUMMARIES.labels(outcome="error").inc()
+                logger.warning("Error processing article: %s", e, extra={"title": article.get("title")})
                 continue
                 
         return summaries
 
+    async def aprocess_news(self, query: Union[str, Dict], max_articles: int = 5,
+                            max_concurrency: Optional[int] = None, mode: Optional[str] = None) -> List[NewsArticle]:
+        """
+        Process news articles concurrently without blocking the event loop.
+
+        The NewsAPI request goes through the NewsFetcher and up to max_concurrency LLM calls run at
+        once. In "packed" mode several articles share one prompt. Summaries keep the article
+        order; failed articles are skipped. Articles already in the summary store are not
+        sent to the LLM, and near-duplicate copies of a story are summarised once, with the
+        copies listed as alternate sources.
+        """
+        results = {}
+        async for position, summary in self.aiter_news(query, max_articles, max_concurrency, mode):
+            results[position] = summary
+
+        return [results[position] for position in sorted(results)]
+
+    async def aiter_news(self, query: Union[str, Dict], max_articles: int = 5,
+                         max_concurrency: Optional[int] = None,
+                         mode: Optional[str] = None) -> AsyncIterator[Tuple[int, NewsArticle]]:
+        """
+        Generator version of aprocess_news that yields each summary as soon as it is ready.
+
+        Yields (position, summary) pairs in completion order, where position is the article's
+        index in the NewsAPI response. Only the first article of each near-duplicate group is
+        yielded. Stored summaries come first; failed articles are skipped.
+        """
+        articles = await self.afetch_news(query, max_articles)
+        groups, fingerprints = self._group_duplicates(articles)
+
+        # One trip to the store for the whole page, then the in-memory duplicate index
+        from_store = await self._summary_store_call(lambda: [self._from_store(articles[g[0]]) for g in groups])
+        todo = []
+        for group, stored in zip(groups, from_store):
+            if stored is None:
+                stored = self._from_index(articles[group[0]], fingerprints[group[0]])
+            if stored is not None:
+                yield group[0], self._with_alternates(stored, articles, group)
+            else:
+                todo.append(group)
+
+        limit = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        summarize = self._aiter_packed if (mode or self.summary_mode) == "packed" else self._aiter_each
+
+        async for i, result in summarize([articles[group[0]] for group in todo], limit):
+            group = todo[i]
+            position = group[0]
+            if isinstance(result, BaseException):
+                SUMMARIES.labels(outcome="error").inc()
+                logger.warning("Error processing article: %s", result, extra={"title": articles[position].get("title")})
+                continue
+            await self._summary_store_call(self._to_store, articles[position], result)
+            self._to_index(articles[position], fingerprints[position], result)
+            yield position, self._with_alternates(result, articles, group)
+
+    async def _aiter_each(self, articles: List[Dict],
+                          limit: asyncio.Semaphore) -> AsyncIterator[Tuple[int, Union[NewsArticle, BaseException]]]:
+        """Summarize every article with its own LLM call, yielding (index, summary or exception) as they finish."""
+        async def summarize(i: int, article: Dict) -> Tuple[int, Union[NewsArticle, BaseException]]:
+            try:
+                return i, await self.asummarize_article(article, limit)
+            except Exception as e:
+                return i, e
+
+        tasks = [asyncio.ensure_future(summarize(i, a)) for i, a in enumerate(articles)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _aiter_packed(self, articles: List[Dict],
+                            limit: asyncio.Semaphore) -> AsyncIterator[Tuple[int, Union[NewsArticle, BaseException]]]:
+        """
+        Summarize articles several per prompt, parsing the JSON answer back per article.
+
+        Articles missing from the answer, or whose whole pack failed, fall back to one call each.
+        """
+        pending = []
+        for i, article in enumerate(articles):
+            if article.get("content") or article.get("description"):
+                pending.append(i)
+            else:
+                SUMMARIES.labels(outcome="no_content").inc()
+                yield i, self._build_article(article, NO_CONTENT_SUMMARY)
+
+        async def summarize_pack(pack: List[int]) -> Tuple[List[int], Dict[int, str]]:
+            prompt_articles = self._format_pack(articles, pack)
+
+            async def attempt() -> str:
+                async with limit:
+                    start = time.perf_counter()
+                    with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
+                        text = await self.llm.asummarize_packed(prompt_articles)
+                    self._record_usage("summarize_packed", self.llm.format_packed(prompt_articles),
+                                       text, time.perf_counter() - start)
+                    return text
+
+            try:
+                await self.llm.awarm_up()
+                with STAGE_SECONDS.labels(stage="summarize_packed").time():
+                    text = await self.retry_policy.arun(attempt)
+                return pack, self._parse_packed(self._extract_packed(text))
+            except Exception as e:
+                logger.warning("Packed summarization failed for %d articles: %s", len(pack), e)
+                return pack, {}
+
+        tasks = [asyncio.ensure_future(summarize_pack(pack)) for pack in self._pack_articles(articles, pending)]
+        missing = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                pack, packed_summaries = await next_done
+                for i in pack:
+                    if packed_summaries.get(i):
+                        SUMMARIES.labels(outcome="llm").inc()
+                        yield i, self._build_article(articles[i], packed_summaries[i])
+                    else:
+                        missing.append(i)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if missing:
+            async for j, result in self._aiter_each([articles[i] for i in missing], limit):
+                yield missing[j], result
+
+    def _count_tokens(self, text: str) -> int:
+        return self.prompt_budget.counter.count(text)
+
+    def _pack_articles(self, articles: List[Dict], indices: List[int]) -> List[List[int]]:
+        """Greedily group article indices into packs that fit PACK_TOKEN_BUDGET and PACK_MAX_ARTICLES."""
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i in indices:
+            tokens = self._count_tokens(self._format_pack(articles, [i]))
+            if current and (current_tokens + tokens > PACK_TOKEN_BUDGET or len(current) >= PACK_MAX_ARTICLES):
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    def _format_pack(self, articles: List[Dict], indices: List[int]) -> str:
+        return "\n\n".join(
+            f"[{i}]\nTitle: {articles[i]['title']}\n"
+            f"Content: {self._article_content(articles[i])}"
+            for i in indices
+        )
+
+    @staticmethod
+    def _extract_packed(text: str) -> Union[Dict, List]:
+        """
+        Recover the packed JSON answer locally, even when it is fenced or wrapped in prose:
+        an object with "summaries" or a bare array of entries. Returns {} if there is none.
+        """
+        parsed = extract_json(text, allow_array=True)
+        return parsed if parsed is not None else {}
+
+    @staticmethod
+    def _parse_packed(parsed: Union[Dict, List]) -> Dict[int, str]:
+        """Map article ids to summaries from the packed JSON answer, ignoring malformed entries."""
+        entries = parsed.get("summaries", []) if isinstance(parsed, dict) else parsed
+        summaries: Dict[int, str] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                summary = str(entry["summary"]).strip()
+                if summary:
+                    summaries[int(entry["id"])] = summary
+            except (KeyError, TypeError, ValueError):
+                continue
+        return summaries
+
     def format_results(self, summaries: List[NewsArticle], query_info: Optional[str] = None) -> str:
         """Format the results in a readable way."""
         output = "📰 NEWS SUMMARIES 📰\n\n"
@@ -154,6 +543,9 @@ class NewsSummarizerAgent:
         return output
 
 def main():
+    from log_config import configure_logging
+    configure_logging("news-summariser")
+
     # Example usage with different formats
     examples = [
         "https://newsapi.org/v2/everything?q=Apple&from=2025-02-09&sortBy=popularity",
@@ -179,6 +571,7 @@ def main():
     
     # Initialize agent
     agent = NewsSummarizerAgent(news_api_key, openai_api_key)
+    agent.prompt_budget.counter.load()
     
     # Process each example
     for query in examples:
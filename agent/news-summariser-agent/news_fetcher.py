@@ -0,0 +1,105 @@
+import asyncio
+import copy
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+from metrics import CACHE_LOOKUPS
+
+
+def canonical_request_key(endpoint: str, params: Dict) -> str:
+    """Canonical form of a NewsAPI request: endpoint plus sorted params, without the API key."""
+    cleaned = {k: str(v) for k, v in params.items() if k != "apiKey" and v is not None}
+    return f"{endpoint}?{json.dumps(cleaned, sort_keys=True)}"
+
+
+class NewsFetcher:
+    """
+    Fetch layer in front of NewsAPI.
+
+    Identical requests are answered from a short-TTL cache, and concurrent identical
+    requests that miss the cache share one in-flight upstream call (single-flight).
+    The upstream call is a blocking function and runs in a worker thread.
+    """
+
+    def __init__(self, fetch: Callable[[str, Dict], List[Dict]], ttl: float = 60.0, max_entries: int = 256):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get(self, endpoint: str, params: Dict) -> List[Dict]:
+        """Return the articles for a request, from cache, a shared in-flight call or a new upstream call."""
+        key = canonical_request_key(endpoint, params)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.time():
+            self._cache.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.labels(cache="newsapi", result="hit").inc()
+            return copy.deepcopy(cached[1])
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            CACHE_LOOKUPS.labels(cache="newsapi", result="coalesced").inc()
+        else:
+            self.misses += 1
+            CACHE_LOOKUPS.labels(cache="newsapi", result="miss").inc()
+            task = asyncio.ensure_future(self._load(key, endpoint, params))
+            self._in_flight[key] = task
+
+        # Shield so one caller being cancelled does not cancel the call the others are waiting on
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def is_cached(self, endpoint: str, params: Dict) -> bool:
+        """Whether a request would be answered from cache or a shared in-flight call, without counting a lookup."""
+        key = canonical_request_key(endpoint, params)
+        cached = self._cache.get(key)
+        return (cached is not None and cached[0] > time.time()) or key in self._in_flight
+
+    async def _load(self, key: str, endpoint: str, params: Dict) -> List[Dict]:
+        try:
+            articles = await asyncio.to_thread(self._fetch, endpoint, dict(params))
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        if self.ttl > 0:
+            self._cache[key] = (time.time() + self.ttl, articles)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return articles
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._cache),
+            "ttl": self.ttl,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "upstream_saved_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def news_fetcher_from_env(fetch: Callable[[str, Dict], List[Dict]]) -> NewsFetcher:
+    """Build a NewsFetcher sized by NEWSAPI_CACHE_TTL (seconds, 0 disables caching) and NEWSAPI_CACHE_MAX_ENTRIES."""
+    return NewsFetcher(
+        fetch,
+        ttl=float(os.getenv("NEWSAPI_CACHE_TTL", 60)),
+        max_entries=int(os.getenv("NEWSAPI_CACHE_MAX_ENTRIES", 256)),
+    )
@@ -1,18 +1,45 @@
-from fastapi import FastAPI, HTTPException, Query
+import time
+_imports_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Union
+import asyncio
+import json
+import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from main import NewsSummarizerAgent  
+from prefetch import PrefetchScheduler, prefetch_scheduler_from_env
+from admission import (PRIORITY_COLD, PRIORITY_WARM, AdmissionError, admission_controller_from_env,
+                       deadline_from_headers, no_admission)
+from log_config import configure_logging
+from metrics import CONTENT_TYPE, HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, render
+from startup_profile import PROFILE
+
+# The LLM stack is not imported here; it loads in the background once the app is serving
+PROFILE.record("api_imports", time.perf_counter() - _imports_started)
+
+configure_logging("news-summariser")
+logger = logging.getLogger(__name__)
 
 # Response Models
+class AlternateSource(BaseModel):
+    source: str
+    title: str
+    url: str
+
 class ArticleSummary(BaseModel):
     title: str
     source: str
     published_date: str
     summary: str
     url: str
+    cached: bool = False
+    alternate_sources: List[AlternateSource] = []
 
 class NewsResponse(BaseModel):
     status: str = "success"
@@ -25,12 +52,57 @@ class NewsRequest(BaseModel):
     url: Optional[str] = Field(None, description="Full NewsAPI URL")
     params: Optional[Dict] = Field(None, description="Query parameters")
     max_articles: Optional[int] = Field(5, description="Maximum number of articles to process")
+    mode: Optional[str] = Field(None, description="Summarization mode: per_article or packed (server default if omitted)")
+
+# Background prefetcher for configured queries, started with the app
+prefetcher: Optional[PrefetchScheduler] = None
+
+# Bounded work queue for the summarization endpoints (None when ADMISSION_ENABLED is false)
+admission = admission_controller_from_env()
+
+# Load the LLM client in the background at startup instead of on the first request
+SUMMARY_LLM_WARMUP = os.getenv("SUMMARY_LLM_WARMUP", "true").lower() not in ("0", "false", "no")
+
+async def _warm_up_llm() -> None:
+    try:
+        await news_agent.llm.awarm_up()
+        PROFILE.milestone("llm_ready")
+    except Exception as e:
+        logger.exception("LLM warm-up failed, it will be retried on first use: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global prefetcher
+    warm_up = None
+    if news_agent:
+        # Load the tokenizer now, in a worker thread, so no request ever waits on it
+        with PROFILE.phase("tokenizer_load"):
+            await news_agent.prompt_budget.counter.aload()
+        if SUMMARY_LLM_WARMUP:
+            warm_up = asyncio.ensure_future(_warm_up_llm())
+        prefetcher = prefetch_scheduler_from_env(news_agent)
+        if prefetcher:
+            prefetcher.start()
+    PROFILE.milestone("serving")
+
+    yield
+
+    if prefetcher:
+        await prefetcher.stop()
+        prefetcher = None
+    if warm_up is not None:
+        warm_up.cancel()
+    if news_agent:
+        news_agent.llm.close()
+        if news_agent.summary_store is not None:
+            news_agent.summary_store.close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="News Summarizer API",
     description="API for fetching and summarizing news articles using NewsAPI and LangChain",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -42,6 +114,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """
+    Counts in-flight requests and records latency per route until the response starts
+    """
+    status = 500
+    start = time.perf_counter()
+    with HTTP_IN_FLIGHT.track_inprogress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label by route template, set once routing has run, so unknown paths share one series
+            path = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(method=request.method, path=path, status=status).observe(
+                time.perf_counter() - start
+            )
+
+@app.exception_handler(AdmissionError)
+async def admission_error_handler(request: Request, exc: AdmissionError):
+    """
+    Answers shed or expired requests quickly: 503 with Retry-After when over capacity, 504 past the deadline
+    """
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=exc.headers())
+
+def _priority(query: Union[str, Dict], max_articles: int) -> int:
+    return PRIORITY_WARM if news_agent.is_warm(query, max_articles) else PRIORITY_COLD
+
+def _admit(http_request: Request, priority: int, cancel_at_deadline: bool = True):
+    """
+    Work slot for a request, honouring the client's X-Request-Deadline / X-Request-Timeout headers
+    """
+    if admission is None:
+        return no_admission()
+    return admission.slot(
+        priority,
+        deadline=deadline_from_headers(http_request.headers),
+        is_disconnected=http_request.is_disconnected,
+        cancel_at_deadline=cancel_at_deadline
+    )
+
 # Initialize the news summarizer agent
 try:
     news_api_key = os.getenv("NEWS_API_KEY")
@@ -50,9 +164,10 @@ try:
     if not news_api_key or not openai_api_key:
         raise ValueError("API keys not found in environment variables")
         
-    news_agent = NewsSummarizerAgent(news_api_key, openai_api_key)
+    with PROFILE.phase("agent_init"):
+        news_agent = NewsSummarizerAgent(news_api_key, openai_api_key)
 except Exception as e:
-    print(f"Error initializing news agent: {str(e)}")
+    logger.exception("Error initializing news agent: %s", e)
     news_agent = None
 
 @app.get("/")
@@ -63,8 +178,18 @@ async def root():
         "documentation": "/docs"
     }
 
+@app.get("/health")
+async def health_check():
+    """
+    Liveness: answers as soon as the app serves, before the LLM client has finished loading
+    """
+    return {
+        "status": "healthy",
+        "llm_ready": bool(news_agent and news_agent.llm.ready)
+    }
+
 @app.post("/summarize", response_model=NewsResponse)
-async def summarize_news(request: NewsRequest):
+async def summarize_news(request: NewsRequest, http_request: Request):
     """
     Summarize news articles based on NewsAPI URL or parameters
     """
@@ -83,11 +208,15 @@ async def summarize_news(request: NewsRequest):
                 detail="Either url or params must be provided"
             )
         
-        # Process news
-        summaries = news_agent.process_news(
-            query,
-            max_articles=request.max_articles
-        )
+        # Serve warm prefetched summaries if available, otherwise process news live
+        summaries = prefetcher.get(query, request.max_articles) if prefetcher else None
+        if summaries is None:
+            async with _admit(http_request, _priority(query, request.max_articles)):
+                summaries = await news_agent.aprocess_news(
+                    query,
+                    max_articles=request.max_articles,
+                    mode=request.mode
+                )
         
         # Convert to response model
         article_summaries = [
@@ -96,7 +225,9 @@ async def summarize_news(request: NewsRequest):
                 source=s.source,
                 published_date=s.published_date,
                 summary=s.summary,
-                url=s.url
+                url=s.url,
+                cached=s.cached,
+                alternate_sources=s.alternate_sources
             ) for s in summaries
         ]
         
@@ -107,6 +238,8 @@ async def summarize_news(request: NewsRequest):
             timestamp=datetime.now().isoformat()
         )
         
+    except AdmissionError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -115,10 +248,12 @@ async def summarize_news(request: NewsRequest):
 
 @app.get("/top-headlines", response_model=NewsResponse)
 async def get_top_headlines(
+    http_request: Request,
     country: str = Query(None, description="Country code (e.g., us, gb, in)"),
     category: str = Query(None, description="News category (e.g., business, technology)"),
     q: str = Query(None, description="Search query"),
-    max_articles: int = Query(5, description="Maximum number of articles to fetch")
+    max_articles: int = Query(5, description="Maximum number of articles to fetch"),
+    mode: str = Query(None, description="Summarization mode: per_article or packed (server default if omitted)")
 ):
     """
     Get summarized top headlines with optional filters
@@ -147,8 +282,11 @@ async def get_top_headlines(
                 detail="At least one parameter (country, category, or q) must be provided"
             )
         
-        # Process news
-        summaries = news_agent.process_news(params, max_articles=max_articles)
+        # Serve warm prefetched summaries if available, otherwise process news live
+        summaries = prefetcher.get(params, max_articles) if prefetcher else None
+        if summaries is None:
+            async with _admit(http_request, _priority(params, max_articles)):
+                summaries = await news_agent.aprocess_news(params, max_articles=max_articles, mode=mode)
         
         # Convert to response model
         article_summaries = [
@@ -157,7 +295,9 @@ async def get_top_headlines(
                 source=s.source,
                 published_date=s.published_date,
                 summary=s.summary,
-                url=s.url
+                url=s.url,
+                cached=s.cached,
+                alternate_sources=s.alternate_sources
             ) for s in summaries
         ]
         
@@ -168,12 +308,219 @@ async def get_top_headlines(
             timestamp=datetime.now().isoformat()
         )
         
+    except AdmissionError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
+def _stream_response(http_request: Request, query: Union[str, Dict], max_articles: int,
+                     mode: Optional[str], stream_format: Optional[str]) -> StreamingResponse:
+    """
+    Stream summaries one event per article as each becomes ready, then a trailer event.
+
+    Events are newline-delimited JSON by default, or Server-Sent Events when format=sse or the
+    client accepts text/event-stream. Summary events carry the article's position in the
+    NewsAPI response, since they arrive in completion order.
+
+    Live streams are shed with 503 up front when the work queue is full; otherwise the stream
+    waits for its work slot once the response has started.
+    """
+    sse = stream_format == "sse" or (
+        stream_format is None and "text/event-stream" in http_request.headers.get("accept", "")
+    )
+
+    # Serve warm prefetched summaries if available, otherwise summarize live
+    warm = prefetcher.get(query, max_articles) if prefetcher else None
+    slot = no_admission()
+    if warm is None:
+        priority = _priority(query, max_articles)
+        if admission is not None:
+            admission.check(priority)
+        slot = _admit(http_request, priority, cancel_at_deadline=False)
+
+    def encode(event: Dict) -> str:
+        data = json.dumps(event)
+        return f"event: {event['type']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    async def events() -> AsyncIterator[str]:
+        count = 0
+        try:
+            if warm is not None:
+                results = _iterate(warm)
+            else:
+                results = news_agent.aiter_news(query, max_articles=max_articles, mode=mode)
+
+            async with slot:
+                async for index, s in results:
+                    summary = ArticleSummary(
+                        title=s.title,
+                        source=s.source,
+                        published_date=s.published_date,
+                        summary=s.summary,
+                        url=s.url,
+                        cached=s.cached,
+                        alternate_sources=s.alternate_sources
+                    )
+                    count += 1
+                    yield encode({"type": "summary", "index": index, "summary": summary.model_dump()})
+        except Exception as e:
+            yield encode({"type": "error", "detail": str(e)})
+            return
+
+        yield encode({
+            "type": "done",
+            "status": "success",
+            "query_info": str(query),
+            "count": count,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _iterate(summaries: List) -> AsyncIterator:
+    for index, summary in enumerate(summaries):
+        yield index, summary
+
+@app.post("/summarize/stream")
+async def summarize_news_stream(
+    request: NewsRequest,
+    http_request: Request,
+    format: str = Query(None, description="Stream format: ndjson or sse (defaults from the Accept header)")
+):
+    """
+    Summarize news articles like /summarize, streaming each summary as soon as it is ready
+    """
+    if not news_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="News agent not properly initialized. Check server logs."
+        )
+
+    query = request.url if request.url else request.params
+    if not query:
+        raise HTTPException(
+            status_code=400,
+            detail="Either url or params must be provided"
+        )
+
+    return _stream_response(http_request, query, request.max_articles, request.mode, format)
+
+@app.get("/top-headlines/stream")
+async def get_top_headlines_stream(
+    http_request: Request,
+    country: str = Query(None, description="Country code (e.g., us, gb, in)"),
+    category: str = Query(None, description="News category (e.g., business, technology)"),
+    q: str = Query(None, description="Search query"),
+    max_articles: int = Query(5, description="Maximum number of articles to fetch"),
+    mode: str = Query(None, description="Summarization mode: per_article or packed (server default if omitted)"),
+    format: str = Query(None, description="Stream format: ndjson or sse (defaults from the Accept header)")
+):
+    """
+    Get summarized top headlines like /top-headlines, streaming each summary as soon as it is ready
+    """
+    if not news_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="News agent not properly initialized"
+        )
+
+    params = {
+        "endpoint": "top-headlines",
+        "country": country,
+        "category": category,
+        "q": q
+    }
+    params = {k: v for k, v in params.items() if v is not None}
+
+    if len(params) <= 1:  # Only endpoint remains
+        raise HTTPException(
+            status_code=400,
+            detail="At least one parameter (country, category, or q) must be provided"
+        )
+
+    return _stream_response(http_request, params, max_articles, mode, format)
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics: per-stage latency histograms, outcome and cache counters, in-flight gauges
+    """
+    return Response(render(), media_type=CONTENT_TYPE)
+
+@app.get("/status/cache")
+async def cache_status():
+    """
+    NewsAPI response cache, summary store and near-duplicate index counters
+    """
+    if not news_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="News agent not properly initialized"
+        )
+
+    return {
+        "newsapi": news_agent.news_fetcher.stats(),
+        "summaries": news_agent.summary_store.stats() if news_agent.summary_store is not None else None,
+        "duplicates": news_agent.duplicate_index.stats() if news_agent.duplicate_index is not None else None
+    }
+
+@app.get("/status/tokens")
+async def token_status():
+    """
+    Prompt / completion tokens and latency of LLM calls
+    """
+    if not news_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="News agent not properly initialized"
+        )
+
+    return news_agent.token_stats()
+
+@app.get("/status/retries")
+async def retry_status():
+    """
+    LLM retry policy counters: retries, backoff sleep and deadline hits
+    """
+    if not news_agent:
+        raise HTTPException(
+            status_code=500,
+            detail="News agent not properly initialized"
+        )
+
+    return news_agent.retry_policy.stats()
+
+@app.get("/status/startup")
+async def startup_status():
+    """
+    Startup profile: import, agent and LLM client load times, and when the app began serving
+    """
+    return {
+        **PROFILE.stats(),
+        "llm": news_agent.llm.stats() if news_agent else None
+    }
+
+@app.get("/status/admission")
+async def admission_status():
+    """
+    Work queue state: active and queued requests, shed, expired and disconnected counts
+    """
+    return admission.stats() if admission is not None else {"enabled": False}
+
+@app.get("/status/prefetch")
+async def prefetch_status():
+    """
+    Background prefetcher state: warm result ages, refreshes and errors
+    """
+    return prefetcher.stats() if prefetcher else {"enabled": False}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+from news_fetcher import canonical_request_key
+
+logger = logging.getLogger(__name__)
+
+
+def parse_prefetch_queries(spec: str) -> List[Dict]:
+    """
+    Parse PREFETCH_QUERIES, a ';'-separated list of query strings such as
+    "country=us;country=us&category=business;endpoint=everything&q=bitcoin".
+    Queries default to the top-headlines endpoint.
+    """
+    queries = []
+    for part in spec.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        params = dict(parse_qsl(part))
+        params.setdefault("endpoint", "top-headlines")
+        queries.append(params)
+    return queries
+
+
+class PrefetchScheduler:
+    """
+    Keeps summaries for a fixed set of NewsAPI queries warm in the background.
+
+    Each query is polled every interval seconds (+/- jitter) through aprocess_news, so only
+    articles missing from the summary store reach the LLM. Upstream errors back off
+    exponentially up to max_backoff. Endpoints call get() and serve the warm result if it is
+    younger than max_staleness, otherwise they fall back to a live fetch.
+    """
+
+    def __init__(self, agent, queries: List[Dict], interval: float = 300.0, jitter: float = 0.1,
+                 max_staleness: float = 900.0, max_articles: int = 5, max_backoff: float = 1800.0):
+        self.agent = agent
+        self.queries = queries
+        self.interval = interval
+        self.jitter = jitter
+        self.max_staleness = max_staleness
+        self.max_articles = max_articles
+        self.max_backoff = max_backoff
+
+        self._warm: Dict[str, Tuple[float, List]] = {}
+        self._failures: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+
+        self.served = 0
+        self.stale = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def _key(self, query: Union[str, Dict]) -> str:
+        endpoint, params = self.agent.resolve_query(query)
+        params.pop("pageSize", None)
+        return canonical_request_key(endpoint, params)
+
+    def start(self) -> None:
+        for query in self.queries:
+            self._tasks.append(asyncio.create_task(self._poll(query)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get(self, query: Union[str, Dict], max_articles: int) -> Optional[List]:
+        """Return warm summaries for a query, or None if it is not prefetched, too stale or too small."""
+        if max_articles > self.max_articles:
+            return None
+        try:
+            key = self._key(query)
+        except Exception:
+            return None
+        warm = self._warm.get(key)
+        if warm is None:
+            return None
+        if time.time() - warm[0] > self.max_staleness:
+            self.stale += 1
+            return None
+        self.served += 1
+        return warm[1][:max_articles]
+
+    async def _poll(self, query: Dict) -> None:
+        key = self._key(query)
+        while True:
+            try:
+                summaries = await self.agent.aprocess_news(dict(query), max_articles=self.max_articles)
+                self._warm[key] = (time.time(), summaries)
+                self._failures[key] = 0
+                self.refreshes += 1
+                delay = self.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                failures = self._failures.get(key, 0) + 1
+                self._failures[key] = failures
+                delay = min(self.interval * 2 ** failures, self.max_backoff)
+                logger.warning("Prefetch failed, retrying in %.0fs: %s", delay, e,
+                               extra={"query": query, "attempt": failures})
+
+            await asyncio.sleep(delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def stats(self) -> Dict:
+        now = time.time()
+        return {
+            "queries": len(self.queries),
+            "interval": self.interval,
+            "max_staleness": self.max_staleness,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "served": self.served,
+            "stale": self.stale,
+            "ages": {key: round(now - fetched_at, 1) for key, (fetched_at, _) in self._warm.items()},
+            "consecutive_failures": {key: n for key, n in self._failures.items() if n},
+        }
+
+
+def prefetch_scheduler_from_env(agent) -> Optional[PrefetchScheduler]:
+    """
+    Build a scheduler for PREFETCH_QUERIES, or None when no queries are configured.
+    PREFETCH_INTERVAL, PREFETCH_JITTER, PREFETCH_MAX_STALENESS, PREFETCH_MAX_ARTICLES and
+    PREFETCH_MAX_BACKOFF tune it.
+    """
+    queries = parse_prefetch_queries(os.getenv("PREFETCH_QUERIES", ""))
+    if not queries:
+        return None
+    return PrefetchScheduler(
+        agent,
+        queries,
+        interval=float(os.getenv("PREFETCH_INTERVAL", 300)),
+        jitter=float(os.getenv("PREFETCH_JITTER", 0.1)),
+        max_staleness=float(os.getenv("PREFETCH_MAX_STALENESS", 900)),
+        max_articles=int(os.getenv("PREFETCH_MAX_ARTICLES", 5)),
+        max_backoff=float(os.getenv("PREFETCH_MAX_BACKOFF", 1800)),
+    )
@@ -0,0 +1,239 @@
+import ast
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
+
+from metrics import RETRY_SLEEP_SECONDS
+
+# This module is shared by the verifier and summariser services; keep both copies identical.
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+# Client exception classes (Together, OpenAI, aiohttp, requests) that signal a transient failure
+RETRYABLE_NAMES = {
+    "RateLimitError", "Timeout", "APITimeoutError", "APIConnectionError", "ServiceUnavailableError",
+    "InternalServerError", "ServerDisconnectedError", "ClientConnectionError", "ClientOSError",
+    "ConnectionError", "ReadTimeout", "ConnectTimeout", "TimeoutError",
+}
+
+
+class RetryableError(Exception):
+    """Raised by an attempt that failed in a way worth retrying, e.g. an unusable LLM answer."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request deadline leaves no time for another attempt."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Whether an exception is transient: RetryableError, timeouts, connection errors and
+    HTTP 408/409/425/429/5xx. Other 4xx responses and programming errors are not retried.
+    """
+    if isinstance(exc, (RetryableError, TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "http_status", None) or getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    return any(cls.__name__ in RETRYABLE_NAMES for cls in type(exc).__mro__)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter, bounded by a number of attempts and a per-request deadline.
+
+    Attempt n (from 0) is followed by a sleep drawn from
+    [(1 - jitter) * d, d] with d = min(max_delay, base_delay * multiplier ** n). No sleep is
+    started that would end past the deadline, and on the async path each attempt is also cut
+    off at the deadline. Only exceptions accepted by retryable are retried; the last one is
+    re-raised when the policy gives up.
+    """
+    name: str = "llm"
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+    jitter: float = 1.0
+    deadline: Optional[float] = 30.0
+    retryable: Callable[[BaseException], bool] = field(default=is_retryable, repr=False)
+
+    def __post_init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.sleep_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, prefix: str, **defaults: Any) -> "RetryPolicy":
+        """
+        Reads PREFIX_RETRY_ATTEMPTS, PREFIX_RETRY_BASE_DELAY, PREFIX_RETRY_MAX_DELAY and
+        PREFIX_RETRY_DEADLINE (0 disables the deadline), falling back to defaults.
+        """
+        policy = cls(name=prefix.lower(), **defaults)
+        policy.attempts = int(os.getenv(f"{prefix}_RETRY_ATTEMPTS", policy.attempts))
+        policy.base_delay = float(os.getenv(f"{prefix}_RETRY_BASE_DELAY", policy.base_delay))
+        policy.max_delay = float(os.getenv(f"{prefix}_RETRY_MAX_DELAY", policy.max_delay))
+        deadline = float(os.getenv(f"{prefix}_RETRY_DEADLINE", policy.deadline or 0))
+        policy.deadline = deadline or None
+        return policy
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return random.uniform((1 - self.jitter) * delay, delay)
+
+    def _next_delay(self, attempt: int, exc: BaseException, started: float) -> float:
+        """Returns the sleep before the next attempt, or re-raises exc if there should be none."""
+        if not self.retryable(exc) or attempt >= self.attempts - 1:
+            self.failures += 1
+            raise exc
+        delay = self.backoff(attempt)
+        if self.deadline is not None and time.monotonic() - started + delay >= self.deadline:
+            self.failures += 1
+            self.deadline_exceeded += 1
+            raise exc
+        logger.warning("%s attempt %d failed, retrying", self.name, attempt + 1,
+                       extra={"policy": self.name, "attempt": attempt + 1, "delay": round(delay, 3), "error": repr(exc)})
+        RETRY_SLEEP_SECONDS.labels(policy=self.name).observe(delay)
+        self.retries += 1
+        self.sleep_seconds += delay
+        return delay
+
+    def run(self, fn: Callable[[], T], started: Optional[float] = None) -> T:
+        """
+        Calls fn until it succeeds or the policy gives up. started is the time.monotonic() value
+        the deadline counts from, for work that already spent part of it; defaults to now.
+        """
+        self.calls += 1
+        started = time.monotonic() if started is None else started
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                time.sleep(self._next_delay(attempt, e, started))
+        raise RuntimeError("unreachable")
+
+    async def arun(self, fn: Callable[[], Awaitable[T]], started: Optional[float] = None) -> T:
+        """Async variant of run; each attempt is cancelled once the deadline passes."""
+        self.calls += 1
+        started = time.monotonic() if started is None else started
+        for attempt in range(self.attempts):
+            try:
+                if self.deadline is None:
+                    return await fn()
+                remaining = self.deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.deadline_exceeded += 1
+                    raise DeadlineExceeded(f"{self.name} deadline of {self.deadline}s exceeded")
+                # wait_for rather than asyncio.timeout, which needs Python 3.11 (the summariser runs 3.9)
+                return await asyncio.wait_for(fn(), remaining)
+            except DeadlineExceeded:
+                self.failures += 1
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._next_delay(attempt, e, started))
+        raise RuntimeError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "deadline": self.deadline,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "deadline_exceeded": self.deadline_exceeded,
+            "sleep_seconds": round(self.sleep_seconds, 3),
+        }
+
+
+FENCED = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _balanced_spans(text: str, opener: str = "{", closer: str = "}"):
+    """Yields (start, span) for each top-level opener...closer span of text, skipping brackets inside strings."""
+    depth = 0
+    start = None
+    quote = None
+    escaped = False
+    for i, ch in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch == '"':
+            quote = ch
+        elif ch == opener:
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == closer and depth:
+            depth -= 1
+            if depth == 0:
+                yield start, text[start:i + 1]
+
+
+def _loads_lenient(candidate: str, allow_array: bool = False) -> Optional[Union[Dict[str, Any], List[Any]]]:
+    """
+    json.loads, then common repairs: smart quotes, trailing commas, Python-style literals.
+    Returns the value if it is an object (or, with allow_array, an array), else None.
+    """
+    accepted = (dict, list) if allow_array else dict
+    attempts = [candidate]
+    repaired = TRAILING_COMMA.sub(r"\1", candidate.translate(SMART_QUOTES))
+    attempts.append(repaired)
+    for text in attempts:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(value, accepted):
+            return value
+    try:
+        # Single-quoted keys and True/False/None as some models write them
+        value = ast.literal_eval(re.sub(r"\btrue\b|\bfalse\b|\bnull\b",
+                                        lambda m: {"true": "True", "false": "False", "null": "None"}[m.group(0)],
+                                        repaired))
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return value if isinstance(value, accepted) else None
+
+
+def extract_json(text: str, allow_array: bool = False) -> Optional[Union[Dict[str, Any], List[Any]]]:
+    """
+    Recovers a JSON object from LLM output that may wrap it in markdown fences or prose.
+
+    Tries the whole text, then each fenced block, then each balanced {...} span, applying
+    small repairs to each candidate. With allow_array, a top-level JSON array is accepted
+    too, and balanced [...] spans are tried alongside {...} spans in order of position, so
+    an array of objects is returned whole rather than as its first element. Returns None
+    if nothing can be recovered.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    candidates = [text]
+    candidates.extend(block.strip() for block in FENCED.findall(text))
+    spans = list(_balanced_spans(text))
+    if allow_array:
+        spans = sorted(spans + list(_balanced_spans(text, "[", "]")))
+    candidates.extend(span for _, span in spans)
+    for candidate in candidates:
+        value = _loads_lenient(candidate, allow_array)
+        if value is not None:
+            return value
+    return None
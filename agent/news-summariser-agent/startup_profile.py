@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from metrics import Gauge
+
+STARTUP_PHASE_SECONDS = Gauge("startup_phase_seconds", "Wall-clock seconds of each startup phase", ["phase"])
+
+
+def _process_started_at() -> Optional[float]:
+    """Unix time the process started, read from /proc on Linux; None elsewhere."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+class StartupProfile:
+    """
+    Durations of startup phases (imports, agent construction, LLM client load) and the
+    moments the service became able to answer requests, relative to process start.
+    """
+
+    def __init__(self):
+        self.process_started_at = _process_started_at()
+        self.profile_started_at = time.time()
+        self._phases: Dict[str, float] = {}
+        self._milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _since_start(self) -> float:
+        return time.time() - (self.process_started_at or self.profile_started_at)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records the wall-clock seconds spent inside the block as phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._phases[name] = seconds
+        STARTUP_PHASE_SECONDS.labels(phase=name).set(seconds)
+
+    def milestone(self, name: str) -> None:
+        """Marks that the service reached a point, e.g. "serving" or "llm_ready", once."""
+        with self._lock:
+            self._milestones.setdefault(name, self._since_start())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "process_started_at": self.process_started_at,
+                "phases": {name: round(seconds, 4) for name, seconds in self._phases.items()},
+                "seconds_since_process_start": {name: round(t, 4) for name, t in self._milestones.items()},
+            }
+
+
+# One profile per process, filled in by the modules as they load
+PROFILE = StartupProfile()
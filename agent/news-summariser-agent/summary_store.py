@@ -0,0 +1,201 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def summary_key(article: Dict) -> str:
+    """Key an article by its URL plus a hash of its title and content, so edited stories are re-summarised."""
+    content = article.get("content") or article.get("description") or ""
+    digest = hashlib.sha256(f"{article.get('title', '')}\0{content}".encode("utf-8")).hexdigest()
+    return f"{article.get('url', '')}#{digest}"
+
+
+class SummaryStore:
+    """
+    Base class for summary stores with a TTL and an LRU bound on the number of entries.
+    Subclasses provide the storage.
+    """
+    backend = "base"
+
+    def __init__(self, ttl: float = 6 * 3600.0, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, article: Dict) -> Optional[str]:
+        """Return the stored summary for an unchanged article, or None."""
+        key = summary_key(article)
+        with self._lock:
+            summary = self._load(key)
+            if summary is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return summary
+
+    def put(self, article: Dict, summary: str) -> None:
+        """Store the summary of an article."""
+        with self._lock:
+            self._save(summary_key(article), summary, time.time() + self.ttl)
+            self.evictions += self._evict()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._count()
+        return {
+            "backend": self.backend,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        pass
+
+    # Storage hooks, always called with the lock held
+    def _load(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _save(self, key: str, summary: str, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def _evict(self) -> int:
+        raise NotImplementedError
+
+    def _count(self) -> int:
+        raise NotImplementedError
+
+
+class MemorySummaryStore(SummaryStore):
+    """Summary store held in an OrderedDict in LRU order."""
+    backend = "memory"
+
+    def __init__(self, ttl: float = 6 * 3600.0, max_entries: int = 5000):
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def _load(self, key: str) -> Optional[str]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return item[1]
+
+    def _save(self, key: str, summary: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, summary)
+        self._entries.move_to_end(key)
+
+    def _evict(self) -> int:
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def _count(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteSummaryStore(SummaryStore):
+    """Summary store persisted in a SQLite file so summaries survive restarts."""
+    backend = "sqlite"
+
+    def __init__(self, path: str, ttl: float = 6 * 3600.0, max_entries: int = 5000):
+        super().__init__(ttl, max_entries)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_lru ON summaries (last_access)")
+        self._db.commit()
+        self._accessed: Dict[str, float] = {}
+
+    def _load(self, key: str) -> Optional[str]:
+        now = time.time()
+        row = self._db.execute("SELECT summary, expires_at FROM summaries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._accessed.pop(key, None)
+            self._db.execute("DELETE FROM summaries WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        # Reads only note the access; it is written with the next save, eviction or close
+        self._accessed[key] = now
+        return row[0]
+
+    def _flush_access(self) -> None:
+        """Writes the access times noted by reads since the last flush; the caller commits."""
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE summaries SET last_access = ? WHERE key = ?",
+                [(at, key) for key, at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _save(self, key: str, summary: str, expires_at: float) -> None:
+        self._accessed.pop(key, None)
+        self._flush_access()
+        self._db.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)", (key, summary, expires_at, time.time())
+        )
+        self._db.commit()
+
+    def _evict(self) -> int:
+        self._flush_access()
+        excess = max(0, self._count() - self.max_entries)
+        if excess:
+            self._db.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY last_access LIMIT ?)", (excess,)
+            )
+        self._db.commit()
+        return excess
+
+    def _count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._db.commit()
+            self._db.close()
+
+
+def summary_store_from_env() -> Optional[SummaryStore]:
+    """
+    Build the summary store selected by SUMMARY_STORE_BACKEND (memory, sqlite or none),
+    sized by SUMMARY_STORE_TTL and SUMMARY_STORE_MAX_ENTRIES. The SQLite file lives at SUMMARY_STORE_PATH.
+    """
+    backend = os.getenv("SUMMARY_STORE_BACKEND", "memory").lower()
+    ttl = float(os.getenv("SUMMARY_STORE_TTL", 6 * 3600))
+    max_entries = int(os.getenv("SUMMARY_STORE_MAX_ENTRIES", 5000))
+
+    if backend == "memory":
+        return MemorySummaryStore(ttl=ttl, max_entries=max_entries)
+    if backend == "sqlite":
+        return SQLiteSummaryStore(os.getenv("SUMMARY_STORE_PATH", "summaries.sqlite3"), ttl=ttl, max_entries=max_entries)
+    return None
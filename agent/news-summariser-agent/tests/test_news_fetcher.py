@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from news_fetcher import NewsFetcher
+
+
+class Upstream:
+    def __init__(self, delay=0.1, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, params):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("NewsAPI down")
+        return [{"title": f"{endpoint} {params['q']}"}]
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    upstream = Upstream()
+    fetcher = NewsFetcher(upstream)
+
+    async def run():
+        # Same request with the params in a different order and an API key that is not part of the key
+        return await asyncio.gather(*(
+            fetcher.get("everything", {"q": "btc", "pageSize": 5} if i % 2 else {"pageSize": 5, "q": "btc", "apiKey": "k"})
+            for i in range(8)
+        ))
+
+    results = asyncio.run(run())
+    assert upstream.calls == 1
+    assert fetcher.misses == 1 and fetcher.coalesced == 7
+    assert all(r == [{"title": "everything btc"}] for r in results)
+    # Every caller gets its own copy
+    results[0][0]["title"] = "changed"
+    assert results[1][0]["title"] == "everything btc"
+
+
+def test_repeat_within_ttl_is_a_hit():
+    upstream = Upstream(delay=0)
+    fetcher = NewsFetcher(upstream, ttl=60)
+
+    async def run():
+        await fetcher.get("everything", {"q": "btc"})
+        assert fetcher.is_cached("everything", {"q": "btc"})
+        return await fetcher.get("everything", {"q": "btc"})
+
+    assert asyncio.run(run()) == [{"title": "everything btc"}]
+    assert upstream.calls == 1 and fetcher.hits == 1
+
+
+def test_an_upstream_error_reaches_every_waiter_and_is_not_cached():
+    upstream = Upstream(fail=True)
+    fetcher = NewsFetcher(upstream)
+
+    async def run():
+        results = await asyncio.gather(*(fetcher.get("everything", {"q": "btc"}) for _ in range(3)),
+                                       return_exceptions=True)
+        upstream.fail = False
+        return results, await fetcher.get("everything", {"q": "btc"})
+
+    results, retried = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retried == [{"title": "everything btc"}]
+    assert upstream.calls == 2 and fetcher.errors == 1
+    assert fetcher.stats()["in_flight"] == 0
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    upstream = Upstream(delay=0.2)
+    fetcher = NewsFetcher(upstream)
+
+    async def run():
+        first = asyncio.ensure_future(fetcher.get("everything", {"q": "btc"}))
+        second = asyncio.ensure_future(fetcher.get("everything", {"q": "btc"}))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == [{"title": "everything btc"}]
+    assert upstream.calls == 1
@@ -0,0 +1,19 @@
+from main import NewsSummarizerAgent
+
+
+def parse(text):
+    return NewsSummarizerAgent._parse_packed(NewsSummarizerAgent._extract_packed(text))
+
+
+def test_packed_answer_as_object():
+    text = '```json\n{"summaries": [{"id": 0, "summary": "First."}, {"id": 2, "summary": "Third."}]}\n```'
+    assert parse(text) == {0: "First.", 2: "Third."}
+
+
+def test_packed_answer_as_bare_array():
+    text = '[{"id": 0, "summary": "First."}, {"id": 1, "summary": "Second."}]'
+    assert parse(text) == {0: "First.", 1: "Second."}
+
+
+def test_packed_answer_without_json_falls_back_to_per_article_calls():
+    assert parse("sorry, cannot") == {}
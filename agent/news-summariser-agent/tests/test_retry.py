@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from retry import RetryPolicy, extract_json
+
+
+def test_arun_cuts_off_an_attempt_at_the_deadline():
+    policy = RetryPolicy(attempts=3, base_delay=0.01, deadline=0.2)
+    calls = []
+
+    async def hangs():
+        calls.append(1)
+        await asyncio.sleep(5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(policy.arun(hangs))
+    # No time was left for a second attempt
+    assert len(calls) == 1
+    assert policy.stats()["deadline_exceeded"] == 1
+
+
+def test_arun_retries_transient_errors_within_the_deadline():
+    policy = RetryPolicy(attempts=3, base_delay=0.01, deadline=5.0)
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert asyncio.run(policy.arun(flaky)) == "ok"
+    assert policy.stats()["retries"] == 1
+
+
+def test_extract_json_keeps_a_bare_array_whole():
+    text = 'Here you go: [{"id": 0, "summary": "a"}, {"id": 1, "summary": "b"},]'
+    assert extract_json(text, allow_array=True) == [{"id": 0, "summary": "a"}, {"id": 1, "summary": "b"}]
+
+
+def test_extract_json_prefers_the_enclosing_object():
+    text = 'Sure. {"summaries": [{"id": 0, "summary": "a"}]}'
+    assert extract_json(text, allow_array=True) == {"summaries": [{"id": 0, "summary": "a"}]}
+
+
+def test_extract_json_returns_objects_only_by_default():
+    assert extract_json('[{"confidence_score": 0.8}]') == {"confidence_score": 0.8}
+    assert extract_json("no json here", allow_array=True) is None
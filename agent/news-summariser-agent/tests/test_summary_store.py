@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+from llm_client import SummaryLLM
+from main import NewsSummarizerAgent
+from summary_store import SQLiteSummaryStore
+
+ARTICLES = [
+    {
+        "title": f"Story {i}",
+        "source": {"name": "Wire"},
+        "publishedAt": "2025-02-07T10:00:00Z",
+        "url": f"https://example.com/story-{i}",
+        "content": f"Body of story {i} about an entirely different subject number {i}.",
+    }
+    for i in range(3)
+]
+
+
+class FakeLLM(SummaryLLM):
+    client = "fake"
+
+    def _load(self) -> None:
+        self.calls = 0
+
+    async def _acomplete(self, prompt: str) -> str:
+        self.calls += 1
+        return "A summary."
+
+
+class ThreadRecordingStore(SQLiteSummaryStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def _load(self, key):
+        self.threads.add(threading.get_ident())
+        return super()._load(key)
+
+    def _save(self, key, summary, expires_at):
+        self.threads.add(threading.get_ident())
+        super()._save(key, summary, expires_at)
+
+
+def test_sqlite_store_runs_off_the_event_loop(tmp_path):
+    store = ThreadRecordingStore(str(tmp_path / "summaries.sqlite3"))
+    llm = FakeLLM("key")
+    agent = NewsSummarizerAgent("news-key", "openai-key", summary_store=store, llm=llm)
+
+    async def fetch(endpoint, params):
+        return ARTICLES
+
+    agent.news_fetcher.get = fetch
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await agent.aprocess_news({"q": "x"}, max_articles=3)
+        second = await agent.aprocess_news({"q": "x"}, max_articles=3)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(run())
+    assert [a.cached for a in first] == [False, False, False]
+    assert [a.cached for a in second] == [True, True, True]
+    assert llm.calls == 3
+    assert store.threads and loop_thread not in store.threads
+    store.close()
+
+
+def test_sqlite_reads_do_not_write_and_recency_still_drives_eviction(tmp_path):
+    path = str(tmp_path / "summaries.sqlite3")
+    store = SQLiteSummaryStore(path, max_entries=2)
+    store.put(ARTICLES[0], "first")
+    store.put(ARTICLES[1], "second")
+
+    writes = store._db.total_changes
+    assert store.get(ARTICLES[0]) == "first"
+    assert store._db.total_changes == writes
+
+    # The read of the first story is flushed before eviction, so the second one is the LRU entry
+    store.put(ARTICLES[2], "third")
+    assert store.get(ARTICLES[1]) is None
+    assert store.get(ARTICLES[2]) == "third" and store.get(ARTICLES[0]) == "first"
+    assert store.evictions == 1
+    store.close()
+
+    # Access times noted since the last write are flushed on close
+    reopened = SQLiteSummaryStore(path, max_entries=2)
+    last_access = dict(reopened._db.execute("SELECT summary, last_access FROM summaries").fetchall())
+    assert last_access["first"] > last_access["third"]
+    reopened.close()
@@ -0,0 +1,308 @@
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from metrics import Counter, Gauge, Histogram
+
+# This module is shared by the verifier and summariser services; keep both copies identical.
+
+# Lower numbers are admitted first
+PRIORITY_WARM = 0  # Can likely be answered from a cache
+PRIORITY_COLD = 1  # Needs upstream fetches and LLM calls
+PRIORITY_NAMES = {PRIORITY_WARM: "warm", PRIORITY_COLD: "cold"}
+
+DEADLINE_HEADER = "X-Request-Deadline"  # Absolute Unix time in seconds
+TIMEOUT_HEADER = "X-Request-Timeout"  # Seconds from now
+
+ADMISSIONS = Counter("admission_total", "Admission decisions by priority and outcome", ["priority", "outcome"])
+QUEUE_DEPTH = Gauge("admission_queue_depth", "Requests waiting for a work slot")
+QUEUE_WAIT_SECONDS = Histogram("admission_wait_seconds", "Time spent waiting for a work slot", ["priority"])
+
+
+class AdmissionError(Exception):
+    """A request that was not run to completion, with the HTTP status to answer it with."""
+    status_code = 503
+
+    def headers(self) -> Dict[str, str]:
+        return {}
+
+
+class Overloaded(AdmissionError):
+    """The service is over capacity; the client should retry after retry_after seconds."""
+    status_code = 503
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Service over capacity ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after)}
+
+
+class DeadlineExceeded(AdmissionError):
+    """The client's deadline passed before the work finished, so the work was dropped."""
+    status_code = 504
+
+
+class ClientGone(AdmissionError):
+    """The client disconnected while its request was queued, so the work was dropped."""
+    status_code = 499  # Client Closed Request; nobody is left to read it
+
+
+def deadline_from_headers(headers: Mapping[str, str], default_timeout: Optional[float] = None) -> Optional[float]:
+    """
+    Reads the client's deadline from X-Request-Deadline (Unix time) or X-Request-Timeout
+    (seconds), whichever is sooner, and returns it as a time.monotonic() value.
+
+    Falls back to default_timeout seconds from now, or None for no deadline.
+    """
+    now_wall, now = time.time(), time.monotonic()
+    candidates: List[float] = []
+    try:
+        if headers.get(DEADLINE_HEADER):
+            candidates.append(now + float(headers[DEADLINE_HEADER]) - now_wall)
+        if headers.get(TIMEOUT_HEADER):
+            candidates.append(now + float(headers[TIMEOUT_HEADER]))
+    except ValueError:
+        pass
+    if not candidates and default_timeout:
+        candidates.append(now + default_timeout)
+    return min(candidates) if candidates else None
+
+
+class AdmissionController:
+    """
+    Bounded work queue in front of the expensive endpoints.
+
+    At most max_concurrency requests run at once and at most max_queue wait for a slot.
+    Waiting requests are admitted by priority (warm before cold), then in arrival order.
+    When the queue is full a warm request displaces the newest cold one; otherwise the
+    newcomer is shed. A request is also shed after waiting max_wait seconds, and dropped
+    once its client's deadline has passed or the client has disconnected. Shed requests
+    carry a Retry-After estimate from the recent service time and the queue length.
+    """
+
+    def __init__(self, max_concurrency: int = 16, max_queue: int = 64, max_wait: float = 10.0,
+                 max_retry_after: int = 60):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_retry_after = max_retry_after
+        self._active = 0
+        self._waiters: List[List[Any]] = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+        # Exponentially weighted mean of seconds a request holds its slot
+        self._service_time = 1.0
+
+        self.admitted = 0
+        self.completed = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "wait_timeout": 0, "displaced": 0}
+        self.expired = 0
+        self.disconnected = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter[2].done())
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, for the Retry-After header."""
+        rounds = (self.queued + 1) / max(1, self.max_concurrency)
+        return max(1, min(self.max_retry_after, math.ceil(self._service_time * rounds)))
+
+    def check(self, priority: int = PRIORITY_COLD) -> None:
+        """Raises Overloaded at once if a request of this priority would be shed on arrival."""
+        if self._active < self.max_concurrency or self.queued < self.max_queue:
+            return
+        if priority == PRIORITY_WARM and any(w[0] > priority and not w[2].done() for w in self._waiters):
+            return
+        self._shed(priority, "queue_full")
+
+    def _shed(self, priority: int, reason: str) -> None:
+        self.shed[reason] += 1
+        ADMISSIONS.labels(priority=PRIORITY_NAMES.get(priority, priority), outcome=reason).inc()
+        raise Overloaded(reason, self.retry_after())
+
+    def _displace(self, priority: int) -> bool:
+        """Rejects the newest waiter of a lower priority than priority to make room; True if one was found."""
+        victims = [w for w in self._waiters if w[0] > priority and not w[2].done()]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda w: (w[0], w[1]))
+        self.shed["displaced"] += 1
+        ADMISSIONS.labels(priority=PRIORITY_NAMES.get(victim[0], victim[0]), outcome="displaced").inc()
+        victim[2].set_exception(Overloaded("displaced", self.retry_after()))
+        return True
+
+    def _wake(self) -> None:
+        """Hands free slots to the best waiting requests."""
+        while self._waiters and self._active < self.max_concurrency:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
+        QUEUE_DEPTH.set(self.queued)
+
+    async def _acquire(self, priority: int, deadline: Optional[float]) -> None:
+        name = PRIORITY_NAMES.get(priority, priority)
+        if deadline is not None and deadline <= time.monotonic():
+            self.expired += 1
+            ADMISSIONS.labels(priority=name, outcome="expired").inc()
+            raise DeadlineExceeded("Request deadline passed before it was queued")
+
+        if self._active < self.max_concurrency and not self.queued:
+            self._active += 1
+            return
+
+        if self.queued >= self.max_queue and not (priority == PRIORITY_WARM and self._displace(priority)):
+            self._shed(priority, "queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), future])
+        QUEUE_DEPTH.set(self.queued)
+
+        timeout = self.max_wait
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and future.exception() is None:
+                # Granted a slot just as the wait ran out; give it back
+                self._release()
+            elif not future.done():
+                future.cancel()
+            if deadline is not None and deadline <= time.monotonic():
+                self.expired += 1
+                ADMISSIONS.labels(priority=name, outcome="expired").inc()
+                raise DeadlineExceeded("Request deadline passed while queued")
+            self._shed(priority, "wait_timeout")
+        except asyncio.CancelledError:
+            # The handler was cancelled while queued; give back a slot granted meanwhile
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release()
+            else:
+                future.cancel()
+            raise
+        finally:
+            QUEUE_WAIT_SECONDS.labels(priority=name).observe(time.perf_counter() - start)
+            QUEUE_DEPTH.set(self.queued)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_COLD, deadline: Optional[float] = None,
+                   is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+                   cancel_at_deadline: bool = True) -> AsyncIterator[None]:
+        """
+        Holds a work slot for the duration of the block.
+
+        Args:
+            priority (int): PRIORITY_WARM or PRIORITY_COLD.
+            deadline (Optional[float]): time.monotonic() value after which the caller has given up.
+                A request still queued at the deadline is dropped with DeadlineExceeded.
+            cancel_at_deadline (bool): Also cancel the block itself at the deadline and raise
+                DeadlineExceeded. Streaming responses pass False, since their block spans yields.
+            is_disconnected (Optional[Callable]): Checked once a slot is granted; a request whose
+                client has gone is dropped with ClientGone instead of being run.
+
+        Raises:
+            Overloaded: The request was shed; see retry_after.
+            DeadlineExceeded: The deadline passed while queued or running.
+            ClientGone: The client disconnected while queued.
+        """
+        await self._acquire(priority, deadline)
+        name = PRIORITY_NAMES.get(priority, priority)
+        start = None
+        try:
+            if is_disconnected is not None and await is_disconnected():
+                self.disconnected += 1
+                ADMISSIONS.labels(priority=name, outcome="disconnected").inc()
+                raise ClientGone("Client disconnected while queued")
+
+            self.admitted += 1
+            ADMISSIONS.labels(priority=name, outcome="admitted").inc()
+            start = time.perf_counter()
+            if deadline is None or not cancel_at_deadline:
+                yield
+            else:
+                async with _cancel_at(deadline) as expired:
+                    yield
+                if expired():
+                    self.expired += 1
+                    ADMISSIONS.labels(priority=name, outcome="expired").inc()
+                    raise DeadlineExceeded("Request deadline passed while running")
+            self.completed += 1
+        finally:
+            if start is not None:
+                self._service_time += 0.2 * (time.perf_counter() - start - self._service_time)
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_wait": self.max_wait,
+            "active": self._active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "shed": dict(self.shed),
+            "expired": self.expired,
+            "disconnected": self.disconnected,
+            "mean_service_seconds": round(self._service_time, 3),
+            "retry_after": self.retry_after(),
+        }
+
+
+@asynccontextmanager
+async def _cancel_at(deadline: float) -> AsyncIterator[Callable[[], bool]]:
+    """
+    Cancels the current task at deadline (a time.monotonic() value) and swallows that cancellation.
+    Yields a function telling whether the deadline struck. Works on Python versions without asyncio.timeout.
+    """
+    task = asyncio.current_task()
+    state = {"expired": False}
+
+    def expire() -> None:
+        state["expired"] = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(max(0.0, deadline - time.monotonic()), expire)
+    try:
+        yield lambda: state["expired"]
+    except asyncio.CancelledError:
+        if not state["expired"]:
+            raise
+        if hasattr(task, "uncancel"):
+            task.uncancel()
+    finally:
+        handle.cancel()
+
+
+@asynccontextmanager
+async def no_admission() -> AsyncIterator[None]:
+    """Stand-in for slot() when admission control is off."""
+    yield
+
+
+def admission_controller_from_env() -> Optional[AdmissionController]:
+    """
+    Build the admission controller from ADMISSION_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE and
+    ADMISSION_MAX_WAIT (seconds), or return None when ADMISSION_ENABLED is false.
+    """
+    if os.getenv("ADMISSION_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return AdmissionController(
+        max_concurrency=int(os.getenv("ADMISSION_MAX_CONCURRENCY", 16)),
+        max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", 64)),
+        max_wait=float(os.getenv("ADMISSION_MAX_WAIT", 10)),
+    )
@@ -0,0 +1,84 @@
+"""
+Compares the HTML extraction engines on article pages.
+
+Usage:
+    python benchmarks/extraction_benchmark.py [--fixtures DIR] [--repeat N] [--engines soup,lxml] [--json]
+
+Every *.html file in the fixtures directory is extracted N times per engine. The report
+lists median / mean time, peak traced memory and output length per page and engine.
+The bundled fixtures are synthetic (see README.md); for absolute numbers, pass --fixtures
+a directory of saved real article pages.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extraction import EXTRACTORS, create_extractor  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def run_engine(engine: str, html: bytes, repeat: int) -> dict:
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extractor = create_extractor(engine)
+        extractor.feed(html)
+        text = extractor.close()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    extractor = create_extractor(engine)
+    extractor.feed(html)
+    extractor.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+        "chars": len(text),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="Directory of *.html pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Extractions per page and engine")
+    parser.add_argument("--engines", default=",".join(EXTRACTORS), help="Comma-separated engine names")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    engines = [e for e in args.engines.split(",") if e]
+    pages = sorted(Path(args.fixtures).glob("*.html"))
+    if not pages:
+        sys.exit(f"No *.html fixtures found in {args.fixtures}")
+
+    results = []
+    for page in pages:
+        html = page.read_bytes()
+        for engine in engines:
+            result = {"page": page.name, "bytes": len(html), "engine": engine}
+            result.update(run_engine(engine, html, args.repeat))
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'page':<28}{'engine':<8}{'median ms':>11}{'mean ms':>10}{'peak KiB':>10}{'chars':>7}")
+    for r in results:
+        print(f"{r['page']:<28}{r['engine']:<8}{r['median_ms']:>11}{r['mean_ms']:>10}{r['peak_kib']:>10}{r['chars']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class PoolConfig:
+    """
+    Sizing for one keep-alive connection pool.
+
+    Attributes:
+        limit (int): Maximum number of open connections across all hosts.
+        limit_per_host (int): Maximum number of open connections to a single host.
+        keepalive_timeout (float): Seconds an idle connection is kept for reuse.
+        timeout (float): Total timeout for a single request, in seconds.
+    """
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    timeout: float = 10.0
+
+    @classmethod
+    def from_env(cls, prefix: str, **defaults: Any) -> "PoolConfig":
+        """
+        Builds a config from <PREFIX>_POOL_LIMIT, <PREFIX>_POOL_LIMIT_PER_HOST,
+        <PREFIX>_KEEPALIVE_TIMEOUT and <PREFIX>_TIMEOUT, falling back to the given defaults.
+
+        Args:
+            prefix (str): Environment variable prefix, e.g. "SCRAPE" or "LLM".
+            **defaults: Overrides for the dataclass defaults.
+
+        Returns:
+            PoolConfig: The resolved configuration.
+        """
+        config = cls(**defaults)
+        return cls(
+            limit=int(os.getenv(f"{prefix}_POOL_LIMIT", config.limit)),
+            limit_per_host=int(os.getenv(f"{prefix}_POOL_LIMIT_PER_HOST", config.limit_per_host)),
+            keepalive_timeout=float(os.getenv(f"{prefix}_KEEPALIVE_TIMEOUT", config.keepalive_timeout)),
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT", config.timeout)),
+        )
+
+
+class ConnectionPool:
+    """
+    A named keep-alive connection pool shared by every request in the process.
+
+    The async side is an aiohttp session over a TCPConnector with global and per-host
+    limits; the sync side is a requests.Session with a matching HTTPAdapter. Connection
+    creation and reuse on the async side are counted through an aiohttp TraceConfig.
+    """
+
+    def __init__(self, name: str, config: PoolConfig, headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.config = config
+        self.headers = headers or {}
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sync_session: Optional[requests.Session] = None
+
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled aiohttp session, creating it inside the running loop on first use.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.limit,
+                limit_per_host=self.config.limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    @property
+    def sync_session(self) -> requests.Session:
+        """
+        Returns the pooled requests session used by the synchronous code path.
+        """
+        if self._sync_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.config.limit,
+                pool_maxsize=self.config.limit_per_host,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(self.headers)
+            self._sync_session = session
+        return self._sync_session
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns pool configuration and connection reuse counters.
+        """
+        acquired = self.connections_created + self.connections_reused
+        return {
+            "limit": self.config.limit,
+            "limit_per_host": self.config.limit_per_host,
+            "keepalive_timeout": self.config.keepalive_timeout,
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_rate": round(self.connections_reused / acquired, 4) if acquired else 0.0,
+        }
+
+    async def close(self) -> None:
+        """
+        Closes both the async and sync sessions.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
@@ -0,0 +1,234 @@
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Type, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional, the BeautifulSoup engine works without it
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+MAX_CONTENT_CHARS = 5000
+SKIP_TAGS = {"script", "style", "nav", "header", "footer"}
+CONTENT_TAGS = {"article", "div"}
+CONTENT_CLASS = re.compile(r'(article|content|main|body)')
+
+
+class SoupExtractor:
+    """
+    The original extraction: builds a full BeautifulSoup tree with html.parser, drops
+    boilerplate elements and joins the text of every article/div whose class looks like content.
+
+    It cannot stop early, so feed only buffers the document until close.
+    """
+    name = "soup"
+    incremental = False
+
+    def __init__(self, max_chars: int = MAX_CONTENT_CHARS, encoding: Optional[str] = None):
+        self.max_chars = max_chars
+        self.encoding = encoding
+        self._chunks: List[Union[str, bytes]] = []
+
+    @property
+    def done(self) -> bool:
+        return False
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        self._chunks.append(chunk)
+
+    def close(self) -> str:
+        html = b"".join(self._chunks) if self._chunks and isinstance(self._chunks[0], bytes) else "".join(self._chunks)
+        soup = BeautifulSoup(html, 'html.parser', from_encoding=self.encoding if isinstance(html, bytes) else None)
+
+        # Remove unnecessary elements
+        for script in soup(list(SKIP_TAGS)):
+            script.decompose()
+
+        # Extract main content
+        main_content = soup.find_all(list(CONTENT_TAGS), class_=CONTENT_CLASS)
+
+        if not main_content:
+            main_content = [soup.body]
+
+        # Extract text
+        text = ' '.join([elem.get_text(strip=True) for elem in main_content])
+
+        # Clean and limit text
+        text = re.sub(r'\s+', ' ', text)
+        return text[:self.max_chars]
+
+
+class _Frame:
+    __slots__ = ("elem", "skip", "in_content", "in_body", "last_child")
+
+    def __init__(self, elem, skip: bool, in_content: bool, in_body: bool):
+        self.elem = elem
+        self.skip = skip
+        self.in_content = in_content
+        self.in_body = in_body
+        self.last_child = None
+
+
+class LxmlStreamExtractor:
+    """
+    Incremental extraction on top of lxml's HTMLPullParser (libxml2).
+
+    Text is collected in document order while the HTML is fed, from inside content-like
+    article/div elements and outside script/style/nav/header/footer. Once max_chars of
+    content text is collected the extractor reports done and the rest of the page is never
+    parsed. Body text is collected alongside as the fallback used when a page has no
+    content-like container. Unlike the BeautifulSoup engine, nested containers are not
+    repeated and text nodes are joined with spaces.
+    """
+    name = "lxml"
+    incremental = True
+
+    def __init__(self, max_chars: int = MAX_CONTENT_CHARS, encoding: Optional[str] = None):
+        if etree is None:
+            raise RuntimeError("lxml is not installed")
+        self.max_chars = max_chars
+        self._parser = etree.HTMLPullParser(
+            events=("start", "end"), remove_comments=True, remove_pis=True, encoding=encoding
+        )
+        self._stack: List[_Frame] = []
+        self._content: List[str] = []
+        self._content_chars = 0
+        self._body: List[str] = []
+        self._body_chars = 0
+
+    @property
+    def done(self) -> bool:
+        return self._content_chars >= self.max_chars
+
+    def feed(self, chunk: Union[str, bytes]) -> None:
+        if self.done:
+            return
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> str:
+        if not self.done:
+            try:
+                self._parser.close()
+            except etree.LxmlError:
+                pass
+            self._drain()
+
+        pieces = self._content if self._content else self._body
+        text = re.sub(r'\s+', ' ', ' '.join(pieces)).strip()
+        return text[:self.max_chars]
+
+    def _drain(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._start(elem)
+            else:
+                self._end(elem)
+            if self.done:
+                break
+
+    def _start(self, elem) -> None:
+        parent = self._stack[-1] if self._stack else None
+        tag = elem.tag if isinstance(elem.tag, str) else ""
+
+        if parent is not None:
+            # Text between the parent's start tag (or the previous sibling) and this element is complete now
+            if parent.last_child is None:
+                self._emit(parent.elem.text, parent)
+            else:
+                self._emit(parent.last_child.tail, parent)
+            parent.last_child = elem
+
+        in_content = tag in CONTENT_TAGS and bool(CONTENT_CLASS.search(elem.get("class") or ""))
+        self._stack.append(_Frame(
+            elem,
+            skip=tag in SKIP_TAGS or (parent is not None and parent.skip),
+            in_content=in_content or (parent is not None and parent.in_content),
+            in_body=tag == "body" or (parent is not None and parent.in_body),
+        ))
+
+    def _end(self, elem) -> None:
+        if not self._stack:
+            return
+        frame = self._stack.pop()
+        if frame.last_child is None:
+            self._emit(elem.text, frame)
+        else:
+            self._emit(frame.last_child.tail, frame)
+        # Children are no longer needed; keep the tail for the parent
+        elem.clear(keep_tail=True)
+
+    def _emit(self, text: Optional[str], frame: _Frame) -> None:
+        if frame.skip or not text:
+            return
+        text = text.strip()
+        if not text:
+            return
+        if frame.in_content:
+            self._content.append(text)
+            self._content_chars += len(text) + 1
+        elif frame.in_body and not self._content and self._body_chars < self.max_chars:
+            self._body.append(text)
+            self._body_chars += len(text) + 1
+
+
+EXTRACTORS: Dict[str, Type] = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlStreamExtractor.name: LxmlStreamExtractor,
+}
+DEFAULT_ENGINE = os.getenv("EXTRACTION_ENGINE", "lxml" if etree is not None else "soup")
+
+
+def create_extractor(engine: str = DEFAULT_ENGINE, max_chars: int = MAX_CONTENT_CHARS,
+                     encoding: Optional[str] = None):
+    """
+    Creates an incremental extractor for the named engine, falling back to BeautifulSoup
+    if the engine is unknown or unavailable.
+
+    Args:
+        engine (str): Engine name, one of EXTRACTORS.
+        max_chars (int): Number of content characters to collect.
+        encoding (Optional[str]): Charset of byte input, if known from the HTTP headers.
+
+    Returns:
+        An extractor exposing feed(chunk), done and close() -> str.
+    """
+    try:
+        return EXTRACTORS[engine](max_chars, encoding)
+    except (KeyError, RuntimeError, LookupError):
+        return SoupExtractor(max_chars, encoding)
+
+
+def extract_text(html: Union[str, bytes], engine: str = DEFAULT_ENGINE, max_chars: int = MAX_CONTENT_CHARS,
+                 encoding: Optional[str] = None) -> str:
+    """
+    Extracts and cleans the main content from the HTML of a news article.
+
+    If the selected engine fails or finds no text, the BeautifulSoup engine is used instead.
+
+    Args:
+        html (Union[str, bytes]): Raw HTML of the page.
+        engine (str): Extraction engine name.
+        max_chars (int): Maximum length of the returned text.
+        encoding (Optional[str]): Charset of byte input, if known from the HTTP headers.
+
+    Returns:
+        str: Extracted article content.
+    """
+    extractor = create_extractor(engine, max_chars, encoding)
+    text = ""
+    try:
+        extractor.feed(html)
+        text = extractor.close()
+    except Exception as e:
+        logger.warning("%s extraction failed, falling back to soup: %s", extractor.name, e)
+
+    if not text and not isinstance(extractor, SoupExtractor):
+        fallback = SoupExtractor(max_chars, encoding)
+        fallback.feed(html)
+        text = fallback.close()
+    return text
@@ -0,0 +1,337 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+# Exception class names (requests, aiohttp) that mean the host did not answer properly
+HOST_FAILURE_NAMES = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "ClientConnectionError",
+    "ClientConnectorError", "ClientOSError", "ServerDisconnectedError", "ServerTimeoutError",
+}
+
+
+class HostUnavailable(Exception):
+    """Raised before a request is sent when the host guard refuses it."""
+
+
+class CircuitOpenError(HostUnavailable):
+    """The host's circuit breaker is open."""
+
+
+class RateLimitedError(HostUnavailable):
+    """The host's rate limit would delay the request past max_wait."""
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def is_host_failure(exc: BaseException) -> bool:
+    """
+    Whether an exception says the host is unhealthy: timeouts, connection errors, 429 and 5xx.
+    4xx answers and unsupported content are the host working as intended and do not count.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status", None)
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return any(cls.__name__ in HOST_FAILURE_NAMES for cls in type(exc).__mro__)
+
+
+@dataclass
+class RateLimit:
+    """
+    Token bucket sizing for one host.
+
+    Attributes:
+        rate (float): Requests per second refilled into the bucket; 0 disables rate limiting.
+        burst (int): Bucket capacity, i.e. how many requests may go out back to back.
+    """
+    rate: float = 2.0
+    burst: int = 5
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking, so the caller decides
+    how to wait (time.sleep or asyncio.sleep). Not thread-safe; HostGuard holds the lock.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self.updated) * self.limit.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available, without taking it."""
+        if self.limit.rate <= 0:
+            return 0.0
+        self._refill(time.monotonic())
+        return max(0.0, (1.0 - self.tokens) / self.limit.rate)
+
+    def take(self) -> None:
+        """Takes a token; the balance goes negative when the caller has to wait for it."""
+        if self.limit.rate > 0:
+            self.tokens -= 1.0
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Closed: requests go through and consecutive host failures are counted. After
+    failure_threshold of them the breaker opens and requests fail fast. Once reset_timeout
+    has passed it is half-open: a single probe request is let through, and its outcome
+    closes the breaker again or re-opens it for another reset_timeout. Not thread-safe;
+    HostGuard holds the lock.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allows(self) -> bool:
+        """Whether a request may be sent now, without changing any state."""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self.probing)
+
+    def start(self) -> None:
+        """Marks a request as sent; in half-open state it becomes the probe."""
+        if self.state == self.HALF_OPEN:
+            self.probing = True
+
+    def success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.probing or self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None or self.probing:
+                self.times_opened += 1
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release(self) -> None:
+        """Ends a request whose outcome says nothing about the host, e.g. a cancelled one."""
+        self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 3)
+            if state == self.OPEN else 0.0,
+        }
+
+
+class HostGuard:
+    """
+    Per-host rate limiting and circuit breaking for outgoing scrapes.
+
+    Each host gets its own token bucket, sized by the most specific (longest) entry of
+    domain_limits it matches (a host matches a domain if it equals it or is a subdomain of
+    it) or default_limit otherwise, and its own circuit breaker. A request waits for its token, but is refused
+    with RateLimitedError if that wait would exceed max_wait, and with CircuitOpenError while
+    the host's breaker is open. Only the max_hosts most recently used hosts are tracked.
+    """
+
+    def __init__(self, default_limit: Optional[RateLimit] = None,
+                 domain_limits: Optional[Dict[str, RateLimit]] = None,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_wait: float = 5.0, max_hosts: int = 10000):
+        self.default_limit = default_limit or RateLimit()
+        self.domain_limits = {domain.lower(): limit for domain, limit in (domain_limits or {}).items()}
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_wait = max_wait
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, Tuple[TokenBucket, CircuitBreaker]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.admitted = 0
+        self.rate_limited = 0
+        self.circuit_rejected = 0
+        self.wait_seconds = 0.0
+
+    def limit_for(self, host: str) -> RateLimit:
+        matches = [domain for domain in self.domain_limits if host == domain or host.endswith("." + domain)]
+        return self.domain_limits[max(matches, key=len)] if matches else self.default_limit
+
+    def _entry(self, host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = (TokenBucket(self.limit_for(host)), CircuitBreaker(self.failure_threshold, self.reset_timeout))
+            self._hosts[host] = entry
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        return entry
+
+    def admit(self, host: str) -> float:
+        """
+        Reserves a request slot for host.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+
+        Raises:
+            CircuitOpenError: The host's breaker is open, or a half-open probe is already in flight.
+            RateLimitedError: The wait for a token would exceed max_wait.
+        """
+        with self._lock:
+            bucket, breaker = self._entry(host)
+            if not breaker.allows():
+                breaker.rejected += 1
+                self.circuit_rejected += 1
+                raise CircuitOpenError(f"Circuit open for {host} after {breaker.consecutive_failures} failures")
+            delay = bucket.delay()
+            if delay > self.max_wait:
+                self.rate_limited += 1
+                raise RateLimitedError(f"Rate limit for {host} would delay the request by {delay:.2f}s")
+            bucket.take()
+            breaker.start()
+            self.admitted += 1
+            self.wait_seconds += delay
+            return delay
+
+    def record(self, host: str, exc: Optional[BaseException] = None) -> None:
+        """Feeds the outcome of an admitted request to the host's breaker."""
+        with self._lock:
+            _, breaker = self._entry(host)
+            if exc is None or (isinstance(exc, Exception) and not is_host_failure(exc)):
+                breaker.success()
+            elif isinstance(exc, Exception):
+                breaker.failure()
+            else:
+                breaker.release()
+
+    def is_open(self, url: str) -> bool:
+        """Whether requests to the URL's host are currently refused by its breaker."""
+        host = host_of(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            return entry is not None and not entry[1].allows()
+
+    def is_throttled(self, url: str) -> bool:
+        """Whether a request to the URL's host would currently be refused by its rate limit."""
+        host = host_of(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            return entry is not None and entry[0].delay() > self.max_wait
+
+    @contextmanager
+    def request(self, url: str) -> Iterator[None]:
+        """Admits a request to the URL's host, sleeps out the rate limit and records the outcome."""
+        host = host_of(url)
+        time.sleep(self.admit(host))
+        try:
+            yield
+        except BaseException as e:
+            self.record(host, e)
+            raise
+        self.record(host)
+
+    @asynccontextmanager
+    async def arequest(self, url: str) -> AsyncIterator[None]:
+        """Async variant of request."""
+        host = host_of(url)
+        delay = self.admit(host)
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            yield
+        except BaseException as e:
+            self.record(host, e)
+            raise
+        self.record(host)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = {
+                host: dict(breaker.stats(), rate=bucket.limit.rate, burst=bucket.limit.burst,
+                           tokens=round(max(bucket.tokens, 0.0), 3))
+                for host, (bucket, breaker) in self._hosts.items()
+            }
+        return {
+            "default_rate": self.default_limit.rate,
+            "default_burst": self.default_limit.burst,
+            "domain_limits": {d: {"rate": l.rate, "burst": l.burst} for d, l in self.domain_limits.items()},
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "max_wait": self.max_wait,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "circuit_rejected": self.circuit_rejected,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "open_hosts": sorted(h for h, s in hosts.items() if s["state"] != CircuitBreaker.CLOSED),
+            "hosts": hosts,
+        }
+
+
+def parse_domain_limits(spec: str) -> Dict[str, RateLimit]:
+    """
+    Parses "example.com=1:3,slow.org=0.2" into per-domain limits: rate per second, then
+    an optional burst that defaults to max(1, rate).
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        domain, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        limits[domain.strip()] = RateLimit(rate=float(rate), burst=int(burst) if burst else max(1, int(float(rate))))
+    return limits
+
+
+def host_guard_from_env() -> Optional[HostGuard]:
+    """
+    Builds a host guard from SCRAPE_RATE_LIMIT, SCRAPE_RATE_BURST, SCRAPE_RATE_MAX_WAIT,
+    SCRAPE_DOMAIN_LIMITS, SCRAPE_BREAKER_FAILURES and SCRAPE_BREAKER_RESET, or returns None
+    when SCRAPE_HOST_GUARD_ENABLED is false.
+    """
+    if os.getenv("SCRAPE_HOST_GUARD_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return HostGuard(
+        default_limit=RateLimit(
+            rate=float(os.getenv("SCRAPE_RATE_LIMIT", 2.0)),
+            burst=int(os.getenv("SCRAPE_RATE_BURST", 5)),
+        ),
+        domain_limits=parse_domain_limits(os.getenv("SCRAPE_DOMAIN_LIMITS", "")),
+        failure_threshold=int(os.getenv("SCRAPE_BREAKER_FAILURES", 5)),
+        reset_timeout=float(os.getenv("SCRAPE_BREAKER_RESET", 30.0)),
+        max_wait=float(os.getenv("SCRAPE_RATE_MAX_WAIT", 5.0)),
+    )
@@ -0,0 +1,140 @@
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from metrics import Histogram
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_MODES = ("packed", "pool")
+
+BATCH_SIZE = Histogram("llm_batch_size", "Requests dispatched together per LLM batch", buckets=(1, 2, 4, 8, 16, 32))
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects requests from concurrent callers into small batches.
+
+    The first request of a batch starts a window of window seconds. The batch is flushed
+    when the window closes or max_batch requests have arrived, whichever is first. flush
+    receives the batch and must return one result per request, in order. Each caller
+    gets its own result back, or the exception if the whole flush failed. At most
+    max_concurrency flushes run at once; later batches wait for a free slot.
+
+    mode tells the flush function how to send a batch: "packed" as one multi-item prompt,
+    or "pool" as separate calls sharing the bounded pool.
+    """
+
+    def __init__(self, flush: Callable[[List[T]], Awaitable[List[R]]], window: float = 0.02,
+                 max_batch: int = 8, max_concurrency: int = 4, mode: str = "packed"):
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode {mode!r}, expected one of {BATCH_MODES}")
+        self._flush_fn = flush
+        self.window = window
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self.mode = mode
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+
+        self.items = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.flushed_full = 0
+        self.flushed_window = 0
+        self.sizes: Counter = Counter()
+
+    async def submit(self, item: T) -> R:
+        """Queues item for the next batch and waits for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self.items += 1
+
+        if len(self._pending) >= self.max_batch:
+            self.flushed_full += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._on_window)
+        return await future
+
+    def _on_window(self) -> None:
+        self._timer = None
+        if self._pending:
+            self.flushed_window += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        # Callers that gave up while the batch was waiting are not sent
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+
+        async with self._slots:
+            self.batches += 1
+            self.sizes[len(batch)] += 1
+            BATCH_SIZE.observe(len(batch))
+            try:
+                results = await self._flush_fn([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch flush returned {len(results)} results for {len(batch)} requests")
+            except Exception as e:
+                self.failed_batches += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "window": self.window,
+            "max_batch": self.max_batch,
+            "max_concurrency": self.max_concurrency,
+            "items": self.items,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "flushed_full": self.flushed_full,
+            "flushed_window": self.flushed_window,
+            "pending": len(self._pending),
+            "mean_batch_size": round(sum(n * c for n, c in self.sizes.items()) / self.batches, 3)
+            if self.batches else 0.0,
+            "batch_sizes": {str(n): c for n, c in sorted(self.sizes.items())},
+        }
+
+
+def micro_batcher_from_env(flush: Callable[[List[T]], Awaitable[List[R]]]) -> Optional[MicroBatcher]:
+    """
+    Builds a batcher from LLM_BATCH_MODE (packed or pool), LLM_BATCH_WINDOW_MS,
+    LLM_BATCH_MAX_SIZE and LLM_BATCH_MAX_CONCURRENCY, or returns None unless
+    LLM_BATCH_ENABLED is true.
+    """
+    if os.getenv("LLM_BATCH_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return MicroBatcher(
+        flush,
+        window=float(os.getenv("LLM_BATCH_WINDOW_MS", 20)) / 1000,
+        max_batch=int(os.getenv("LLM_BATCH_MAX_SIZE", 8)),
+        max_concurrency=int(os.getenv("LLM_BATCH_MAX_CONCURRENCY", 4)),
+        mode=os.getenv("LLM_BATCH_MODE", "packed").lower(),
+    )
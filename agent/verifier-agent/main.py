@@ -1,31 +1,255 @@
 import os
-import re
 import json
-import requests
-from typing import Dict, Any, Optional
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Any, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
 import time
+from contextlib import asynccontextmanager, nullcontext
 
 # Core libraries
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
 # Web scraping and search
 import together  
 
+from connection_pool import ConnectionPool, PoolConfig
+from extraction import DEFAULT_ENGINE, create_extractor, extract_text
+from host_guard import HostGuard, HostUnavailable, host_guard_from_env, host_of
+from llm_batcher import MicroBatcher, micro_batcher_from_env
+from metrics import CACHE_LOOKUPS, LLM_IN_FLIGHT, STAGE_SECONDS, Gauge
+from metrics import Counter as MetricCounter
+from parse_pool import ParsePool, parse_pool_from_env
+from precheck import PreChecker, prechecker_from_env
+from prompt_budget import PromptBudget, TokenMeter
+from retrieval import PassageRetriever
+from retry import RetryableError, RetryPolicy, extract_json
+from scrape_cache import CacheEntry, ScrapeCache, scrape_cache_from_env
+from verdict_cache import VerdictCache, verdict_cache_from_env, verdict_key
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+VERDICTS = MetricCounter("verifier_verdicts_total", "Verdicts by the path that produced them", ["source"])
+SCRAPES = MetricCounter("verifier_scrapes_total",
+                        "Scrape outcomes: fetched, cached, not_modified, skipped (host guard) or error", ["outcome"])
+SCRAPES_IN_FLIGHT = Gauge("verifier_scrapes_in_flight", "Article downloads in progress")
+
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+SCRAPE_TIMEOUT = 10  # seconds
+SCRAPE_STREAMING = os.getenv("SCRAPE_STREAMING", "true").lower() not in ("0", "false", "no")
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", 2 * 1024 * 1024))  # Body budget in streaming mode
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", SCRAPE_TIMEOUT))  # Overall seconds for fetch + extraction
+SCRAPE_CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+VERIFICATION_MODEL = "meta-llama/Llama-Vision-Free"
+EVIDENCE_TOKEN_BUDGET = int(os.getenv("EVIDENCE_TOKEN_BUDGET", 400))  # Tokens of scraped content shown to the LLM
+PROMPT_VERSION = "v3"  # Bump whenever _build_messages changes so memoized verdicts are not reused
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 8))
+BATCH_MAX_PER_DOMAIN = int(os.getenv("BATCH_MAX_PER_DOMAIN", 2))
+
 
 class NewsVerificationAgent:
-    def __init__(self):
+    def __init__(self, scrape_pool_config: Optional[PoolConfig] = None,
+                 llm_pool_config: Optional[PoolConfig] = None,
+                 scrape_cache: Optional[ScrapeCache] = None,
+                 verdict_cache: Optional[VerdictCache] = None,
+                 extraction_engine: str = DEFAULT_ENGINE,
+                 parse_pool: Optional[ParsePool] = None,
+                 streaming: bool = SCRAPE_STREAMING,
+                 max_bytes: int = SCRAPE_MAX_BYTES,
+                 scrape_deadline: float = SCRAPE_DEADLINE,
+                 prompt_budget: Optional[PromptBudget] = None,
+                 retriever: Optional[PassageRetriever] = None,
+                 prechecker: Optional[PreChecker] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 host_guard: Optional[HostGuard] = None,
+                 llm_batcher: Optional[MicroBatcher] = None):
         """
         Initialize the NewsVerificationAgent with API clients and configurations.
+
+        The agent is meant to live for the whole process: it owns keep-alive connection
+        pools for scraping and for the LLM provider that every request reuses.
+
+        Args:
+            scrape_pool_config (Optional[PoolConfig]): Pool sizing for news sites. Read from SCRAPE_* env vars if omitted.
+            llm_pool_config (Optional[PoolConfig]): Pool sizing for the LLM provider. Read from LLM_* env vars if omitted.
+            scrape_cache (Optional[ScrapeCache]): Cache for cleaned article text. Built from SCRAPE_CACHE_* env vars if omitted.
+            verdict_cache (Optional[VerdictCache]): Memoized LLM verdicts. Built from VERDICT_CACHE_* env vars if omitted.
+            extraction_engine (str): HTML extraction engine ("lxml" or "soup"), see extraction.EXTRACTORS.
+            parse_pool (Optional[ParsePool]): Process pool for HTML parsing on the async path. Built from
+                PARSE_POOL_WORKERS if omitted; parsing runs in a thread when no pool is configured.
+            streaming (bool): Stream article bodies and stop reading once enough text is extracted.
+            max_bytes (int): Maximum number of body bytes read per article in streaming mode.
+            scrape_deadline (float): Overall seconds allowed for fetching and extracting one article.
+            prompt_budget (Optional[PromptBudget]): Selects the evidence shown to the LLM. Defaults to
+                EVIDENCE_TOKEN_BUDGET tokens.
+            retriever (Optional[PassageRetriever]): Ranks scraped passages against the claim. Sized by
+                RETRIEVAL_TOP_K and RETRIEVAL_PASSAGE_WORDS if omitted.
+            prechecker (Optional[PreChecker]): Local check that settles obvious matches and mismatches
+                without the LLM. Built from PRECHECK_* env vars if omitted.
+            retry_policy (Optional[RetryPolicy]): Backoff, attempts and deadline for LLM calls. Read from
+                LLM_RETRY_* env vars if omitted.
+            host_guard (Optional[HostGuard]): Per-host rate limits and circuit breakers for scraping.
+                Built from SCRAPE_RATE_* and SCRAPE_BREAKER_* env vars if omitted.
+            llm_batcher (Optional[MicroBatcher]): Groups concurrent async LLM verifications into batches.
+                Its flush function must be _averify_batch. Built from LLM_BATCH_* env vars if omitted.
         """
         # API Keys
         self.together_api_key = os.getenv("TOGETHER_API_KEY")
 
-        # Initialize Together AI client for LLM verification
-        self.llm = together.Together(api_key=self.together_api_key)
+        # Initialize Together AI clients for LLM verification. Retries are left to retry_policy
+        # rather than the SDK, so one request cannot stack both.
+        self.llm = together.Together(api_key=self.together_api_key, max_retries=0)
+        self.async_llm = together.AsyncTogether(api_key=self.together_api_key, max_retries=0)
+        self.retry_policy = retry_policy or RetryPolicy.from_env("LLM", attempts=4, base_delay=0.5, max_delay=4.0)
+
+        # Keep-alive connection pools shared by every request
+        self.scrape_pool = ConnectionPool(
+            "scrape",
+            scrape_pool_config or PoolConfig.from_env("SCRAPE", timeout=SCRAPE_TIMEOUT),
+            headers=SCRAPE_HEADERS
+        )
+        self.llm_pool = ConnectionPool(
+            "llm",
+            llm_pool_config or PoolConfig.from_env("LLM", limit_per_host=20, timeout=60.0)
+        )
+
+        self.extraction_engine = extraction_engine
+        self.parse_pool = parse_pool if parse_pool is not None else parse_pool_from_env(extraction_engine)
+        self.streaming = streaming
+        self.max_bytes = max_bytes
+        self.scrape_deadline = scrape_deadline
+
+        # Per-host token buckets and circuit breakers, so one slow or dead publisher cannot tie up workers
+        self.host_guard = host_guard if host_guard is not None else host_guard_from_env()
+
+        # Cleaned article text keyed by normalized URL, so repeat verifications skip fetch and parse
+        self.scrape_cache = scrape_cache if scrape_cache is not None else scrape_cache_from_env()
+
+        # Parsed LLM verdicts keyed by prompt inputs, so identical (article, description) pairs skip the LLM
+        self.verdict_cache = verdict_cache if verdict_cache is not None else verdict_cache_from_env()
+
+        # Token-budgeted evidence selection and per-call token accounting
+        self.prompt_budget = prompt_budget or PromptBudget(EVIDENCE_TOKEN_BUDGET)
+        self.retriever = retriever or PassageRetriever()
+
+        # Deterministic pre-check in front of the LLM, and which path produced each verdict
+        self.prechecker = prechecker if prechecker is not None else prechecker_from_env()
+        self.verdict_sources: Counter = Counter()
+        self.token_meter = TokenMeter()
+
+        # Micro-batching of concurrent async LLM verifications (off unless LLM_BATCH_ENABLED)
+        self.llm_batcher = llm_batcher if llm_batcher is not None else micro_batcher_from_env(self._averify_batch)
+        self.batch_fallbacks = 0
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Returns connection reuse statistics for the scraping and LLM pools.
+        """
+        return {
+            "scrape": self.scrape_pool.stats(),
+            "llm": self.llm_pool.stats()
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns hit / miss counters for the scrape and verdict caches.
+        """
+        return {
+            "scrape": self.scrape_cache.stats() if self.scrape_cache is not None else None,
+            "verdict": self.verdict_cache.stats() if self.verdict_cache is not None else None
+        }
+
+    def verdict_stats(self) -> Dict[str, Any]:
+        """
+        Returns how many verdicts came from the pre-check, the verdict cache, the LLM or the fallback.
+        """
+        total = sum(self.verdict_sources.values())
+        avoided = self.verdict_sources["precheck"] + self.verdict_sources["cache"]
+        return {
+            "sources": dict(self.verdict_sources),
+            "total": total,
+            "llm_calls_avoided": avoided,
+            "llm_avoidance_rate": round(avoided / total, 4) if total else 0.0,
+            "precheck": self.prechecker.stats() if self.prechecker is not None else None
+        }
+
+    def host_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns per-host rate limit and circuit breaker state, or None when the host guard is off.
+        """
+        return self.host_guard.stats() if self.host_guard is not None else None
+
+    def batch_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns LLM batching efficiency, or None when batching is off.
+        """
+        if self.llm_batcher is None:
+            return None
+        stats = self.llm_batcher.stats()
+        stats["single_call_fallbacks"] = self.batch_fallbacks
+        return stats
+
+    def retry_stats(self) -> Dict[str, Any]:
+        """
+        Returns retry, backoff and deadline counters of the LLM retry policy.
+        """
+        return self.retry_policy.stats()
+
+    def token_stats(self) -> Dict[str, Any]:
+        """
+        Returns prompt / completion token totals and recent LLM calls.
+        """
+        stats = self.token_meter.stats()
+        stats["evidence_token_budget"] = self.prompt_budget.budget
+        stats["exact_token_counts"] = self.prompt_budget.counter.exact
+        return stats
+
+    async def aclose(self) -> None:
+        """
+        Closes the pooled connections and the scrape cache.
+        """
+        await self.scrape_pool.close()
+        await self.llm_pool.close()
+        if self.scrape_cache is not None:
+            self.scrape_cache.close()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+
+    def parse_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns queue depth and parse timings of the parse pool, or None when parsing runs in threads.
+        """
+        return self.parse_pool.stats() if self.parse_pool is not None else None
+
+    def _extract_text(self, html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+        """
+        Extracts and cleans the main content from the HTML of a news article.
+
+        Args:
+            html (Union[str, bytes]): Raw HTML of the page.
+            encoding (Optional[str]): Charset of byte input, if known from the HTTP headers.
+
+        Returns:
+            str: Extracted article content (first 5000 chars).
+        """
+        return extract_text(html, engine=self.extraction_engine, encoding=encoding)
+
+    async def _aextract_text(self, html: bytes, encoding: Optional[str] = None) -> str:
+        """
+        Extracts text off the event loop thread: in the parse pool if configured, otherwise in a thread.
+        """
+        with STAGE_SECONDS.labels(stage="parse").time():
+            if self.parse_pool is not None:
+                return await self.parse_pool.extract(html, encoding)
+            return await asyncio.to_thread(self._extract_text, html, encoding)
 
     def scrape_website(self, url: str) -> Optional[str]:
         """
@@ -37,39 +261,244 @@ class NewsVerificationAgent:
         Returns:
             Optional[str]: Extracted article content (first 5000 chars) or None if scraping fails.
         """
+        cached = self._cached_scrape(url)
+        if cached is not None and cached.is_fresh():
+            SCRAPES.labels(outcome="cached").inc()
+            return cached.text
+
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            headers = cached.conditional_headers() if cached is not None else {}
+            with self.host_guard.request(url) if self.host_guard is not None else nullcontext():
+                with STAGE_SECONDS.labels(stage="fetch").time(), SCRAPES_IN_FLIGHT.track_inprogress():
+                    # No single socket read may outlast the scrape deadline
+                    read_timeout = min(self.scrape_pool.config.timeout, self.scrape_deadline)
+                    with self.scrape_pool.sync_session.get(url, headers=headers,
+                                                           timeout=(self.scrape_pool.config.timeout, read_timeout),
+                                                           stream=self.streaming) as response:
+                        if response.status_code == 304 and cached is not None:
+                            self.scrape_cache.refresh(url, cached)
+                            SCRAPES.labels(outcome="not_modified").inc()
+                            return cached.text
+                        response.raise_for_status()
+                        self._check_content_type(response.headers.get("Content-Type"))
 
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+                        if self.streaming:
+                            text = self._stream_extract(response)
+                        else:
+                            with STAGE_SECONDS.labels(stage="parse").time():
+                                text = self._extract_text(response.text)
+
+            SCRAPES.labels(outcome="fetched").inc()
+            self._store_scrape(url, text, response.headers)
+            return text
+
+        except HostUnavailable as e:
+            SCRAPES.labels(outcome="skipped").inc()
+            logger.warning("Skipping scrape: %s", e, extra={"url": url})
+            return None
+        except Exception as e:
+            SCRAPES.labels(outcome="error").inc()
+            logger.warning("Scraping error: %r", e, extra={"url": url})
+            return None
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+    async def ascrape_website(self, url: str) -> Optional[str]:
+        """
+        Async variant of scrape_website that does not block the event loop.
 
-            # Remove unnecessary elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
+        Args:
+            url (str): The URL of the news article.
 
-            # Extract main content
-            main_content = soup.find_all(['article', 'div'], class_=re.compile(r'(article|content|main|body)'))
+        Returns:
+            Optional[str]: Extracted article content (first 5000 chars) or None if scraping fails.
+        """
+        cached = await self._scrape_cache_call(self._cached_scrape, url)
+        if cached is not None and cached.is_fresh():
+            SCRAPES.labels(outcome="cached").inc()
+            return cached.text
 
-            if not main_content:
-                main_content = [soup.body]
+        try:
+            headers = cached.conditional_headers() if cached is not None else {}
+            session = await self.scrape_pool.session()
+            async with self.host_guard.arequest(url) if self.host_guard is not None else nullcontext():
+                with STAGE_SECONDS.labels(stage="fetch").time(), SCRAPES_IN_FLIGHT.track_inprogress():
+                    async with asyncio.timeout(self.scrape_deadline):
+                        async with session.get(url, headers=headers) as response:
+                            if response.status == 304 and cached is not None:
+                                await self._scrape_cache_call(self.scrape_cache.refresh, url, cached)
+                                SCRAPES.labels(outcome="not_modified").inc()
+                                return cached.text
+                            response.raise_for_status()
+                            self._check_content_type(response.headers.get("Content-Type"))
+                            response_headers = response.headers
 
-            # Extract text
-            text = ' '.join([elem.get_text(strip=True) for elem in main_content])
+                            if self.streaming:
+                                text = await self._astream_extract(response)
+                            else:
+                                html = await response.read()
+                                # HTML parsing is CPU-bound, keep it off the event loop thread
+                                text = await self._aextract_text(html, response.charset)
 
-            # Clean and limit text
-            text = re.sub(r'\s+', ' ', text)
-            return text[:5000]
+            SCRAPES.labels(outcome="fetched").inc()
+            await self._scrape_cache_call(self._store_scrape, url, text, response_headers)
+            return text
 
+        except HostUnavailable as e:
+            SCRAPES.labels(outcome="skipped").inc()
+            logger.warning("Skipping scrape: %s", e, extra={"url": url})
+            return None
         except Exception as e:
-            print(f"Scraping Error for {url}: {e}")
+            SCRAPES.labels(outcome="error").inc()
+            logger.warning("Scraping error: %r", e, extra={"url": url})
             return None
 
-    def verify_news(self, headline: str, description: str, source_url: str) -> Dict[str, Any]:
+    @staticmethod
+    def _check_content_type(content_type: Optional[str]) -> None:
+        """
+        Rejects responses that are not HTML before any of the body is read.
+        """
+        if content_type and not content_type.split(";")[0].strip().lower().startswith(HTML_CONTENT_TYPES):
+            raise ValueError(f"Unsupported Content-Type: {content_type}")
+
+    def _stream_extract(self, response: Any) -> str:
+        """
+        Feeds a streamed requests response to an incremental extractor, stopping once it has
+        enough text, the byte budget is spent or the deadline passes.
+        """
+        deadline = time.monotonic() + self.scrape_deadline
+        extractor = create_extractor(self.extraction_engine, encoding=response.encoding)
+        chunks: List[bytes] = []
+        received = 0
+        parse_seconds = 0.0
+        for chunk in self._iter_body(response, deadline):
+            chunk = chunk[:self.max_bytes - received]
+            received += len(chunk)
+            chunks.append(chunk)
+            start = time.perf_counter()
+            extractor.feed(chunk)
+            parse_seconds += time.perf_counter() - start
+            if extractor.done or received >= self.max_bytes:
+                break
+
+        start = time.perf_counter()
+        text = extractor.close()
+        if not text:
+            text = extract_text(b"".join(chunks), engine="soup", encoding=response.encoding)
+        STAGE_SECONDS.labels(stage="parse").observe(parse_seconds + time.perf_counter() - start)
+        return text
+
+    def _iter_body(self, response: Any, deadline: float) -> Iterator[bytes]:
+        """
+        Yields the body of a streamed requests response as it arrives, raising TimeoutError once
+        the deadline passes. Each socket read may block only for the time left, so a server that
+        trickles bytes cannot hold a scrape past its deadline.
+        """
+        raw = response.raw
+        sock = getattr(getattr(raw, "connection", None), "sock", None)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Scrape deadline of {self.scrape_deadline}s exceeded")
+            if sock is not None:
+                sock.settimeout(remaining)
+            chunk = raw.read1(SCRAPE_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
+
+    async def _astream_extract(self, response: Any) -> str:
+        """
+        Async variant of _stream_extract over an aiohttp response. The overall deadline is
+        enforced by the caller.
+
+        Without a parse pool, incremental engines are fed chunk by chunk on the loop, which is
+        cheap with lxml and stops reading once there is enough text. With a parse pool, or with
+        engines that need the whole document, the budget-capped body is parsed through
+        _aextract_text instead, so PARSE_POOL_WORKERS keeps parsing off the event loop.
+        """
+        extractor = create_extractor(self.extraction_engine, encoding=response.charset)
+        feed_on_loop = extractor.incremental and self.parse_pool is None
+        chunks: List[bytes] = []
+        received = 0
+        parse_seconds = 0.0
+        async for chunk in response.content.iter_chunked(SCRAPE_CHUNK_SIZE):
+            chunk = chunk[:self.max_bytes - received]
+            received += len(chunk)
+            chunks.append(chunk)
+            if feed_on_loop:
+                start = time.perf_counter()
+                extractor.feed(chunk)
+                parse_seconds += time.perf_counter() - start
+                if extractor.done:
+                    break
+            if received >= self.max_bytes:
+                break
+
+        text = ""
+        if feed_on_loop:
+            start = time.perf_counter()
+            text = extractor.close()
+            STAGE_SECONDS.labels(stage="parse").observe(parse_seconds + time.perf_counter() - start)
+        if not text:
+            text = await self._aextract_text(b"".join(chunks), response.charset)
+        return text
+
+    def _cached_scrape(self, url: str) -> Optional[CacheEntry]:
+        """
+        Returns the cached entry for a URL, possibly stale, or None if caching is off or nothing is cached.
+        """
+        if self.scrape_cache is None:
+            return None
+        try:
+            entry = self.scrape_cache.get(url)
+        except Exception as e:
+            logger.warning("Scrape cache read error: %s", e, extra={"url": url})
+            return None
+        CACHE_LOOKUPS.labels(cache="scrape", result="hit" if entry is not None and entry.is_fresh() else "miss").inc()
+        return entry
+
+    def is_warm(self, url: str) -> bool:
+        """
+        Returns whether a request for this URL can skip the network: its page is cached and fresh,
+        or its host's circuit is open so it fails at once. Used to admit cheap requests first.
+        """
+        if self.host_guard is not None and self.host_guard.is_open(url):
+            return True
+        if self.scrape_cache is None:
+            return False
+        try:
+            return self.scrape_cache.contains(url)
+        except Exception as e:
+            logger.warning("Scrape cache read error: %s", e, extra={"url": url})
+            return False
+
+    async def ais_warm(self, *urls: str) -> bool:
+        """
+        Async is_warm for one or more URLs; True only if every one of them is warm.
+        """
+        return await self._scrape_cache_call(lambda: all(self.is_warm(url) for url in urls))
+
+    async def _scrape_cache_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs a scrape cache operation from async code: in a worker thread when the cache
+        is the SQLite-backed one, so disk I/O stays off the event loop, inline otherwise.
+        """
+        if self.scrape_cache is not None and self.scrape_cache.backend == "disk":
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _store_scrape(self, url: str, text: str, headers: Mapping[str, str]) -> None:
+        """
+        Caches cleaned article text together with the origin's ETag / Last-Modified validators.
+        """
+        if self.scrape_cache is None or not text:
+            return
+        try:
+            self.scrape_cache.put(url, text, etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"))
+        except Exception as e:
+            logger.warning("Scrape cache write error: %s", e, extra={"url": url})
+
+    def verify_news(self, headline: str, description: str, source_url: str,
+                    use_cache: bool = True) -> Dict[str, Any]:
         """
         Verifies a news story by comparing scraped content with LLM analysis.
 
@@ -77,6 +506,7 @@ class NewsVerificationAgent:
             headline (str): The news headline.
             description (str): The news description.
             source_url (str): The URL of the news article.
+            use_cache (bool): Whether a memoized verdict may be returned instead of calling the LLM.
 
         Returns:
             Dict[str, Any]: Verification results including confidence score, matches, discrepancies.
@@ -85,125 +515,465 @@ class NewsVerificationAgent:
         scraped_content = self.scrape_website(source_url)
 
         if not scraped_content:
-            return {
-                "verification_status": "unverified",
-                "confidence_score": 0,
-                "error": "Unable to scrape website content"
-            }
+            return self._scrape_failed_result(source_url)
 
         # Verify content using LLM
-        verification_result = self._verify_content(scraped_content, description)
+        verification_result = self._verify_content(scraped_content, description, use_cache=use_cache,
+                                                   headline=headline)
 
         return verification_result
 
-    def _verify_content(self, scraped_content: str, original_description: str) -> Dict[str, Any]:
+    async def averify_news(self, headline: str, description: str, source_url: str,
+                           use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Async variant of verify_news. Scraping, the LLM call and retry backoff all yield to the event loop.
+
+        Args:
+            headline (str): The news headline.
+            description (str): The news description.
+            source_url (str): The URL of the news article.
+            use_cache (bool): Whether a memoized verdict may be returned instead of calling the LLM.
+
+        Returns:
+            Dict[str, Any]: Verification results including confidence score, matches, discrepancies.
+        """
+        scraped_content = await self.ascrape_website(source_url)
+
+        if not scraped_content:
+            return self._scrape_failed_result(source_url)
+
+        return await self._averify_content(scraped_content, description, use_cache=use_cache,
+                                           headline=headline)
+
+    async def verify_many(self, items: Sequence[Any], max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                          max_per_domain: int = BATCH_MAX_PER_DOMAIN) -> List[Dict[str, Any]]:
+        """
+        Verifies a batch of news stories concurrently.
+
+        At most max_concurrency scrapes and LLM calls run at once, and at most max_per_domain
+        scrapes hit the same host. Each distinct source_url is scraped only once per batch.
+
+        Args:
+            items (Sequence[Any]): Objects with headline, description and source_url attributes
+                and an optional bypass_cache flag (e.g. NewsVerificationRequest).
+            max_concurrency (int): Global cap on concurrent scrapes and LLM calls.
+            max_per_domain (int): Cap on concurrent scrapes per host.
+
+        Returns:
+            List[Dict[str, Any]]: One verification result per item, in input order. Items that
+                failed carry an "error" key instead of raising.
+        """
+        global_limit = asyncio.Semaphore(max_concurrency)
+        domain_limits: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max_per_domain))
+        scrapes: Dict[str, asyncio.Future] = {}
+
+        async def scrape(url: str) -> Optional[str]:
+            async with domain_limits[urlparse(url).hostname or ""]:
+                async with global_limit:
+                    return await self.ascrape_website(url)
+
+        async def verify_one(item: Any) -> Dict[str, Any]:
+            try:
+                if item.source_url not in scrapes:
+                    scrapes[item.source_url] = asyncio.ensure_future(scrape(item.source_url))
+                scraped_content = await scrapes[item.source_url]
+
+                if not scraped_content:
+                    return self._scrape_failed_result(item.source_url)
+
+                async with global_limit:
+                    return await self._averify_content(
+                        scraped_content, item.description, use_cache=not getattr(item, "bypass_cache", False),
+                        headline=item.headline
+                    )
+            except Exception as e:
+                return {"error": f"Verification failed: {str(e)}"}
+
+        return list(await asyncio.gather(*(verify_one(item) for item in items)))
+
+    def _scrape_failed_result(self, url: str) -> Dict[str, Any]:
+        error = "Unable to scrape website content"
+        if self.host_guard is not None and self.host_guard.is_open(url):
+            error = f"Source {host_of(url)} is temporarily unavailable (circuit open), not scraped"
+        elif self.host_guard is not None and self.host_guard.is_throttled(url):
+            error = f"Source {host_of(url)} is being rate limited, not scraped"
+        return {
+            "verification_status": "unverified",
+            "confidence_score": 0,
+            "error": error
+        }
+
+    @staticmethod
+    def _fallback_result(discrepancy: str) -> Dict[str, Any]:
+        return {
+            "confidence_score": 0.5,
+            "isVerified": False,
+            "matching_details": [],
+            "discrepancies": [discrepancy]
+        }
+
+    def _tag(self, result: Dict[str, Any], source: str) -> Dict[str, Any]:
+        """
+        Marks which path produced a verdict ("precheck", "cache", "llm", "llm_packed" or "fallback")
+        and counts it.
+        """
+        result["verdict_source"] = source
+        self.verdict_sources[source] += 1
+        VERDICTS.labels(source=source).inc()
+        return result
+
+    def _precheck(self, scraped_content: str, original_description: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a verdict from the local pre-check, or None when the LLM has to decide.
+        """
+        if self.prechecker is None:
+            return None
+        result = self.prechecker.check(scraped_content, original_description)
+        return self._tag(result, "precheck") if result is not None else None
+
+    def _evidence(self, scraped_content: str, original_description: str, headline: str = "") -> str:
+        """
+        Selects the part of the scraped content that is shown to the LLM: the passages ranked
+        highest against the headline and description, cut to the evidence token budget.
+        """
+        with STAGE_SECONDS.labels(stage="evidence").time():
+            query = f"{headline} {original_description}".strip()
+            passages = self.retriever.retrieve(scraped_content, query)
+            return self.prompt_budget.select("\n\n".join(passages), query)
+
+    def _record_usage(self, messages: List[Dict[str, str]], response: Any, seconds: float,
+                      name: str = "verify") -> None:
+        """
+        Records the token usage reported by the provider, or counts it locally if none was reported.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+            self.token_meter.record(name, usage.prompt_tokens, usage.completion_tokens or 0, seconds)
+            return
+
+        count = self.prompt_budget.counter.count
+        choices = getattr(response, "choices", None)
+        completion = choices[0].message.content if choices else ""
+        self.token_meter.record(
+            name, sum(count(m["content"]) for m in messages), count(completion or ""), seconds, estimated=True
+        )
+
+    @staticmethod
+    def _build_messages(evidence: str, original_description: str) -> List[Dict[str, str]]:
+        """
+        Constructs the fact-checking messages in Together AI format.
+        """
+        return [
+            {"role": "system", "content": "You are a fact-checking AI. Compare the scraped content with the original news description and return a JSON output. The JSON format must include: confidence_score (float between 0 and 1), matching_details (list of strings), and discrepancies (list of strings)."},
+            {"role": "user", "content": f"Scraped Content: {evidence}\n\nOriginal Description: {original_description}\n\nProvide output in JSON format."},
+        ]
+
+    @staticmethod
+    def _build_batch_messages(items: Sequence[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Constructs one fact-checking prompt for several (evidence, description) pairs, numbered from 0.
+        """
+        claims = "\n\n".join(
+            f"[{i}]\nScraped Content: {evidence}\nOriginal Description: {description}"
+            for i, (evidence, description) in enumerate(items)
+        )
+        return [
+            {"role": "system", "content": "You are a fact-checking AI. For each numbered item, compare its scraped content with its original news description. Return a JSON object of the form {\"results\": [...]} with one entry per item. Each entry must include: id (the item number), confidence_score (float between 0 and 1), matching_details (list of strings), and discrepancies (list of strings)."},
+            {"role": "user", "content": f"{claims}\n\nProvide output in JSON format."},
+        ]
+
+    def _cached_verdict(self, evidence: str, original_description: str,
+                        use_cache: bool) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Looks up a memoized verdict.
+
+        Returns:
+            (key, verdict): key is None when the verdict cache is off; verdict is None on a miss or
+            when use_cache is False, in which case the fresh verdict still refreshes the entry.
+        """
+        if self.verdict_cache is None:
+            return None, None
+        key = verdict_key(evidence, original_description, VERIFICATION_MODEL, PROMPT_VERSION)
+        if not use_cache:
+            return key, None
+        verdict = self.verdict_cache.get(key)
+        CACHE_LOOKUPS.labels(cache="verdict", result="miss" if verdict is None else "hit").inc()
+        return key, verdict
+
+    @staticmethod
+    def _interpret_llm_response(response: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Turns a chat completion into a verification result.
+
+        Args:
+            response: Chat completion returned by the Together client.
+
+        Returns:
+            (result, None) for a parsed verdict, (fallback, reason) when the response is unusable
+            but should not be retried, or (None, reason) when the attempt should be retried.
+        """
+        # Check if response contains valid data
+        if not hasattr(response, "choices") or not response.choices:
+            reason = "Invalid LLM response structure"
+            return NewsVerificationAgent._fallback_result(reason), reason
+
+        # Get the raw response content
+        verification_result = response.choices[0].message.content.strip()
+
+        # Whole model outputs are only logged at DEBUG level
+        logger.debug("Raw LLM response", extra={"response": verification_result})
+
+        # Recover the JSON object even when it is fenced or surrounded by prose
+        parsed_result = extract_json(verification_result)
+        if parsed_result is None:
+            return None, "LLM response is not properly formatted JSON"
+
+        parsed_result = NewsVerificationAgent._parse_verdict(parsed_result)
+        if parsed_result is None:
+            return None, "LLM response has no numeric confidence_score"
+        return parsed_result, None
+
+    @staticmethod
+    def _parse_verdict(parsed_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Normalizes one verdict object from the LLM, or returns None if it has no numeric confidence_score.
+        """
+        try:
+            parsed_result["confidence_score"] = float(parsed_result["confidence_score"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        parsed_result.setdefault("matching_details", [])
+        parsed_result.setdefault("discrepancies", [])
+
+        # Add the isVerified flag based on confidence score
+        parsed_result["isVerified"] = parsed_result["confidence_score"] >= 0.7
+        return parsed_result
+
+    @staticmethod
+    def _interpret_batch_response(response: Any, size: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Maps item numbers to verdicts from a multi-item completion, ignoring malformed entries.
+        """
+        if not getattr(response, "choices", None):
+            return {}
+        text = (response.choices[0].message.content or "").strip()
+        logger.debug("Raw LLM batch response", extra={"response": text})
+
+        parsed = extract_json(text)
+        entries = parsed.get("results", []) if parsed is not None else []
+        verdicts: Dict[int, Dict[str, Any]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                i = int(entry.pop("id"))
+            except (KeyError, TypeError, ValueError):
+                continue
+            verdict = NewsVerificationAgent._parse_verdict(entry)
+            if verdict is not None and 0 <= i < size:
+                verdicts[i] = verdict
+        return verdicts
+
+    def _verify_content(self, scraped_content: str, original_description: str,
+                        use_cache: bool = True, headline: str = "") -> Dict[str, Any]:
         """
         Verify content using Together AI with retry mechanism in case of invalid JSON response.
 
         Args:
             scraped_content (str): Scraped website content
             original_description (str): Original news description
+            use_cache (bool): Whether a memoized verdict may be returned instead of calling the LLM
+            headline (str): News headline, used with the description to rank evidence passages
 
         Returns:
             Verification results
         """
+        prechecked = self._precheck(scraped_content, original_description)
+        if prechecked is not None:
+            return prechecked
+
         if not self.llm:
-            return {
-                "confidence_score": 0.5,
-                "isVerified": False,  # Add the isVerified flag
-                "matching_details": [],
-                "discrepancies": ["LLM not available for advanced verification"]
-            }
-
-        retry_count = 4  # Maximum number of retries
-        attempt = 0
-        while attempt < retry_count:
-            try:
-                # Construct messages in Together AI format
-                messages = [
-                    {"role": "system", "content": "You are a fact-checking AI. Compare the scraped content with the original news description and return a JSON output. The JSON format must include: confidence_score (float between 0 and 1), matching_details (list of strings), and discrepancies (list of strings)."},
-                    {"role": "user", "content": f"Scraped Content: {scraped_content[:1000]}\n\nOriginal Description: {original_description}\n\nProvide output in JSON format."},
-                ]
-                
-                # Call Together AI
+            return self._tag(self._fallback_result("LLM not available for advanced verification"), "fallback")
+
+        evidence = self._evidence(scraped_content, original_description, headline)
+        key, cached = self._cached_verdict(evidence, original_description, use_cache)
+        if cached is not None:
+            return self._tag(cached, "cache")
+
+        result, parsed = self._verify_with_retries(self._build_messages(evidence, original_description))
+        if parsed and key is not None:
+            self.verdict_cache.put(key, result)
+        return self._tag(result, "llm" if parsed else "fallback")
+
+    def _verify_with_retries(self, messages: List[Dict[str, str]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Calls the LLM under the retry policy until it returns a parseable verdict or the policy gives up.
+
+        Returns:
+            (result, parsed): parsed is True only when result is a verdict produced by the LLM.
+        """
+        def attempt() -> Tuple[Dict[str, Any], bool]:
+            start = time.perf_counter()
+            with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
                 response = self.llm.chat.completions.create(
-                    model="meta-llama/Llama-Vision-Free",
+                    model=VERIFICATION_MODEL,
                     messages=messages,
                     max_tokens=1024,
                     temperature=0.7,
                     top_p=0.7
                 )
+            self._record_usage(messages, response, time.perf_counter() - start)
+            return self._accept_llm_response(response)
 
-                # Check if response contains valid data
-                if not hasattr(response, "choices") or not response.choices:
-                    return {
-                        "confidence_score": 0.5,
-                        "isVerified": False,  # Add the isVerified flag
-                        "matching_details": [],
-                        "discrepancies": ["Invalid LLM response structure"]
-                    }
-
-                # Get the raw response content
-                verification_result = response.choices[0].message.content.strip()
-
-                # Log the response for debugging
-                print("Raw LLM Response:", verification_result)
-
-                # Ensure the response is formatted as JSON
-                if not verification_result.startswith("{") or not verification_result.endswith("}"):
-                    if attempt < retry_count - 1:
-                        print(f"Attempt {attempt + 1} failed: LLM response is not properly formatted JSON. Retrying...")
-                        attempt += 1
-                        time.sleep(2)  # Wait for 2 seconds before retrying
-                        continue  # Retry the request
-                    else:
-                        return {
-                            "confidence_score": 0.5,
-                            "isVerified": False,  # Add the isVerified flag
-                            "matching_details": [],
-                            "discrepancies": ["LLM response is not properly formatted JSON"]
-                        }
-
-                # Clean and parse the response
-                verification_result = verification_result.replace("\n", " ").strip()
-
-                # Try to parse as JSON
-                try:
-                    parsed_result = json.loads(verification_result)
-
-                    # Add the isVerified flag based on confidence score
-                    parsed_result["isVerified"] = parsed_result["confidence_score"] >= 0.7
-                    return parsed_result
-
-                except json.JSONDecodeError as e:
-                    print("JSON Decode Error:", e)  # Debug log for JSON parsing error
-                    if attempt < retry_count - 1:
-                        print(f"Attempt {attempt + 1} failed: JSON parsing error. Retrying...")
-                        attempt += 1
-                        time.sleep(2)  # Wait for 2 seconds before retrying
-                        continue  # Retry the request
-                    else:
-                        return {
-                            "confidence_score": 0.5,
-                            "isVerified": False,  # Add the isVerified flag
-                            "matching_details": [],
-                            "discrepancies": [f"JSON parsing error: {str(e)}"]
-                        }
+        try:
+            return self.retry_policy.run(attempt)
+        except Exception as e:
+            logger.error("LLM verification error: %r", e)
+            return self._fallback_result(str(e) or type(e).__name__), False
 
-            except Exception as e:
-                print(f"LLM Verification Error: {e}")
-                if attempt < retry_count - 1:
-                    print(f"Attempt {attempt + 1} failed: {str(e)}. Retrying...")
-                    attempt += 1
-                    time.sleep(2)  # Wait for 2 seconds before retrying
-                    continue  # Retry the request
-                else:
-                    return {
-                        "confidence_score": 0.5,
-                        "isVerified": False,  # Add the isVerified flag
-                        "matching_details": [],
-                        "discrepancies": [str(e)]
-                    }
+    def _accept_llm_response(self, response: Any) -> Tuple[Dict[str, Any], bool]:
+        """
+        Interprets a completion for the retry policy, raising RetryableError when it should be retried.
+        """
+        result, reason = self._interpret_llm_response(response)
+        if result is None:
+            raise RetryableError(reason)
+        return result, reason is None
+
+    async def _averify_content(self, scraped_content: str, original_description: str,
+                               use_cache: bool = True, headline: str = "") -> Dict[str, Any]:
+        """
+        Async variant of _verify_content using the async Together client and non-blocking backoff.
+
+        Args:
+            scraped_content (str): Scraped website content
+            original_description (str): Original news description
+            use_cache (bool): Whether a memoized verdict may be returned instead of calling the LLM
+            headline (str): News headline, used with the description to rank evidence passages
+
+        Returns:
+            Verification results
+        """
+        prechecked = self._precheck(scraped_content, original_description)
+        if prechecked is not None:
+            return prechecked
+
+        if not self.async_llm:
+            return self._tag(self._fallback_result("LLM not available for advanced verification"), "fallback")
+
+        evidence = self._evidence(scraped_content, original_description, headline)
+        key, cached = self._cached_verdict(evidence, original_description, use_cache)
+        if cached is not None:
+            return self._tag(cached, "cache")
+
+        packed = False
+        if self.llm_batcher is not None:
+            result, parsed, packed = await self.llm_batcher.submit((evidence, original_description))
+        else:
+            async with self._llm_session():
+                result, parsed = await self._averify_with_retries(
+                    self._build_messages(evidence, original_description)
+                )
+
+        # The cache key is that of the single-item prompt; verdicts of the packed prompt are not memoized
+        if parsed and key is not None and not packed:
+            self.verdict_cache.put(key, result)
+        return self._tag(result, ("llm_packed" if packed else "llm") if parsed else "fallback")
+
+    @asynccontextmanager
+    async def _llm_session(self):
+        """
+        Routes the Together SDK through the pooled session instead of a new one per call.
+        """
+        session_token = together.aiosession.set(await self.llm_pool.session())
+        try:
+            yield
+        finally:
+            together.aiosession.reset(session_token)
+
+    async def _averify_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[Dict[str, Any], bool]]:
+        """
+        Flush function of the LLM batcher: verifies (evidence, description) pairs from concurrent requests.
+
+        In "packed" mode a batch of several pairs goes out as one multi-item prompt, and pairs missing
+        from its answer are verified with a call each, within what is left of the same retry deadline.
+        In "pool" mode, or for a single pair, every pair gets its own call, all running concurrently.
+
+        Returns:
+            List[Tuple[Dict[str, Any], bool, bool]]: (result, parsed, packed) per pair, in input order;
+                packed tells whether the verdict came from the multi-item prompt.
+        """
+        results: List[Optional[Tuple[Dict[str, Any], bool, bool]]] = [None] * len(items)
+        started = time.monotonic()
+        async with self._llm_session():
+            if len(items) > 1 and self.llm_batcher.mode == "packed":
+                for i, verdict in (await self._averify_packed(items)).items():
+                    results[i] = (verdict, True, True)
+                self.batch_fallbacks += results.count(None)
+
+            rest = [i for i, result in enumerate(results) if result is None]
+            singles = await asyncio.gather(*(
+                self._averify_with_retries(self._build_messages(*items[i]), started=started) for i in rest
+            ))
+        for i, (result, parsed) in zip(rest, singles):
+            results[i] = (result, parsed, False)
+        return results
+
+    async def _averify_packed(self, items: List[Tuple[str, str]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Verifies several pairs with one LLM call under the retry policy.
+
+        Returns:
+            Dict[int, Dict[str, Any]]: Verdicts by item number; empty if the call failed.
+        """
+        messages = self._build_batch_messages(items)
+
+        async def attempt() -> Dict[int, Dict[str, Any]]:
+            start = time.perf_counter()
+            with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
+                response = await self.async_llm.chat.completions.create(
+                    model=VERIFICATION_MODEL,
+                    messages=messages,
+                    max_tokens=min(4096, 512 * len(items)),
+                    temperature=0.7,
+                    top_p=0.7
+                )
+            self._record_usage(messages, response, time.perf_counter() - start, name="verify_batch")
+            verdicts = self._interpret_batch_response(response, len(items))
+            if not verdicts:
+                raise RetryableError("LLM batch response has no usable results")
+            return verdicts
+
+        try:
+            return await self.retry_policy.arun(attempt)
+        except Exception as e:
+            logger.warning("Batched verification of %d items failed: %r", len(items), e)
+            return {}
+
+    async def _averify_with_retries(self, messages: List[Dict[str, str]],
+                                    started: Optional[float] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Async variant of _verify_with_retries; attempts are also cut off at the policy deadline,
+        counted from started (a time.monotonic() value) when part of it was already spent.
+        """
+        async def attempt() -> Tuple[Dict[str, Any], bool]:
+            start = time.perf_counter()
+            with STAGE_SECONDS.labels(stage="llm").time(), LLM_IN_FLIGHT.track_inprogress():
+                response = await self.async_llm.chat.completions.create(
+                    model=VERIFICATION_MODEL,
+                    messages=messages,
+                    max_tokens=1024,
+                    temperature=0.7,
+                    top_p=0.7
+                )
+            self._record_usage(messages, response, time.perf_counter() - start)
+            return self._accept_llm_response(response)
+
+        try:
+            return await self.retry_policy.arun(attempt, started=started)
+        except Exception as e:
+            logger.error("LLM verification error: %r", e)
+            return self._fallback_result(str(e) or type(e).__name__), False
 
 def verify_news_story(headline: str, description: str, source_url: str) -> Dict[str, Any]:
     """
@@ -218,11 +988,35 @@ def verify_news_story(headline: str, description: str, source_url: str) -> Dict[
         Dict[str, Any]: Verification results.
     """
     agent = NewsVerificationAgent()
+    agent.prompt_budget.counter.load()
     return agent.verify_news(headline, description, source_url)
 
 
+async def averify_news_story(headline: str, description: str, source_url: str) -> Dict[str, Any]:
+    """
+    Async variant of verify_news_story for use inside a running event loop.
+
+    Args:
+        headline (str): News headline.
+        description (str): News description.
+        source_url (str): Source URL of the news.
+
+    Returns:
+        Dict[str, Any]: Verification results.
+    """
+    agent = NewsVerificationAgent()
+    try:
+        await agent.prompt_budget.counter.aload()
+        return await agent.averify_news(headline, description, source_url)
+    finally:
+        await agent.aclose()
+
+
 # Example usage
 if __name__ == "__main__":
+    from log_config import configure_logging
+    configure_logging("news-verifier")
+
     result = verify_news_story(
         headline="Bitcoin Fails To Rise Above $98,000",
         description="Bitcoin price stood at $97,317.23 on Friday.",
@@ -1,23 +1,62 @@
 import os
 import json
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-# Import verification function from main script
-from main import verify_news_story
+# Import verification agent from main script
+from main import NewsVerificationAgent
+from admission import (PRIORITY_COLD, PRIORITY_WARM, AdmissionError, admission_controller_from_env,
+                       deadline_from_headers, no_admission)
+from log_config import configure_logging
+from metrics import CONTENT_TYPE, HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, render
 
 # Load environment variables
 load_dotenv()
 
+configure_logging("news-verifier")
+logger = logging.getLogger(__name__)
+
+# One agent per process, created at startup so its connection pools are reused across requests
+verification_agent: Optional[NewsVerificationAgent] = None
+
+# Bounded work queue for the verification endpoints (None when ADMISSION_ENABLED is false)
+admission = admission_controller_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global verification_agent
+    try:
+        verification_agent = NewsVerificationAgent()
+    except Exception as e:
+        logger.exception("Error initializing verification agent: %s", e)
+        verification_agent = None
+
+    if verification_agent is not None:
+        # Load the tokenizer now, in a worker thread, so no request ever waits on it
+        await verification_agent.prompt_budget.counter.aload()
+
+    yield
+
+    if verification_agent is not None:
+        await verification_agent.aclose()
+        verification_agent = None
+
+
 # Create FastAPI app with Autonome-compatible configuration
 app = FastAPI(
     title="News Verification Agent",
     description="AI-powered news verification system using web scraping and LLM analysis",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware (keep as-is)
@@ -29,39 +68,92 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """
+    Counts in-flight requests and records latency per route until the response starts
+    """
+    status = 500
+    start = time.perf_counter()
+    with HTTP_IN_FLIGHT.track_inprogress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label by route template, set once routing has run, so unknown paths share one series
+            path = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(method=request.method, path=path, status=status).observe(
+                time.perf_counter() - start
+            )
+
+@app.exception_handler(AdmissionError)
+async def admission_error_handler(request: Request, exc: AdmissionError):
+    """
+    Answers shed or expired requests quickly: 503 with Retry-After when over capacity, 504 past the deadline
+    """
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=exc.headers())
+
+def _admit(http_request: Request, warm: bool):
+    """
+    Work slot for a request, honouring the client's X-Request-Deadline / X-Request-Timeout headers
+    """
+    if admission is None:
+        return no_admission()
+    return admission.slot(
+        PRIORITY_WARM if warm else PRIORITY_COLD,
+        deadline=deadline_from_headers(http_request.headers),
+        is_disconnected=http_request.is_disconnected
+    )
+
 # Updated Request/Response Models
 class NewsVerificationRequest(BaseModel):
     headline: str
     description: str
     source_url: str  # Changed from HttpUrl to basic string
+    bypass_cache: bool = False  # Skip memoized verdicts and always ask the LLM
 
 class NewsVerificationResponse(BaseModel):
     confidence_score: float
     isVerified: bool
     matching_details: List[str]
     discrepancies: List[str]
+    verdict_source: Optional[str] = None  # precheck, cache, llm, llm_packed or fallback
+
+class NewsVerificationBatchItem(NewsVerificationResponse):
+    error: Optional[str] = None
+
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 100))
 
 # Updated endpoints
 @app.post("/verify-news", response_model=NewsVerificationResponse)
-async def verify_news(request: NewsVerificationRequest):
+async def verify_news(request: NewsVerificationRequest, http_request: Request):
     """
     Verify news content against source (Autonome-compatible endpoint)
     """
     try:
-        result = verify_news_story(
-            headline=request.headline,
-            description=request.description,
-            source_url=request.source_url 
-        )
+        if verification_agent is None:
+            raise RuntimeError("Verification agent not properly initialized. Check server logs.")
+
+        async with _admit(http_request, await verification_agent.ais_warm(request.source_url)):
+            result = await verification_agent.averify_news(
+                headline=request.headline,
+                description=request.description,
+                source_url=request.source_url,
+                use_cache=not request.bypass_cache
+            )
         
         # Ensure response matches the schema
         return NewsVerificationResponse(
             confidence_score=result.get("confidence_score", 0.0),
             isVerified=result.get("isVerified", False),
             matching_details=result.get("matching_details", []),
-            discrepancies=result.get("discrepancies", [])
+            discrepancies=result.get("discrepancies", []),
+            verdict_source=result.get("verdict_source")
         )
     
+    except AdmissionError:
+        raise
     except Exception as e:
         # Return error response in schema-compatible format
         return NewsVerificationResponse(
@@ -71,6 +163,38 @@ async def verify_news(request: NewsVerificationRequest):
             discrepancies=[f"Verification failed: {str(e)}"]
         )
 
+@app.post("/verify-news/batch", response_model=List[NewsVerificationBatchItem])
+async def verify_news_batch(requests: List[NewsVerificationRequest], http_request: Request):
+    """
+    Verify a batch of news items concurrently. Results come back in input order,
+    with per-item errors instead of failing the whole batch.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size {len(requests)} exceeds the maximum of {MAX_BATCH_SIZE}"
+        )
+
+    if verification_agent is None:
+        error = "Verification failed: Verification agent not properly initialized. Check server logs."
+        results = [{"error": error} for _ in requests]
+    else:
+        # A batch takes one work slot; verify_many bounds its own fan-out
+        warm = await verification_agent.ais_warm(*(r.source_url for r in requests))
+        async with _admit(http_request, warm):
+            results = await verification_agent.verify_many(requests)
+
+    return [
+        NewsVerificationBatchItem(
+            confidence_score=result.get("confidence_score", 0.0),
+            isVerified=result.get("isVerified", False),
+            matching_details=result.get("matching_details", []),
+            discrepancies=result.get("discrepancies", []),
+            verdict_source=result.get("verdict_source"),
+            error=result.get("error")
+        ) for result in results
+    ]
+
 # Keep health check and root endpoint as-is
 @app.get("/")
 async def root():
@@ -82,4 +206,91 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics: per-stage latency histograms, outcome and cache counters, in-flight gauges
+    """
+    return Response(render(), media_type=CONTENT_TYPE)
+
+@app.get("/status/pools")
+async def pool_status():
+    """
+    Connection pool sizing and reuse statistics for scraping and LLM calls
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.pool_stats()
+
+@app.get("/status/cache")
+async def cache_status():
+    """
+    Scrape and verdict cache sizes and hit / miss counters
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.cache_stats()
+
+@app.get("/status/parse")
+async def parse_status():
+    """
+    Parse pool queue depth and parse timings
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return {"parse_pool": verification_agent.parse_stats()}
+
+@app.get("/status/tokens")
+async def token_status():
+    """
+    Prompt / completion tokens and latency of LLM calls
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.token_stats()
+
+@app.get("/status/verdicts")
+async def verdict_status():
+    """
+    Which path produced each verdict (pre-check, cache, LLM, fallback) and the LLM-avoidance rate
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.verdict_stats()
+
+@app.get("/status/retries")
+async def retry_status():
+    """
+    LLM retry policy counters: retries, backoff sleep and deadline hits
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.retry_stats()
+
+@app.get("/status/hosts")
+async def host_status():
+    """
+    Per-host scrape rate limits and circuit breaker state (closed, open or half_open)
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.host_stats()
+
+@app.get("/status/batching")
+async def batching_status():
+    """
+    LLM micro-batching: batch sizes, flush reasons and single-call fallbacks
+    """
+    if verification_agent is None:
+        raise HTTPException(status_code=503, detail="Verification agent not initialized")
+    return verification_agent.batch_stats() or {"enabled": False}
+
+
+@app.get("/status/admission")
+async def admission_status():
+    """
+    Work queue state: active and queued requests, shed, expired and disconnected counts
+    """
+    return admission.stats() if admission is not None else {"enabled": False}
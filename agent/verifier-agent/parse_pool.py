@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+from extraction import DEFAULT_ENGINE, extract_text
+
+
+def _parse_in_worker(html: bytes, encoding: Optional[str], engine: str) -> Tuple[str, float]:
+    """
+    Runs in a pool process: extracts cleaned text and reports how long parsing took there.
+    """
+    start = time.perf_counter()
+    text = extract_text(html, engine=engine, encoding=encoding)
+    return text, time.perf_counter() - start
+
+
+class ParsePool:
+    """
+    Process pool that turns raw HTML bytes into cleaned article text on other cores.
+
+    HTML parsing and whitespace cleanup hold the GIL, so with threads a single uvicorn
+    worker can only use one core for them. Tracks queue depth (submitted but unfinished
+    parses), time spent parsing inside the workers and time spent waiting for a worker.
+    """
+
+    def __init__(self, workers: int, engine: str = DEFAULT_ENGINE):
+        self.workers = workers
+        self.engine = engine
+        # spawn rather than fork: the parent has an event loop and connection pools that must not be duplicated
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.parse_seconds = 0.0
+        self.max_parse_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    async def extract(self, html: bytes, encoding: Optional[str] = None) -> str:
+        """
+        Extracts cleaned text from raw HTML in a pool process.
+
+        Args:
+            html (bytes): Raw response body.
+            encoding (Optional[str]): Charset from the Content-Type header, if any.
+
+        Returns:
+            str: Extracted article content.
+        """
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            text, parse_seconds = await loop.run_in_executor(
+                self._executor, _parse_in_worker, html, encoding, self.engine
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.completed += 1
+        self.parse_seconds += parse_seconds
+        self.max_parse_seconds = max(self.max_parse_seconds, parse_seconds)
+        self.wait_seconds += max(0.0, time.perf_counter() - start - parse_seconds)
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "engine": self.engine,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_parse_ms": round(self.parse_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+            "max_parse_ms": round(self.max_parse_seconds * 1000, 3),
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_pool_from_env(engine: str = DEFAULT_ENGINE) -> Optional[ParsePool]:
+    """
+    Builds a parse pool with PARSE_POOL_WORKERS processes, or returns None when it is 0 (the default).
+    """
+    workers = int(os.getenv("PARSE_POOL_WORKERS", 0))
+    if workers <= 0:
+        return None
+    return ParsePool(workers, engine=engine)
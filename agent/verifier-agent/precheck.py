@@ -0,0 +1,249 @@
+import difflib
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from prompt_budget import STOPWORDS
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+MONTH_NAMES = set(MONTHS) | {
+    "january", "february", "march", "april", "june", "july", "august", "sept", "september", "october",
+    "november", "december"
+}
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+MONTH_DAY = re.compile(
+    r'\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|'
+    r'Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b',
+    re.IGNORECASE
+)
+ISO_DATE = re.compile(r'\b\d{4}-(\d{2})-(\d{2})\b')
+WEEKDAY = re.compile(r'\b(' + "|".join(WEEKDAYS) + r')\b', re.IGNORECASE)
+NUMBER = re.compile(r'(?<![\w.])[$€£¥]?\d[\d,]*(?:\.\d+)?%?')
+NAME = re.compile(r"\b[A-Z][a-zA-Z0-9&'-]+\b")
+WORD = re.compile(r"[a-z0-9][a-z0-9&'-]+")
+NEXT_WORD = re.compile(r"\s*([a-zA-Z]+)")
+
+# Words after a number that say what it measures, making "10 million" as telling as "$10"
+UNITS = {
+    "thousand", "million", "billion", "trillion", "bn", "mn", "percent", "pct", "bps", "basis", "points",
+    "dollars", "euros", "pounds", "yen", "km", "kg", "miles", "tonnes", "tons", "barrels",
+}
+
+# How much each kind of fact counts towards the match score. A "count" is a short bare
+# number ("3", "10", "5%") that turns up on almost any page, so finding it proves little
+WEIGHTS = {"number": 3.0, "date": 2.0, "name": 1.0, "count": 0.5}
+FUZZY_CREDIT = 0.75  # Share of a fact's weight earned by an approximate match
+
+
+def _is_distinctive(token: str, next_word: str) -> bool:
+    """
+    Whether a number is specific enough to identify a claim: three or more digits, or two
+    with a currency sign, percent sign, decimal point or unit word.
+    """
+    digits = sum(c.isdigit() for c in token)
+    if digits >= 3:
+        return True
+    marked = token[0] in "$€£¥" or token.endswith("%") or "." in token or next_word.lower() in UNITS
+    return digits >= 2 and marked
+
+
+def _number_value(token: str) -> Optional[float]:
+    try:
+        return float(token.strip("$€£¥%").replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _dates(text: str) -> Set[Tuple[int, int]]:
+    """(month, day) pairs written as "Feb 7", "February 7th" or "2025-02-07"."""
+    dates = {(MONTHS.index(m.group(1)[:3].lower()) + 1, int(m.group(2))) for m in MONTH_DAY.finditer(text)}
+    dates.update((int(m.group(1)), int(m.group(2))) for m in ISO_DATE.finditer(text))
+    return dates
+
+
+class PreChecker:
+    """
+    Deterministic local check of a description against scraped article text.
+
+    Numbers (prices, percentages), dates and capitalized names are pulled out of the
+    description and looked up in the scraped content: numbers exactly or as a rounding of
+    the scraped value, dates by month and day, names exactly or by close spelling. Each
+    fact is weighted by kind; short bare numbers count for little, since they match
+    almost any page. When enough facts are found, at least one of them a distinctive
+    number or a date, a verdict is returned without asking the LLM if the weighted match
+    score passes verify_threshold and at least min_word_share of the description's other
+    words appear in the source, or if the score falls under reject_threshold with a
+    number or date missing; otherwise check returns None.
+    """
+
+    def __init__(self, verify_threshold: float = 0.9, reject_threshold: float = 0.3, min_facts: int = 3,
+                 name_cutoff: float = 0.85, min_word_share: float = 0.6):
+        self.verify_threshold = verify_threshold
+        self.reject_threshold = reject_threshold
+        self.min_facts = min_facts
+        self.name_cutoff = name_cutoff
+        self.min_word_share = min_word_share
+
+        self.checks = 0
+        self.verified = 0
+        self.rejected = 0
+        self.deferred = 0
+
+    def facts(self, description: str) -> List[Tuple[str, str]]:
+        """
+        Extracts (kind, text) facts from a description.
+
+        Args:
+            description (str): Original news description.
+
+        Returns:
+            List[Tuple[str, str]]: Distinct facts of kind "number", "count", "date" or "name".
+        """
+        facts: List[Tuple[str, str]] = []
+        rest = description
+        for pattern in (MONTH_DAY, ISO_DATE, WEEKDAY):
+            for m in pattern.finditer(rest):
+                facts.append(("date", m.group(0)))
+            rest = pattern.sub(" ", rest)
+        for m in NUMBER.finditer(rest):
+            token = m.group(0).rstrip(",")
+            next_word = NEXT_WORD.match(rest, m.end())
+            distinctive = _is_distinctive(token, next_word.group(1) if next_word else "")
+            facts.append(("number" if distinctive else "count", token))
+        facts.extend(
+            ("name", m.group(0)) for m in NAME.finditer(rest)
+            if m.group(0).lower() not in STOPWORDS and m.group(0).lower() not in MONTH_NAMES
+        )
+        return list(dict.fromkeys(facts))
+
+    def check(self, scraped_content: str, description: str) -> Optional[Dict[str, Any]]:
+        """
+        Decides obvious matches and mismatches locally.
+
+        Args:
+            scraped_content (str): Scraped website content.
+            description (str): Original news description.
+
+        Returns:
+            Optional[Dict[str, Any]]: A verification result, or None when the LLM should decide.
+        """
+        self.checks += 1
+        facts = self.facts(description)
+        if len(facts) < self.min_facts or not any(kind in ("number", "date") for kind, _ in facts):
+            self.deferred += 1
+            return None
+
+        scraped_lower = scraped_content.lower()
+        scraped_numbers = [v for v in (_number_value(t) for t in NUMBER.findall(scraped_content)) if v is not None]
+        scraped_dates = _dates(scraped_content)
+        scraped_words = set(WORD.findall(scraped_lower))
+
+        matching_details: List[str] = []
+        discrepancies: List[str] = []
+        earned = 0.0
+        total = 0.0
+        hard_missing = False
+        for kind, text in facts:
+            weight = WEIGHTS[kind]
+            total += weight
+            credit, detail = self._match(kind, text, scraped_lower, scraped_numbers, scraped_dates, scraped_words)
+            if credit:
+                earned += weight * credit
+                matching_details.append(detail)
+            else:
+                hard_missing = hard_missing or kind in ("number", "date")
+                discrepancies.append(detail)
+
+        score = earned / total
+        # Matching facts alone may be coincidence; the rest of the claim has to be on the page too
+        in_context = self._word_share(description, facts, scraped_words) >= self.min_word_share
+        if score >= self.verify_threshold and not hard_missing and in_context:
+            self.verified += 1
+            confidence = round(0.7 + 0.25 * score, 2)
+        elif score <= self.reject_threshold and hard_missing:
+            self.rejected += 1
+            confidence = round(score, 2)
+        else:
+            self.deferred += 1
+            return None
+
+        return {
+            "confidence_score": confidence,
+            "isVerified": confidence >= 0.7,
+            "matching_details": matching_details,
+            "discrepancies": discrepancies
+        }
+
+    @staticmethod
+    def _word_share(description: str, facts: List[Tuple[str, str]], scraped_words: Set[str]) -> float:
+        """Share of the description's words, other than stopwords and the facts themselves, found in the source."""
+        fact_words = {w for _, text in facts for w in WORD.findall(text.lower())}
+        words = {
+            w for w in WORD.findall(description.lower())
+            if w not in STOPWORDS and w not in fact_words and not any(c.isdigit() for c in w)
+        }
+        if not words:
+            return 0.0
+        return len(words & scraped_words) / len(words)
+
+    def _match(self, kind: str, text: str, scraped_lower: str, scraped_numbers: List[float],
+               scraped_dates: Set[Tuple[int, int]], scraped_words: Set[str]) -> Tuple[float, str]:
+        """Returns (credit, detail) for one fact; credit is 0 when it is not found."""
+        if kind in ("number", "count"):
+            value = _number_value(text)
+            if value is None:
+                return 0.0, f"Could not read number {text}"
+            if value in scraped_numbers:
+                return 1.0, f"Number {text} appears in the source"
+            if kind == "count":
+                return 0.0, f"Number {text} not found in the source"
+            # "$97,317" in the description for "$97,317.23" in the source
+            if any(round(v, 0) == value or round(v, 1) == value for v in scraped_numbers):
+                return FUZZY_CREDIT, f"Number {text} matches a rounded figure in the source"
+            return 0.0, f"Number {text} not found in the source"
+
+        if kind == "date":
+            if text.lower() in scraped_lower:
+                return 1.0, f"Date {text} appears in the source"
+            dates = _dates(text)
+            if dates and dates <= scraped_dates:
+                return FUZZY_CREDIT, f"Date {text} appears in the source in another format"
+            return 0.0, f"Date {text} not found in the source"
+
+        word = text.lower()
+        if word in scraped_words:
+            return 1.0, f"{text} is mentioned in the source"
+        close = difflib.get_close_matches(word, scraped_words, n=1, cutoff=self.name_cutoff)
+        if close:
+            return FUZZY_CREDIT, f"{text} closely matches '{close[0]}' in the source"
+        return 0.0, f"{text} is not mentioned in the source"
+
+    def stats(self) -> Dict[str, Any]:
+        decided = self.verified + self.rejected
+        return {
+            "verify_threshold": self.verify_threshold,
+            "reject_threshold": self.reject_threshold,
+            "min_facts": self.min_facts,
+            "min_word_share": self.min_word_share,
+            "checks": self.checks,
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "deferred": self.deferred,
+            "decided_rate": round(decided / self.checks, 4) if self.checks else 0.0,
+        }
+
+
+def prechecker_from_env() -> Optional[PreChecker]:
+    """
+    Builds a pre-checker from PRECHECK_VERIFY_THRESHOLD, PRECHECK_REJECT_THRESHOLD,
+    PRECHECK_MIN_FACTS and PRECHECK_MIN_WORD_SHARE, or returns None when PRECHECK_ENABLED is false.
+    """
+    if os.getenv("PRECHECK_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return PreChecker(
+        verify_threshold=float(os.getenv("PRECHECK_VERIFY_THRESHOLD", 0.9)),
+        reject_threshold=float(os.getenv("PRECHECK_REJECT_THRESHOLD", 0.3)),
+        min_facts=int(os.getenv("PRECHECK_MIN_FACTS", 3)),
+        min_word_share=float(os.getenv("PRECHECK_MIN_WORD_SHARE", 0.6)),
+    )
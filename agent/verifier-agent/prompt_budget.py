@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, token counts are estimated without it
+    tiktoken = None
+
+# This module is shared by the verifier and summariser services; keep both copies identical.
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+# Seconds startup waits for the encoding before serving with estimated counts
+TOKENIZER_LOAD_TIMEOUT = float(os.getenv("TOKENIZER_LOAD_TIMEOUT", 30))
+CHARS_PER_TOKEN = 4  # Estimate used when no tokenizer is available
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=["\'(\[]?[A-Z0-9])')
+WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or that the their "
+    "they this to was were will with".split()
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation followed by a capital letter or digit."""
+    return [s.strip() for s in SENTENCE_END.split(text) if s.strip()]
+
+
+def terms(text: str) -> List[str]:
+    """Lowercased word tokens of text without stopwords."""
+    return [t for t in WORD.findall(text.lower()) if t not in STOPWORDS]
+
+
+class TokenCounter:
+    """
+    Counts tokens locally with a tiktoken encoding.
+
+    The encoding is loaded only by load() / aload(), which the services call once at startup.
+    Counting never loads it, because tiktoken fetches a missing BPE file over the network
+    without a timeout; the images ship the file in TIKTOKEN_CACHE_DIR instead. Until the
+    encoding is loaded, or if tiktoken is missing or the file cannot be loaded, counts fall
+    back to an estimate of CHARS_PER_TOKEN characters per token.
+    """
+
+    def __init__(self, encoding: str = TOKENIZER_ENCODING):
+        self.encoding_name = encoding
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Loads the encoding unless already tried; blocking. Returns whether counts are exact."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    if tiktoken is not None:
+                        try:
+                            self._encoding = tiktoken.get_encoding(self.encoding_name)
+                        except Exception as e:
+                            logger.warning("Tokenizer %s unavailable, estimating token counts: %r",
+                                           self.encoding_name, e)
+                    self._loaded = True
+        return self._encoding is not None
+
+    async def aload(self, timeout: Optional[float] = TOKENIZER_LOAD_TIMEOUT) -> bool:
+        """
+        Loads the encoding in a worker thread, waiting at most timeout seconds. On timeout the
+        load carries on in the background and counts are estimated until it finishes.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(self.load), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Tokenizer %s still loading after %ss, estimating token counts meanwhile",
+                           self.encoding_name, timeout)
+            return False
+
+    def _get_encoding(self):
+        return self._encoding
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding is None:
+            return len(text) // CHARS_PER_TOKEN + 1
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, budget: int) -> str:
+        """Cut text to at most budget tokens."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return text[:budget * CHARS_PER_TOKEN]
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= budget else encoding.decode(tokens[:budget])
+
+
+class PromptBudget:
+    """
+    Fits free text into a token budget before it is put into a prompt.
+
+    Text within the budget is returned untouched. Longer text is split into sentences, the
+    sentences sharing the most terms with the query are kept while they fit, and they are
+    joined back in their original order, so the prompt is never cut mid-sentence.
+    """
+
+    def __init__(self, budget: int, counter: Optional[TokenCounter] = None):
+        self.budget = budget
+        self.counter = counter or TokenCounter()
+
+    def select(self, text: str, query: str = "") -> str:
+        if not text or self.counter.count(text) <= self.budget:
+            return text
+
+        sentences = split_sentences(text)
+        query_terms = set(terms(query))
+
+        def score(i: int) -> float:
+            sentence_terms = terms(sentences[i])
+            if not sentence_terms:
+                return 0.0
+            # Distinct query terms covered, damped by length so long boilerplate does not win
+            return len(query_terms.intersection(sentence_terms)) / len(sentence_terms) ** 0.5
+
+        chosen = []
+        remaining = self.budget
+        # Highest score first; ties keep document order
+        for i in sorted(range(len(sentences)), key=lambda i: (-score(i), i)):
+            tokens = self.counter.count(sentences[i]) + 1
+            if tokens <= remaining:
+                chosen.append(i)
+                remaining -= tokens
+
+        if not chosen:
+            return self.counter.truncate(sentences[0] if sentences else text, self.budget)
+        return " ".join(sentences[i] for i in sorted(chosen))
+
+
+class TokenMeter:
+    """
+    Records prompt and completion tokens and latency of every LLM call.
+
+    Totals are kept per call name (for example "verify" or "summarize") and the most recent
+    calls are kept individually. estimated marks counts made locally rather than reported
+    by the provider.
+    """
+
+    def __init__(self, history: int = 100):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._recent: deque = deque(maxlen=history)
+
+    def record(self, name: str, prompt_tokens: int, completion_tokens: int, seconds: float,
+               estimated: bool = False) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(name, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "latency_seconds": 0.0, "max_latency_seconds": 0.0, "estimated_calls": 0,
+            })
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["latency_seconds"] += seconds
+            totals["max_latency_seconds"] = max(totals["max_latency_seconds"], seconds)
+            totals["estimated_calls"] += int(estimated)
+            self._recent.append({
+                "name": name,
+                "at": round(time.time(), 3),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "latency_ms": round(seconds * 1000, 1),
+                "estimated": estimated,
+            })
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = {}
+            for name, t in self._totals.items():
+                n = t["calls"]
+                calls[name] = {
+                    "calls": n,
+                    "prompt_tokens": t["prompt_tokens"],
+                    "completion_tokens": t["completion_tokens"],
+                    "avg_prompt_tokens": round(t["prompt_tokens"] / n, 1),
+                    "avg_completion_tokens": round(t["completion_tokens"] / n, 1),
+                    "avg_latency_ms": round(t["latency_seconds"] / n * 1000, 1),
+                    "max_latency_ms": round(t["max_latency_seconds"] * 1000, 1),
+                    "estimated_calls": t["estimated_calls"],
+                }
+            return {"calls": calls, "recent": list(self._recent)}
@@ -0,0 +1,112 @@
+import os
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+from prompt_budget import split_sentences, terms
+
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", 4))
+PASSAGE_WORDS = int(os.getenv("RETRIEVAL_PASSAGE_WORDS", 60))
+
+
+class PassageRetriever:
+    """
+    Picks the passages of a scraped article that are most relevant to a claim.
+
+    The article is split into passages of whole sentences of about passage_words words and
+    each passage is scored against the query with Okapi BM25. Scoring only looks at query
+    terms, so the term-frequency matrix is passages x query terms and is scored in one
+    NumPy expression.
+    """
+
+    def __init__(self, top_k: int = RETRIEVAL_TOP_K, passage_words: int = PASSAGE_WORDS,
+                 k1: float = 1.5, b: float = 0.75):
+        self.top_k = top_k
+        self.passage_words = passage_words
+        self.k1 = k1
+        self.b = b
+
+    def passages(self, text: str) -> List[str]:
+        """
+        Splits text into passages of consecutive sentences; an overlong sentence is split by words.
+
+        Args:
+            text (str): Scraped article content.
+
+        Returns:
+            List[str]: Passages in document order.
+        """
+        passages: List[str] = []
+        current: List[str] = []
+        words = 0
+        for sentence in split_sentences(text):
+            sentence_words = sentence.split()
+            if len(sentence_words) > self.passage_words:
+                if current:
+                    passages.append(" ".join(current))
+                    current, words = [], 0
+                for start in range(0, len(sentence_words), self.passage_words):
+                    passages.append(" ".join(sentence_words[start:start + self.passage_words]))
+                continue
+            if current and words + len(sentence_words) > self.passage_words:
+                passages.append(" ".join(current))
+                current, words = [], 0
+            current.append(sentence)
+            words += len(sentence_words)
+        if current:
+            passages.append(" ".join(current))
+        return passages
+
+    def scores(self, passages: List[str], query: str) -> np.ndarray:
+        """
+        BM25 score of every passage for the query.
+
+        Args:
+            passages (List[str]): Candidate passages.
+            query (str): Headline and description of the claim.
+
+        Returns:
+            np.ndarray: One score per passage.
+        """
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not passages or not query_terms:
+            return np.zeros(len(passages))
+
+        counts = [Counter(terms(p)) for p in passages]
+        tf = np.array([[c[t] for t in query_terms] for c in counts], dtype=np.float64)
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float64)
+
+        df = np.count_nonzero(tf, axis=0)
+        n = len(passages)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1.0))
+        return ((tf * (self.k1 + 1)) / (tf + norm[:, None])) @ idf
+
+    def retrieve(self, text: str, query: str) -> List[str]:
+        """
+        Returns the top_k passages for the query, in document order.
+
+        Passages sharing no term with the query are left out; if no passage matches at all,
+        the leading passages are returned.
+
+        Args:
+            text (str): Scraped article content.
+            query (str): Headline and description of the claim.
+
+        Returns:
+            List[str]: Selected passages.
+        """
+        passages = self.passages(text)
+        if len(passages) <= self.top_k:
+            return passages
+
+        scores = self.scores(passages, query)
+        if not scores.any():
+            return passages[:self.top_k]
+
+        # Stable sort keeps earlier passages first among equal scores
+        top = np.argsort(-scores, kind="stable")[:self.top_k]
+        top = [i for i in top if scores[i] > 0] or list(top)
+        return [passages[i] for i in sorted(top)]
+
@@ -0,0 +1,354 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change the article a URL points to, matched exactly
+# (case-insensitively) apart from the utm_* family
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "cmpid", "_ga", "_gl",
+})
+TRACKING_PREFIX = "utm_"
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIX)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL so that trivially different links to the same article share a cache key.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking parameters,
+    and sorts the remaining query parameters. Any user:password@ part is kept as is, so
+    links fetched with different credentials never share an entry.
+
+    Args:
+        url (str): The URL of the news article.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    userinfo, at, _ = parts.netloc.rpartition("@")
+    if at:
+        host = f"{userinfo}@{host}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    )
+    path = parts.path or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cleaned article text plus the validators needed to revalidate it with the origin.
+    """
+    text: str
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Returns If-None-Match / If-Modified-Since headers for revalidating a stale entry.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """
+    Base class for scrape caches keyed by normalized URL.
+
+    Entries stay fresh for ttl seconds. Stale entries that carry an ETag or Last-Modified
+    are kept so they can be revalidated with a conditional request; stale entries without
+    validators are dropped. Subclasses bound total size by evicting least recently used entries.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Looks up a URL. Fresh entries count as hits; stale or absent ones count as misses.
+
+        Args:
+            url (str): The URL of the news article.
+
+        Returns:
+            Optional[CacheEntry]: The entry, possibly stale, or None if there is nothing usable.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._load(key)
+            if entry is not None and not entry.is_fresh() and not (entry.etag or entry.last_modified):
+                self._delete(key)
+                entry = None
+
+            if entry is not None and entry.is_fresh():
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def contains(self, url: str) -> bool:
+        """
+        Returns whether a fresh entry exists for a URL, without counting a lookup or
+        marking the entry as recently used.
+        """
+        with self._lock:
+            entry = self._load(normalize_url(url), touch=False)
+        return entry is not None and entry.is_fresh()
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Stores cleaned article text for a URL.
+
+        Args:
+            url (str): The URL of the news article.
+            text (str): Cleaned article text.
+            etag (Optional[str]): ETag header from the origin response.
+            last_modified (Optional[str]): Last-Modified header from the origin response.
+        """
+        entry = CacheEntry(text=text, expires_at=time.time() + self.ttl, etag=etag, last_modified=last_modified)
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._save(normalize_url(url), entry)
+            self.evictions += self._evict()
+
+    def refresh(self, url: str, entry: CacheEntry) -> None:
+        """
+        Marks a stale entry as fresh again after the origin answered 304 Not Modified.
+
+        Args:
+            url (str): The URL of the news article.
+            entry (CacheEntry): The entry returned by get.
+        """
+        entry.expires_at = time.time() + self.ttl
+        with self._lock:
+            self._save(normalize_url(url), entry)
+            self.revalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries, size = self._usage()
+        return {
+            "backend": self.backend,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        pass
+
+    # Backend hooks, always called with the lock held
+    backend = "base"
+
+    def _load(self, key: str, touch: bool = True) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _evict(self) -> int:
+        raise NotImplementedError
+
+    def _usage(self) -> tuple:
+        raise NotImplementedError
+
+
+class MemoryScrapeCache(ScrapeCache):
+    """
+    In-process scrape cache backed by an OrderedDict in LRU order.
+    """
+    backend = "memory"
+
+    def __init__(self, ttl: float = 900.0, max_bytes: int = 64 * 1024 * 1024):
+        super().__init__(ttl, max_bytes)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def _load(self, key: str, touch: bool = True) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None and touch:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        self._delete(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+    def _delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> int:
+        evicted = 0
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            evicted += 1
+        return evicted
+
+    def _usage(self) -> tuple:
+        return len(self._entries), self._bytes
+
+
+class DiskScrapeCache(ScrapeCache):
+    """
+    Scrape cache persisted in a SQLite file so it survives restarts.
+
+    Recency is tracked in a last_access column and the least recently used rows are
+    deleted once the stored text exceeds max_bytes. Reads only note the access time in
+    memory; those times are written in one batch on the next write or eviction, so a
+    lookup is a single SELECT and never commits.
+    """
+    backend = "disk"
+
+    def __init__(self, path: str, ttl: float = 900.0, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(ttl, max_bytes)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scrape_cache_lru ON scrape_cache (last_access)")
+        self._db.commit()
+        self._accessed: Dict[str, float] = {}
+
+    def _load(self, key: str, touch: bool = True) -> Optional[CacheEntry]:
+        row = self._db.execute(
+            "SELECT text, expires_at, etag, last_modified FROM scrape_cache WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if touch:
+            self._accessed[key] = time.time()
+        return CacheEntry(text=row[0], expires_at=row[1], etag=row[2], last_modified=row[3])
+
+    def _flush_access(self) -> None:
+        """Writes the access times noted by reads since the last flush; the caller commits."""
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE scrape_cache SET last_access = ? WHERE url = ?",
+                [(at, key) for key, at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        self._accessed.pop(key, None)
+        self._flush_access()
+        self._db.execute(
+            "INSERT OR REPLACE INTO scrape_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.text, entry.size, entry.expires_at, entry.etag, entry.last_modified, time.time())
+        )
+        self._db.commit()
+
+    def _delete(self, key: str) -> None:
+        self._accessed.pop(key, None)
+        self._db.execute("DELETE FROM scrape_cache WHERE url = ?", (key,))
+        self._db.commit()
+
+    def _evict(self) -> int:
+        evicted = 0
+        self._flush_access()
+        _, size = self._usage()
+        while size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT url, size FROM scrape_cache ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM scrape_cache WHERE url = ?", (row[0],))
+            size -= row[1]
+            evicted += 1
+        self._db.commit()
+        return evicted
+
+    def _usage(self) -> tuple:
+        count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scrape_cache").fetchone()
+        return count, size
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_access()
+            self._db.commit()
+            self._db.close()
+
+
+def scrape_cache_from_env() -> Optional[ScrapeCache]:
+    """
+    Builds the scrape cache selected by SCRAPE_CACHE_BACKEND (memory, disk or none).
+
+    SCRAPE_CACHE_TTL and SCRAPE_CACHE_MAX_BYTES size the cache; the disk backend
+    stores its data at SCRAPE_CACHE_PATH.
+
+    Returns:
+        Optional[ScrapeCache]: The configured cache, or None if caching is disabled.
+    """
+    backend = os.getenv("SCRAPE_CACHE_BACKEND", "memory").lower()
+    ttl = float(os.getenv("SCRAPE_CACHE_TTL", 900))
+    max_bytes = int(os.getenv("SCRAPE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    if backend == "memory":
+        return MemoryScrapeCache(ttl=ttl, max_bytes=max_bytes)
+    if backend == "disk":
+        return DiskScrapeCache(os.getenv("SCRAPE_CACHE_PATH", "scrape_cache.sqlite3"), ttl=ttl, max_bytes=max_bytes)
+    return None
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The service modules are imported flat (e.g. "import main"), as uvicorn does from the service directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The agent needs an API key to build its Together clients; tests never reach the real API
+os.environ.setdefault("TOGETHER_API_KEY", "test-key")
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+
+from admission import (PRIORITY_COLD, PRIORITY_WARM, AdmissionController, ClientGone, DeadlineExceeded, Overloaded,
+                       deadline_from_headers)
+
+
+async def hold(controller, release, priority=PRIORITY_COLD, **kwargs):
+    async with controller.slot(priority, **kwargs):
+        await release.wait()
+
+
+async def started(coro):
+    """Schedules coro and lets it run up to its first wait."""
+    task = asyncio.ensure_future(coro)
+    await asyncio.sleep(0.01)
+    return task
+
+
+def test_queued_request_is_shed_after_max_wait():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=0.05)
+        release = asyncio.Event()
+        holder = await started(hold(controller, release))
+        with pytest.raises(Overloaded) as shed:
+            await hold(controller, release)
+        release.set()
+        await holder
+        return controller, shed.value
+
+    controller, shed = asyncio.run(run())
+    assert shed.reason == "wait_timeout" and shed.status_code == 503
+    assert int(shed.headers()["Retry-After"]) >= 1
+    assert controller.stats()["active"] == 0 and controller.stats()["queued"] == 0
+    assert controller.shed["wait_timeout"] == 1 and controller.completed == 1
+
+
+def test_full_queue_sheds_cold_and_warm_displaces_the_newest_cold():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, max_wait=5)
+        release = asyncio.Event()
+        holder = await started(hold(controller, release))
+        queued_cold = await started(hold(controller, release))
+
+        with pytest.raises(Overloaded) as shed:
+            await hold(controller, release)
+        assert shed.value.reason == "queue_full"
+        controller.check(PRIORITY_WARM)  # A warm request would still get in
+
+        warm = await started(hold(controller, release, PRIORITY_WARM))
+        with pytest.raises(Overloaded) as displaced:
+            await queued_cold
+        release.set()
+        await asyncio.gather(holder, warm)
+        return controller, displaced.value
+
+    controller, displaced = asyncio.run(run())
+    assert displaced.reason == "displaced"
+    assert controller.shed == {"queue_full": 1, "wait_timeout": 0, "displaced": 1}
+    assert controller.completed == 2 and controller.stats()["active"] == 0
+
+
+def test_warm_requests_are_admitted_before_earlier_cold_ones():
+    order = []
+
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=5)
+        release = asyncio.Event()
+        holder = await started(hold(controller, release))
+
+        async def record(name, priority):
+            async with controller.slot(priority):
+                order.append(name)
+
+        waiters = [await started(record("cold", PRIORITY_COLD)), await started(record("warm", PRIORITY_WARM))]
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(run())
+    assert order == ["warm", "cold"]
+
+
+def test_deadline_passing_while_queued_is_504_without_a_leaked_slot():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=5)
+        release = asyncio.Event()
+        holder = await started(hold(controller, release))
+        with pytest.raises(DeadlineExceeded) as expired:
+            await hold(controller, release, deadline=time.monotonic() + 0.05)
+        release.set()
+        await holder
+        return controller, expired.value
+
+    controller, expired = asyncio.run(run())
+    assert expired.status_code == 504
+    assert controller.expired == 1 and controller.stats()["active"] == 0 and controller.stats()["queued"] == 0
+
+
+def test_deadline_passing_while_running_cancels_the_work_and_frees_the_slot():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=5)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            async with controller.slot(deadline=time.monotonic() + 0.05):
+                await asyncio.sleep(5)
+        elapsed = time.monotonic() - start
+        # The slot is free again: the next request is admitted at once
+        async with controller.slot():
+            pass
+        return controller, elapsed
+
+    controller, elapsed = asyncio.run(run())
+    assert elapsed < 1.0
+    assert controller.expired == 1 and controller.completed == 1 and controller.stats()["active"] == 0
+
+
+def test_already_expired_deadline_is_refused_before_queueing():
+    async def run():
+        controller = AdmissionController()
+        with pytest.raises(DeadlineExceeded):
+            async with controller.slot(deadline=time.monotonic() - 1):
+                pass
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.expired == 1 and controller.admitted == 0 and controller.stats()["active"] == 0
+
+
+def test_client_gone_while_queued_is_dropped():
+    async def gone():
+        return True
+
+    async def run():
+        controller = AdmissionController()
+        with pytest.raises(ClientGone):
+            async with controller.slot(is_disconnected=gone):
+                pass
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.disconnected == 1 and controller.stats()["active"] == 0
+
+
+def test_deadline_from_headers_takes_the_sooner():
+    now_wall, now = time.time(), time.monotonic()
+    deadline = deadline_from_headers({"X-Request-Deadline": str(now_wall + 30), "X-Request-Timeout": "2"})
+    assert deadline == pytest.approx(now + 2, abs=0.1)
+    assert deadline_from_headers({"X-Request-Timeout": "soon"}) is None
+    assert deadline_from_headers({}, default_timeout=5) == pytest.approx(now + 5, abs=0.1)
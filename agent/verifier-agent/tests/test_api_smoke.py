@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")  # required by fastapi.testclient
+
+from fastapi.testclient import TestClient
+
+import news_verification_api
+from admission import AdmissionController
+
+
+def test_agent_starts_and_metrics_render():
+    with TestClient(news_verification_api.app) as client:
+        assert news_verification_api.verification_agent is not None
+
+        assert client.get("/health").json() == {"status": "healthy"}
+        assert client.get("/status/verdicts").status_code == 200
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE verifier_verdicts_total counter" in response.text
+        assert "# TYPE stage_duration_seconds histogram" in response.text
+        # The requests above were counted by the middleware under their route template
+        assert 'http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in response.text
+
+
+def test_request_past_its_deadline_gets_504_and_frees_its_slot(monkeypatch):
+    controller = AdmissionController(max_concurrency=1, max_queue=4, max_wait=5)
+    monkeypatch.setattr(news_verification_api, "admission", controller)
+    payload = {"headline": "H", "description": "D", "source_url": "https://example.com/story"}
+
+    with TestClient(news_verification_api.app) as client:
+        agent = news_verification_api.verification_agent
+
+        async def slow_verify(**kwargs):
+            await asyncio.sleep(5)
+
+        async def cold(*urls):
+            return False
+
+        monkeypatch.setattr(agent, "averify_news", slow_verify)
+        monkeypatch.setattr(agent, "ais_warm", cold)
+
+        response = client.post("/verify-news", json=payload, headers={"X-Request-Timeout": "0.2"})
+        assert response.status_code == 504
+        assert client.get("/status/admission").json()["active"] == 0
+
+        async def fast_verify(**kwargs):
+            return {"confidence_score": 0.9, "isVerified": True, "verdict_source": "llm"}
+
+        monkeypatch.setattr(agent, "averify_news", fast_verify)
+        response = client.post("/verify-news", json=payload)
+        assert response.status_code == 200 and response.json()["isVerified"] is True
+        assert controller.expired == 1 and controller.completed == 1
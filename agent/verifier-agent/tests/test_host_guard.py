@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+import host_guard
+from host_guard import CircuitBreaker, CircuitOpenError, HostGuard, RateLimit, RateLimitedError
+
+URL = "https://news.example.com/story"
+HOST = "news.example.com"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(host_guard, "time", clock)
+    return clock
+
+
+def fail(guard, exc):
+    with pytest.raises(type(exc)):
+        with guard.request(URL):
+            raise exc
+
+
+def state(guard):
+    return guard.stats()["hosts"][HOST]["state"]
+
+
+def open_guard(reset_timeout=30.0):
+    guard = HostGuard(default_limit=RateLimit(rate=0), failure_threshold=3, reset_timeout=reset_timeout)
+    for _ in range(3):
+        fail(guard, ConnectionError("refused"))
+    return guard
+
+
+def test_opens_after_consecutive_host_failures(clock):
+    guard = HostGuard(default_limit=RateLimit(rate=0), failure_threshold=3)
+    fail(guard, ConnectionError("refused"))
+    fail(guard, HTTPError(503))
+    # A 404 is the host answering properly: it resets the count instead of adding to it
+    fail(guard, HTTPError(404))
+    assert state(guard) == CircuitBreaker.CLOSED
+
+    for _ in range(3):
+        fail(guard, HTTPError(500))
+    assert state(guard) == CircuitBreaker.OPEN
+    assert guard.is_open(URL)
+    with pytest.raises(CircuitOpenError):
+        guard.admit(HOST)
+    assert guard.circuit_rejected == 1
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(clock):
+    guard = open_guard()
+    clock.now += 30.0
+    assert state(guard) == CircuitBreaker.HALF_OPEN
+    assert not guard.is_open(URL)
+
+    guard.admit(HOST)
+    # The probe is in flight, so everyone else is still refused
+    with pytest.raises(CircuitOpenError):
+        guard.admit(HOST)
+    guard.record(HOST)
+
+    assert state(guard) == CircuitBreaker.CLOSED
+    with guard.request(URL):
+        pass
+
+
+def test_failed_probe_reopens_for_another_reset_timeout(clock):
+    guard = open_guard()
+    clock.now += 30.0
+    fail(guard, HTTPError(502))
+
+    assert state(guard) == CircuitBreaker.OPEN
+    assert guard.stats()["hosts"][HOST]["times_opened"] == 2
+    clock.now += 29.0
+    assert guard.is_open(URL)
+    clock.now += 1.0
+    assert state(guard) == CircuitBreaker.HALF_OPEN
+
+
+def test_cancelled_probe_frees_the_probe_slot(clock):
+    guard = open_guard()
+    clock.now += 30.0
+
+    async def cancelled_probe():
+        async with guard.arequest(URL):
+            raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancelled_probe())
+    assert state(guard) == CircuitBreaker.HALF_OPEN
+    guard.admit(HOST)
+
+
+def test_rate_limit_waits_then_refuses_past_max_wait(clock):
+    guard = HostGuard(default_limit=RateLimit(rate=1.0, burst=2), max_wait=1.5,
+                      domain_limits={"slow.example": RateLimit(rate=0.1, burst=1)})
+    assert guard.admit(HOST) == 0.0
+    assert guard.admit(HOST) == 0.0
+    assert guard.admit(HOST) == pytest.approx(1.0)
+    with pytest.raises(RateLimitedError):
+        guard.admit(HOST)
+    assert guard.rate_limited == 1
+
+    assert guard.limit_for("www.slow.example").rate == 0.1
+    assert guard.admit("www.slow.example") == 0.0
+    with pytest.raises(RateLimitedError):
+        guard.admit("www.slow.example")
+
+
+def test_the_most_specific_domain_limit_wins(clock):
+    guard = HostGuard(domain_limits={"example.com": RateLimit(rate=5.0, burst=10),
+                                     "news.example.com": RateLimit(rate=0.5, burst=1)})
+    assert guard.limit_for(HOST).rate == 0.5
+    assert guard.limit_for("eu.news.example.com").rate == 0.5
+    assert guard.limit_for("www.example.com").rate == 5.0
+    assert guard.limit_for("example.org") is guard.default_limit
+
+
+def test_refused_scrapes_say_why(clock):
+    from main import NewsVerificationAgent
+
+    guard = HostGuard(default_limit=RateLimit(rate=0.1, burst=1), max_wait=1.0, failure_threshold=3)
+    agent = NewsVerificationAgent(host_guard=guard)
+    guard.admit(HOST)
+    with pytest.raises(RateLimitedError):
+        guard.admit(HOST)
+    assert guard.is_throttled(URL) and not guard.is_open(URL)
+    assert "rate limited" in agent._scrape_failed_result(URL)["error"]
+
+    clock.now += 10.0
+    assert not guard.is_throttled(URL)
+    for _ in range(3):
+        fail(guard, ConnectionError("refused"))
+        clock.now += 10.0
+    assert "circuit open" in agent._scrape_failed_result(URL)["error"]
+    assert agent._scrape_failed_result("https://other.example.org/")["error"] == "Unable to scrape website content"
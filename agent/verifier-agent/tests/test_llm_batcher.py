@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import pytest
+
+from llm_batcher import MicroBatcher
+
+
+class Flush:
+    def __init__(self, delay=0.0, fail=None, drop_last=False):
+        self.delay = delay
+        self.fail = fail
+        self.drop_last = drop_last
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail is not None:
+                raise self.fail
+            results = [f"result {item}" for item in items]
+            return results[:-1] if self.drop_last else results
+        finally:
+            self.active -= 1
+
+
+def test_flushes_as_soon_as_the_batch_is_full():
+    flush = Flush()
+    batcher = MicroBatcher(flush, window=10.0, max_batch=3)
+
+    async def run():
+        start = time.monotonic()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    assert results == ["result 0", "result 1", "result 2"]
+    assert flush.batches == [[0, 1, 2]]
+    assert elapsed < 1.0
+    assert batcher.flushed_full == 1 and batcher.flushed_window == 0
+
+
+def test_flushes_a_partial_batch_when_the_window_closes():
+    flush = Flush()
+    batcher = MicroBatcher(flush, window=0.05, max_batch=8)
+
+    async def run():
+        first = await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+        second = await batcher.submit("c")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ["result a", "result b"] and second == "result c"
+    assert flush.batches == [["a", "b"], ["c"]]
+    assert batcher.flushed_window == 2
+    assert batcher.stats()["mean_batch_size"] == 1.5
+
+
+def test_a_cancelled_waiter_is_left_out_of_the_batch():
+    flush = Flush()
+    batcher = MicroBatcher(flush, window=0.05, max_batch=8)
+
+    async def run():
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        done = await asyncio.gather(*tasks, return_exceptions=True)
+        return done
+
+    done = asyncio.run(run())
+    assert done[0] == "result 0" and done[2] == "result 2"
+    assert isinstance(done[1], asyncio.CancelledError)
+    assert flush.batches == [[0, 2]]
+
+
+def test_a_waiter_cancelled_mid_flush_does_not_break_the_others():
+    flush = Flush(delay=0.05)
+    batcher = MicroBatcher(flush, window=0.01, max_batch=8)
+
+    async def run():
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(2)]
+        await asyncio.sleep(0.03)
+        tasks[0].cancel()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    done = asyncio.run(run())
+    assert isinstance(done[0], asyncio.CancelledError)
+    assert done[1] == "result 1"
+    assert flush.batches == [[0, 1]]
+
+
+def test_a_failed_flush_reaches_every_caller():
+    flush = Flush(fail=RuntimeError("LLM down"))
+    batcher = MicroBatcher(flush, window=0.01, max_batch=2)
+
+    async def run():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(run())] == ["LLM down", "LLM down"]
+    assert batcher.failed_batches == 1
+
+
+def test_a_short_result_list_fails_the_batch():
+    batcher = MicroBatcher(Flush(drop_last=True), window=0.01, max_batch=2)
+
+    async def run():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(e, RuntimeError) for e in asyncio.run(run()))
+
+
+def test_flushes_beyond_max_concurrency_wait_for_a_slot():
+    flush = Flush(delay=0.05)
+    batcher = MicroBatcher(flush, window=10.0, max_batch=1, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [f"result {i}" for i in range(5)]
+    assert flush.peak == 2 and batcher.batches == 5
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        MicroBatcher(Flush(), mode="stream")
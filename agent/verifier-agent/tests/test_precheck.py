@@ -0,0 +1,43 @@
+from precheck import PreChecker
+
+PAGE = (
+    "Bitcoin rose to $97,317.23 on February 7 as traders in New York and London bought after "
+    "the Federal Reserve held rates. Volume climbed 12.5% from the week before."
+)
+
+
+def test_short_numbers_are_counts():
+    facts = PreChecker().facts("Police said 3 people and 10 officers were hurt, a 5% rise, in 2024 at a $40 million site")
+    assert ("count", "3") in facts
+    assert ("count", "10") in facts
+    assert ("count", "5%") in facts
+    assert ("number", "2024") in facts
+    assert ("number", "$40") in facts
+
+
+def test_short_numbers_alone_do_not_decide():
+    checker = PreChecker()
+    page = "Mayor Smith opened the Parks office. Section 3 of 10. Page 5% loaded."
+    assert checker.check(page, "Mayor Smith said 3 of 10 Parks will close, a 5% cut") is None
+    assert checker.deferred == 1
+
+
+def test_matching_numbers_without_the_claim_around_them_defer():
+    checker = PreChecker()
+    page = "Market table: $97,317.23, 12.5%, February 7. Bitcoin Fed."
+    description = "Bitcoin collapsed to $97,317 on February 7 after the Fed sold reserves, wiping 12.5% off miners"
+    assert checker.check(page, description) is None
+
+
+def test_distinctive_numbers_in_context_verify():
+    checker = PreChecker()
+    result = checker.check(PAGE, "Bitcoin rose to $97,317 on February 7 as traders bought, with volume up 12.5%")
+    assert result is not None and result["isVerified"]
+    assert checker.verified == 1
+
+
+def test_missing_distinctive_number_rejects():
+    checker = PreChecker()
+    result = checker.check(PAGE, "Ethereum fell to $41,250 on March 3 as Tokyo Osaka Seoul sold 48.2%")
+    assert result is not None and not result["isVerified"]
+    assert checker.rejected == 1
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import prompt_budget
+from prompt_budget import CHARS_PER_TOKEN, TokenCounter
+
+
+class StubEncoding:
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class StubTiktoken:
+    def __init__(self):
+        self.threads = []
+
+    def get_encoding(self, name):
+        self.threads.append(threading.get_ident())
+        return StubEncoding()
+
+
+def test_counting_never_loads_the_encoding(monkeypatch):
+    stub = StubTiktoken()
+    monkeypatch.setattr(prompt_budget, "tiktoken", stub)
+    counter = TokenCounter()
+
+    text = "one two three four five six seven eight"
+    assert counter.count(text) == len(text) // CHARS_PER_TOKEN + 1
+    assert not counter.exact
+    assert stub.threads == []
+
+
+def test_aload_loads_once_off_the_event_loop(monkeypatch):
+    stub = StubTiktoken()
+    monkeypatch.setattr(prompt_budget, "tiktoken", stub)
+    counter = TokenCounter()
+
+    async def run():
+        loaded = await counter.aload()
+        await counter.aload()
+        return threading.get_ident(), loaded
+
+    loop_thread, loaded = asyncio.run(run())
+    assert loaded and counter.exact
+    assert len(stub.threads) == 1 and stub.threads[0] != loop_thread
+    assert counter.count("one two three") == 3
+
+
+def test_aload_gives_up_waiting_on_a_stalled_load(monkeypatch):
+    release = threading.Event()
+
+    class Stalled(StubTiktoken):
+        def get_encoding(self, name):
+            release.wait(5)
+            return StubEncoding()
+
+    monkeypatch.setattr(prompt_budget, "tiktoken", Stalled())
+    counter = TokenCounter()
+
+    async def run():
+        try:
+            assert await counter.aload(timeout=0.05) is False
+            return counter.count("one two three")
+        finally:
+            release.set()
+
+    assert asyncio.run(run()) == len("one two three") // CHARS_PER_TOKEN + 1
+    # The load finished in the background
+    assert counter.exact
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from main import NewsVerificationAgent
+from parse_pool import ParsePool
+from scrape_cache import DiskScrapeCache
+
+ARTICLE = (Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "politics_story.html").read_bytes()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if self.path.startswith("/trickle"):
+            # Headers at once, then one byte at a time: every read succeeds, the body never ends
+            self.send_header("Content-Length", "100000")
+            self.end_headers()
+            try:
+                for _ in range(200):
+                    self.wfile.write(b" ")
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+            return
+        self.send_header("Content-Length", str(len(ARTICLE)))
+        self.end_headers()
+        self.wfile.write(ARTICLE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_sync_scrape_stops_a_trickling_server_at_the_deadline(server):
+    agent = NewsVerificationAgent(streaming=True, scrape_deadline=0.5)
+    start = time.monotonic()
+    assert agent.scrape_website(f"{server}/trickle") is None
+    assert time.monotonic() - start < 1.5
+    asyncio.run(agent.aclose())
+
+
+def test_sync_scrape_reads_a_whole_article(server):
+    agent = NewsVerificationAgent(streaming=True)
+    text = agent.scrape_website(f"{server}/article/sync")
+    assert text and len(text) > 200
+    asyncio.run(agent.aclose())
+
+
+def test_async_streaming_parses_in_the_pool_when_configured(server):
+    async def run():
+        agent = NewsVerificationAgent(streaming=True, parse_pool=ParsePool(1))
+        try:
+            return await agent.ascrape_website(f"{server}/article/async"), agent.parse_stats()
+        finally:
+            await agent.aclose()
+
+    text, stats = asyncio.run(run())
+    assert text and len(text) > 200
+    assert stats["completed"] == 1
+
+
+def test_async_scrape_with_the_disk_cache(server, tmp_path):
+    async def run():
+        agent = NewsVerificationAgent(scrape_cache=DiskScrapeCache(str(tmp_path / "cache.sqlite3")))
+        try:
+            url = f"{server}/article/disk"
+            assert not await agent.ais_warm(url)
+            first = await agent.ascrape_website(url)
+            assert await agent.ais_warm(url, url)
+            return first, await agent.ascrape_website(url), agent.scrape_cache.stats()
+        finally:
+            await agent.aclose()
+
+    first, second, stats = asyncio.run(run())
+    assert first and second == first
+    assert stats["hits"] == 1 and stats["entries"] == 1
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from llm_batcher import MicroBatcher
+from main import NewsVerificationAgent
+from retry import RetryPolicy
+from verdict_cache import VerdictCache
+
+VERDICT = {"confidence_score": 0.9, "matching_details": ["ok"], "discrepancies": []}
+
+
+def completion(payload):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))], usage=None)
+
+
+class FakeCompletions:
+    def __init__(self, packed_delay=0.0, fail_packed=False):
+        self.packed_delay = packed_delay
+        self.fail_packed = fail_packed
+        self.packed_calls = 0
+        self.single_calls = 0
+
+    async def create(self, model, messages, **kwargs):
+        if "numbered item" in messages[0]["content"]:
+            self.packed_calls += 1
+            await asyncio.sleep(self.packed_delay)
+            if self.fail_packed:
+                return completion({"results": []})
+            size = messages[1]["content"].count("Original Description:")
+            return completion({"results": [dict(VERDICT, id=i) for i in range(size)]})
+        self.single_calls += 1
+        return completion(VERDICT)
+
+
+def make_agent(completions, deadline=30.0):
+    agent = NewsVerificationAgent(
+        verdict_cache=VerdictCache(),
+        retry_policy=RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.01, deadline=deadline),
+    )
+    agent.prechecker = None
+    agent.async_llm = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    agent.llm_batcher = MicroBatcher(agent._averify_batch, window=0.02, max_batch=8, mode="packed")
+    return agent
+
+
+def verify_all(agent, descriptions):
+    async def run():
+        try:
+            return await asyncio.gather(*(
+                agent._averify_content(f"Evidence about {d}.", d, headline=d) for d in descriptions
+            ))
+        finally:
+            await agent.aclose()
+    return asyncio.run(run())
+
+
+def test_packed_verdicts_are_tagged_and_not_served_as_single_prompt_verdicts():
+    completions = FakeCompletions()
+    agent = make_agent(completions)
+    first = verify_all(agent, ["alpha", "beta"])
+    assert [r["verdict_source"] for r in first] == ["llm_packed", "llm_packed"]
+    assert agent.verdict_cache.stats()["entries"] == 0
+
+    # A lone request goes out with the single-item prompt, and that verdict is memoized
+    agent = make_agent(completions)
+    cache = agent.verdict_cache
+    assert verify_all(agent, ["alpha"])[0]["verdict_source"] == "llm"
+    agent = make_agent(completions)
+    agent.verdict_cache = cache
+    assert verify_all(agent, ["alpha"])[0]["verdict_source"] == "cache"
+    assert completions.packed_calls == 1 and completions.single_calls == 1
+
+
+def test_fallback_after_a_failed_pack_shares_the_original_deadline():
+    # The packed call eats the whole deadline, so the per-item fallback has nothing left
+    completions = FakeCompletions(packed_delay=0.3, fail_packed=True)
+    agent = make_agent(completions, deadline=0.25)
+    start = time.monotonic()
+    results = verify_all(agent, ["alpha", "beta"])
+
+    assert time.monotonic() - start < 0.6
+    assert [r["verdict_source"] for r in results] == ["fallback", "fallback"]
+    assert completions.single_calls == 0
+    assert agent.batch_fallbacks == 2
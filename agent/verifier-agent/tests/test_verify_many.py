@@ -0,0 +1,68 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+from main import NewsVerificationAgent
+
+
+def item(url, description="claim"):
+    return SimpleNamespace(headline="Headline", description=description, source_url=url)
+
+
+def make_agent(scrape_delay=0.01):
+    agent = NewsVerificationAgent()
+    scraped = Counter()
+    active = {"now": 0, "peak": 0}
+
+    async def ascrape_website(url):
+        scraped[url] += 1
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(scrape_delay)
+        active["now"] -= 1
+        return None if "missing" in url else f"content of {url}"
+
+    async def averify_content(scraped_content, description, use_cache=True, headline=""):
+        if description == "boom":
+            raise ValueError("LLM exploded")
+        return {"confidence_score": 0.9, "isVerified": True, "content": scraped_content}
+
+    agent.ascrape_website = ascrape_website
+    agent._averify_content = averify_content
+    return agent, scraped, active
+
+
+def run(agent, items, **kwargs):
+    async def go():
+        try:
+            return await agent.verify_many(items, **kwargs)
+        finally:
+            await agent.aclose()
+    return asyncio.run(go())
+
+
+def test_each_distinct_url_is_scraped_once():
+    agent, scraped, _ = make_agent()
+    urls = ["https://a.example/1", "https://a.example/1", "https://b.example/2", "https://a.example/1"]
+    results = run(agent, [item(u) for u in urls])
+
+    assert scraped == {"https://a.example/1": 1, "https://b.example/2": 1}
+    assert [r["content"] for r in results] == [f"content of {u}" for u in urls]
+
+
+def test_a_failing_item_does_not_fail_the_batch():
+    agent, _, _ = make_agent()
+    items = [item("https://a.example/1"), item("https://a.example/2", "boom"), item("https://a.example/missing")]
+    results = run(agent, items)
+
+    assert results[0]["isVerified"] is True
+    assert results[1] == {"error": "Verification failed: LLM exploded"}
+    assert results[2]["verification_status"] == "unverified"
+
+
+def test_scrapes_per_host_are_capped():
+    agent, scraped, active = make_agent(scrape_delay=0.05)
+    results = run(agent, [item(f"https://a.example/{i}") for i in range(6)], max_per_domain=2)
+
+    assert len(scraped) == 6 and all(r["isVerified"] for r in results)
+    assert active["peak"] == 2
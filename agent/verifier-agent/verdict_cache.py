@@ -0,0 +1,102 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+def verdict_key(evidence: str, description: str, model: str, prompt_version: str) -> str:
+    """
+    Hashes everything that determines an LLM verdict into a cache key.
+
+    Args:
+        evidence (str): The scraped content exactly as it is placed in the prompt.
+        description (str): The news description being verified.
+        model (str): The LLM model name.
+        prompt_version (str): Version of the verification prompt.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, description, evidence):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """
+    In-memory TTL + LRU cache of parsed LLM verdicts.
+
+    Only successfully parsed verdicts should be stored; fallback results produced when
+    the LLM fails are not worth memoizing.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of the cached verdict for key, or None if absent or expired.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] <= time.time():
+                del self._entries[key]
+                item = None
+
+            if item is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(item[1])
+
+    def put(self, key: str, verdict: Dict[str, Any]) -> None:
+        """
+        Stores a copy of a parsed verdict, evicting the least recently used entries past max_entries.
+        """
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, copy.deepcopy(verdict))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def verdict_cache_from_env() -> Optional[VerdictCache]:
+    """
+    Builds the verdict cache from VERDICT_CACHE_ENABLED, VERDICT_CACHE_TTL and VERDICT_CACHE_MAX_ENTRIES.
+
+    Returns:
+        Optional[VerdictCache]: The configured cache, or None if disabled.
+    """
+    if os.getenv("VERDICT_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    return VerdictCache(
+        ttl=float(os.getenv("VERDICT_CACHE_TTL", 3600)),
+        max_entries=int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", 10000)),
+    )